@@ -5,10 +5,11 @@ from sqlalchemy import engine_from_config, inspect, pool, text
 
 from alembic import context
 from app.auth.models import SuperAdmin  # noqa
+from app.cluster.models import DatabaseCluster  # noqa
 from app.database.base import Base
 
 # Import all models here
-from app.organization.models import Organization  # noqa
+from app.organization.models import Organization, TenantUsageSample  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
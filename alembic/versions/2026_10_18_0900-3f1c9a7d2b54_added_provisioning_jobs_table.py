@@ -0,0 +1,49 @@
+"""Added provisioning jobs table
+
+Revision ID: 3f1c9a7d2b54
+Revises: 6b521aaa0a94
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "3f1c9a7d2b54"
+down_revision: Union[str, Sequence[str], None] = "6b521aaa0a94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "provisioning_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("organization_name", sa.String(), nullable=False),
+        sa.Column("admin_email", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("step", sa.String(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("organization_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_provisioning_jobs_active_name",
+        "provisioning_jobs",
+        [sa.text("lower(organization_name)")],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_provisioning_jobs_active_name", table_name="provisioning_jobs")
+    op.drop_table("provisioning_jobs")
@@ -0,0 +1,44 @@
+"""Added org lookup indexes
+
+Revision ID: 8d2e4b6a1c37
+Revises: 3f1c9a7d2b54
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "8d2e4b6a1c37"
+down_revision: Union[str, Sequence[str], None] = "3f1c9a7d2b54"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_organizations_name_lower",
+            "organizations",
+            [sa.text("lower(name) text_pattern_ops")],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_organizations_admin_email",
+            "organizations",
+            ["admin_email"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_organizations_admin_email", table_name="organizations", postgresql_concurrently=True)
+        op.drop_index("ix_organizations_name_lower", table_name="organizations", postgresql_concurrently=True)
@@ -0,0 +1,64 @@
+"""Added organizations change notify trigger
+
+Revision ID: c4a7e19f05d2
+Revises: 8d2e4b6a1c37
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "c4a7e19f05d2"
+down_revision: Union[str, Sequence[str], None] = "8d2e4b6a1c37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Payloads carry the row id plus the previous lookup keys; listeners re-read the row itself,
+    # which keeps password hashes out of the notification channel and payloads far below 8000 bytes.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_organizations_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                PERFORM pg_notify('organizations_changed', json_build_object('op', TG_OP)::text);
+            ELSIF TG_OP = 'INSERT' THEN
+                PERFORM pg_notify('organizations_changed', json_build_object('op', TG_OP, 'id', NEW.id)::text);
+            ELSE
+                PERFORM pg_notify(
+                    'organizations_changed',
+                    json_build_object(
+                        'op', TG_OP, 'id', OLD.id, 'old_name', OLD.name, 'old_admin_email', OLD.admin_email
+                    )::text
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER organizations_notify_row
+        AFTER INSERT OR UPDATE OR DELETE ON organizations
+        FOR EACH ROW EXECUTE FUNCTION notify_organizations_change()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER organizations_notify_truncate
+        AFTER TRUNCATE ON organizations
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_organizations_change()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS organizations_notify_truncate ON organizations")
+    op.execute("DROP TRIGGER IF EXISTS organizations_notify_row ON organizations")
+    op.execute("DROP FUNCTION IF EXISTS notify_organizations_change()")
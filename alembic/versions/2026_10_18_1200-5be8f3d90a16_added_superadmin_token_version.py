@@ -0,0 +1,28 @@
+"""Added superadmin token version
+
+Revision ID: 5be8f3d90a16
+Revises: c4a7e19f05d2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "5be8f3d90a16"
+down_revision: Union[str, Sequence[str], None] = "c4a7e19f05d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("super_admins", sa.Column("token_version", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("super_admins", "token_version")
@@ -0,0 +1,45 @@
+"""Added database clusters table
+
+Revision ID: 9a3e6c1d7f20
+Revises: 5be8f3d90a16
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "9a3e6c1d7f20"
+down_revision: Union[str, Sequence[str], None] = "5be8f3d90a16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "database_clusters",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("admin_url", sa.String(), nullable=False),
+        sa.Column("weight", sa.Integer(), server_default="1", nullable=False),
+        sa.Column("max_tenants", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), server_default="true", nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.add_column("organizations", sa.Column("cluster_id", sa.Integer(), nullable=True))
+    op.create_foreign_key("organizations_cluster_id_fkey", "organizations", "database_clusters", ["cluster_id"], ["id"])
+    op.create_index(op.f("ix_organizations_cluster_id"), "organizations", ["cluster_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_organizations_cluster_id"), table_name="organizations")
+    op.drop_constraint("organizations_cluster_id_fkey", "organizations", type_="foreignkey")
+    op.drop_column("organizations", "cluster_id")
+    op.drop_table("database_clusters")
@@ -0,0 +1,28 @@
+"""Added organization schema name
+
+Revision ID: b7d2f5e8a413
+Revises: 9a3e6c1d7f20
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "b7d2f5e8a413"
+down_revision: Union[str, Sequence[str], None] = "9a3e6c1d7f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("organizations", sa.Column("schema_name", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("organizations", "schema_name")
@@ -0,0 +1,40 @@
+"""Added tenant usage samples table
+
+Revision ID: e3c9a1f74b60
+Revises: b7d2f5e8a413
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "e3c9a1f74b60"
+down_revision: Union[str, Sequence[str], None] = "b7d2f5e8a413"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tenant_usage_samples",
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("resolution", sa.Integer(), nullable=False),
+        sa.Column("sampled_at", sa.DateTime(), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("xact_commit", sa.BigInteger(), nullable=False),
+        sa.Column("blks_read", sa.BigInteger(), nullable=False),
+        sa.Column("connections", sa.Integer(), nullable=False),
+        sa.Column("tps", sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("organization_id", "resolution", "sampled_at"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("tenant_usage_samples")
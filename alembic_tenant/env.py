@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import os
+from logging.config import fileConfig
+
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import context
+
+# this is the Alembic Config object, which provides
+# access to the values within the .ini file in use.
+config = context.config
+
+logger = logging.getLogger("alembic.env")
+
+# Callers that pass in their own connection (tests) keep their logging setup
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+# Organization databases have no declarative models yet; write tenant migrations by hand
+target_metadata = None
+
+
+def tenant_url() -> str:
+    """The organization database to migrate; passed via the environment so passwords stay out of argv."""
+    url = os.environ.get("TENANT_DATABASE_URL") or context.get_x_argument(as_dictionary=True).get("url")
+    if not url:
+        raise RuntimeError("Set TENANT_DATABASE_URL to the organization database to migrate")
+    return url
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode."""
+    context.configure(
+        url=os.environ.get("TENANT_DATABASE_URL") or "postgresql://",
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    # Schema-per-tenant organizations keep their tables and version table in their own schema
+    schema = os.environ.get("TENANT_SCHEMA") or None
+    if connection.dialect.name == "postgresql":
+        # Keep a migration from waiting forever behind locks held by the application
+        connection.exec_driver_sql(f"SET lock_timeout = '{os.environ.get('TENANT_LOCK_TIMEOUT', '10s')}'")
+        if schema:
+            connection.exec_driver_sql(f'SET search_path TO "{schema}"')
+
+    # The SETs autobegin a transaction. Commit it (the settings are session-level and stay), or Alembic
+    # runs inside it as an external transaction that it never commits and that is rolled back on close.
+    connection.commit()
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        version_table_schema=schema,
+        transaction_per_migration=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    connectable = create_async_engine(tenant_url(), poolclass=pool.NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode, on the connection in ``config.attributes`` if one is given."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+    else:
+        asyncio.run(run_async_migrations())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
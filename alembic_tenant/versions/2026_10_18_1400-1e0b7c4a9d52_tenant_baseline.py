@@ -0,0 +1,25 @@
+"""Tenant baseline
+
+Revision ID: 1e0b7c4a9d52
+Revises:
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+revision: str = "1e0b7c4a9d52"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Marks organization databases as managed; schema changes go in revisions on top of this one
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Row, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import SuperAdmin
@@ -16,3 +16,20 @@ class SuperAdminDAO(BaseDAO[SuperAdmin, SuperAdminLogin, SuperAdminLogin]):
         """Get super admin by email."""
         result = await self.session.execute(select(SuperAdmin).where(SuperAdmin.email == email))
         return result.scalars().first()
+
+    async def get_principals(self) -> List[Row]:
+        """Get every super admin's ``(email, is_active, token_version)`` row."""
+        result = await self.session.execute(select(SuperAdmin.email, SuperAdmin.is_active, SuperAdmin.token_version))
+        return list(result.all())
+
+    async def set_active(self, email: str, is_active: bool) -> Optional[SuperAdmin]:
+        """Activate or deactivate a super admin, revoking every token issued so far."""
+        result = await self.session.scalars(
+            update(SuperAdmin)
+            .where(SuperAdmin.email == email)
+            .values(is_active=is_active, token_version=SuperAdmin.token_version + 1)
+            .returning(SuperAdmin)
+        )
+        admin = result.one_or_none()
+        await self.session.commit()
+        return admin
@@ -1,18 +1,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.ext.asyncio import AsyncSession
+from jose import JWTError
 
+from app.auth.principals import principal_store
 from app.auth.schemas import TokenData
-from app.core.config import ALGORITHM, SECRET_KEY
-from app.database.session import get_session
+from app.core.security import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)
-) -> TokenData:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> TokenData:
+    """Validate the bearer token without touching the database."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -20,7 +18,7 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
@@ -28,16 +26,23 @@ async def get_current_user(
         # Check if user is super admin
         is_super_admin = payload.get("is_super_admin", False)
 
-        token_data = TokenData(email=email, is_super_admin=is_super_admin)
+        token_data = TokenData(email=email, is_super_admin=is_super_admin, token_version=payload.get("ver", 0))
     except JWTError:
         raise credentials_exception
 
     return token_data
 
 
-async def get_super_admin(
-    current_user: TokenData = Depends(get_current_user), session: AsyncSession = Depends(get_session)
-) -> TokenData:
+async def get_super_admin(current_user: TokenData = Depends(get_current_user)) -> TokenData:
     if not current_user.is_super_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to perform this action")
+
+    # Served from the principal cache, so revocation costs no query in steady state
+    principal = await principal_store.get(current_user.email)
+    if principal is None or not principal.is_active or principal.token_version != current_user.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return current_user
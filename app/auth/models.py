@@ -10,3 +10,5 @@ class SuperAdmin(Base):
     email = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    # Bumped whenever the admin is (de)activated; tokens carrying an older version are revoked
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
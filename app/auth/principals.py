@@ -0,0 +1,93 @@
+import asyncio
+from typing import Dict, NamedTuple, Optional, Set
+
+from app.auth.dao import SuperAdminDAO
+from app.core.cache import AsyncLoadingCache
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.database.session import async_session
+
+logger = get_logger(__name__)
+
+
+class Principal(NamedTuple):
+    email: str
+    is_active: bool
+    token_version: int
+
+
+class PrincipalStore:
+    """Super-admin active status and token version, keyed by email, for per-request revocation checks.
+
+    A background task reloads every principal each ``refresh_interval`` seconds, so in steady state
+    lookups are cache hits; a miss loads the single row. ``evict`` drops an entry immediately in this
+    worker, other workers pick up the change on their next refresh.
+    """
+
+    def __init__(self, max_size: int, ttl: float, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._cache: AsyncLoadingCache[str, Principal] = AsyncLoadingCache(
+            "super_admin_principals", max_size=max_size, ttl=ttl, negative_ttl=refresh_interval
+        )
+        self._evicted_during_refresh: Optional[Set[str]] = None
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+
+    async def _load(self, email: str) -> Optional[Principal]:
+        async with async_session() as session:
+            admin = await SuperAdminDAO(session).get_by_email(email)
+        if admin is None:
+            return None
+        return Principal(admin.email, bool(admin.is_active), admin.token_version)
+
+    async def get(self, email: str) -> Optional[Principal]:
+        return await self._cache.get_or_load(email, lambda: self._load(email))
+
+    def evict(self, email: str) -> None:
+        self._cache.invalidate(email)
+        if self._evicted_during_refresh is not None:
+            self._evicted_during_refresh.add(email)
+
+    async def refresh(self) -> None:
+        """Reload every principal in one query."""
+        self._evicted_during_refresh = set()
+        try:
+            async with async_session() as session:
+                rows = await SuperAdminDAO(session).get_principals()
+            for row in rows:
+                # A row read before a concurrent eviction may already be stale; let the next lookup load it
+                if row.email not in self._evicted_during_refresh:
+                    self._cache.set(row.email, Principal(row.email, bool(row.is_active), row.token_version))
+        finally:
+            self._evicted_during_refresh = None
+        self.refreshes += 1
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("principal_refresh_failed", extra={"error": str(e)})
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {**self._cache.stats(), "refreshes": self.refreshes}
+
+
+principal_store = PrincipalStore(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    refresh_interval=settings.PRINCIPAL_REFRESH_INTERVAL,
+)
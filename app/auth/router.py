@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.schemas import SuperAdminLogin, Token
+from app.auth.dependencies import get_super_admin
+from app.auth.schemas import SuperAdminLogin, SuperAdminRetrieve, Token, TokenData
 from app.auth.services import AuthService
 from app.database.session import get_session
 
@@ -16,3 +17,25 @@ async def get_auth_service(session: AsyncSession = Depends(get_session)) -> Auth
 async def login(login_data: SuperAdminLogin, service: AuthService = Depends(get_auth_service)):
     """Login endpoint for super admin."""
     return await service.authenticate_super_admin(login_data)
+
+
+@router.post("/admins/{email}/deactivate", response_model=SuperAdminRetrieve)
+async def deactivate_admin(
+    email: str,
+    service: AuthService = Depends(get_auth_service),
+    current_user: TokenData = Depends(get_super_admin),
+):
+    """Deactivate a super admin, revoking their tokens immediately."""
+    if email == current_user.email:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot deactivate yourself")
+    return await service.set_super_admin_active(email, False)
+
+
+@router.post("/admins/{email}/activate", response_model=SuperAdminRetrieve)
+async def activate_admin(
+    email: str,
+    service: AuthService = Depends(get_auth_service),
+    current_user: TokenData = Depends(get_super_admin),
+):
+    """Reactivate a super admin; tokens issued before deactivation stay revoked."""
+    return await service.set_super_admin_active(email, True)
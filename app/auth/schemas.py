@@ -14,3 +14,9 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     email: str
     is_super_admin: bool = False
+    token_version: int = 0
+
+
+class SuperAdminRetrieve(BaseModel):
+    email: str
+    is_active: bool
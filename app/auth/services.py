@@ -2,10 +2,13 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dao import SuperAdminDAO
-from app.auth.schemas import SuperAdminLogin, Token
-from app.core.security import create_access_token, verify_password
+from app.auth.principals import principal_store
+from app.auth.schemas import SuperAdminLogin, SuperAdminRetrieve, Token
+from app.core.security import create_access_token, verify_password_async
+from app.core.tracing import trace_methods
 
 
+@trace_methods("service")
 class AuthService:
     def __init__(self, session: AsyncSession):
         self.dao = SuperAdminDAO(session)
@@ -14,14 +17,25 @@ class AuthService:
         """Authenticate super admin and return token."""
         admin = await self.dao.get_by_email(login_data.email)
 
-        if not admin or not verify_password(login_data.password, admin.password):
+        if not admin or not await verify_password_async(login_data.password, admin.password) or not admin.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Create access token with super admin flag
-        access_token = create_access_token(data={"sub": admin.email, "is_super_admin": True})
+        # Create access token with super admin flag and the current token version
+        access_token = create_access_token(
+            data={"sub": admin.email, "is_super_admin": True, "ver": admin.token_version}
+        )
 
         return Token(access_token=access_token)
+
+    async def set_super_admin_active(self, email: str, is_active: bool) -> SuperAdminRetrieve:
+        """Activate or deactivate a super admin and revoke their existing tokens."""
+        admin = await self.dao.set_active(email, is_active)
+        if not admin:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Super admin not found")
+
+        principal_store.evict(email)
+        return SuperAdminRetrieve(email=admin.email, is_active=admin.is_active)
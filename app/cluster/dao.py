@@ -0,0 +1,33 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cluster.models import DatabaseCluster
+from app.cluster.schemas import ClusterCreate, ClusterUpdate
+from app.database.dao import BaseDAO
+from app.organization.models import Organization
+
+
+class ClusterDAO(BaseDAO[DatabaseCluster, ClusterCreate, ClusterUpdate]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(DatabaseCluster, session)
+
+    async def get_by_name(self, name: str) -> Optional[DatabaseCluster]:
+        """Get cluster by name."""
+        result = await self.session.execute(select(DatabaseCluster).where(DatabaseCluster.name == name))
+        return result.scalars().first()
+
+    async def list_clusters(self) -> List[DatabaseCluster]:
+        """List every registered cluster ordered by ID."""
+        result = await self.session.execute(select(DatabaseCluster).order_by(DatabaseCluster.id))
+        return list(result.scalars().all())
+
+    async def tenant_counts(self) -> Dict[int, int]:
+        """Count organizations per cluster in one query; organizations on the master server are omitted."""
+        result = await self.session.execute(
+            select(Organization.cluster_id, func.count())
+            .where(Organization.cluster_id.is_not(None))
+            .group_by(Organization.cluster_id)
+        )
+        return {cluster_id: count for cluster_id, count in result.all()}
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Dict, Tuple
+
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.cluster.models import DatabaseCluster
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.database.pool import engine_options
+from app.database.session import DatabaseServer
+
+logger = get_logger(__name__)
+
+
+class ClusterAdminEngines:
+    """Pooled AUTOCOMMIT admin engines for registered clusters, keyed by cluster ID.
+
+    An engine is built on first use and rebuilt when the cluster's ``admin_url`` changes.
+    """
+
+    def __init__(self, pool_size: int, max_overflow: int, pool_timeout: float):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self._engines: Dict[int, Tuple[str, AsyncEngine]] = {}
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    async def server(self, cluster: DatabaseCluster) -> DatabaseServer:
+        """Return the cluster as a provisioning target, sharing one pooled admin engine per cluster."""
+        entry = self._engines.get(cluster.id)
+        if entry is None or entry[0] != cluster.admin_url:
+            engine = create_async_engine(
+                cluster.admin_url,
+                echo=settings.DB_ECHO,
+                isolation_level="AUTOCOMMIT",
+                **engine_options(self.pool_size, self.max_overflow, self.pool_timeout),
+            )
+            self._engines[cluster.id] = (cluster.admin_url, engine)
+            if entry is not None:
+                await entry[1].dispose()
+            entry = self._engines[cluster.id]
+
+        engine = entry[1]
+        url = make_url(cluster.admin_url)
+        return DatabaseServer(engine, url.host or settings.POSTGRES_HOST, url.port or 5432)
+
+    async def discard(self, cluster_id: int) -> None:
+        """Dispose the admin engine of a cluster that was removed or changed."""
+        entry = self._engines.pop(cluster_id, None)
+        if entry is not None:
+            await entry[1].dispose()
+
+    async def close(self) -> None:
+        entries = list(self._engines.values())
+        self._engines.clear()
+        results = await asyncio.gather(*(engine.dispose() for _, engine in entries), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("cluster_engine_dispose_failed", extra={"error": str(result)})
+
+
+cluster_engines = ClusterAdminEngines(
+    pool_size=settings.CLUSTER_ADMIN_POOL_SIZE,
+    max_overflow=settings.CLUSTER_ADMIN_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+)
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, String
+
+from app.database.base import Base
+
+
+class DatabaseCluster(Base):
+    __tablename__ = "database_clusters"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+    # Superuser DSN used to create organization databases and users on this cluster
+    admin_url = Column(String, nullable=False)
+    weight = Column(Integer, nullable=False, default=1, server_default="1")
+    max_tenants = Column(Integer)
+    is_active = Column(Boolean, nullable=False, default=True, server_default="true")
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Optional, Type
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+
+from app.cluster.dao import ClusterDAO
+from app.cluster.engines import ClusterAdminEngines, cluster_engines
+from app.cluster.models import DatabaseCluster
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.database.session import DatabaseServer, async_session, master_server
+
+logger = get_logger(__name__)
+
+# Rough on-disk size of a freshly created database, used to account for placements not yet measured
+EMPTY_DATABASE_BYTES = 8 * 1024 * 1024
+
+
+@dataclass
+class ClusterLoad:
+    cluster: DatabaseCluster
+    tenants: int
+    bytes: int = 0
+
+
+class Placement(NamedTuple):
+    cluster_id: Optional[int]
+    server: DatabaseServer
+
+
+class PlacementPolicy(ABC):
+    """Chooses the cluster that hosts a new organization database."""
+
+    needs_bytes = False
+
+    @abstractmethod
+    def choose(self, loads: List[ClusterLoad]) -> ClusterLoad:
+        """Pick one of ``loads``, which is never empty."""
+
+
+class LeastTenantsPolicy(PlacementPolicy):
+    def choose(self, loads: List[ClusterLoad]) -> ClusterLoad:
+        return min(loads, key=lambda load: (load.tenants, load.cluster.id))
+
+
+class LeastBytesPolicy(PlacementPolicy):
+    needs_bytes = True
+
+    def choose(self, loads: List[ClusterLoad]) -> ClusterLoad:
+        return min(loads, key=lambda load: (load.bytes, load.cluster.id))
+
+
+class WeightedPolicy(PlacementPolicy):
+    """Spreads tenants in proportion to each cluster's ``weight``."""
+
+    def choose(self, loads: List[ClusterLoad]) -> ClusterLoad:
+        return min(loads, key=lambda load: (load.tenants / load.cluster.weight, load.cluster.id))
+
+
+PLACEMENT_POLICIES: Dict[str, Type[PlacementPolicy]] = {
+    "least_tenants": LeastTenantsPolicy,
+    "least_bytes": LeastBytesPolicy,
+    "weighted": WeightedPolicy,
+}
+
+
+class PlacementScheduler:
+    """Picks a registered cluster for each new organization database.
+
+    The cluster list, tenant counts and database sizes are loaded at most every ``load_ttl``
+    seconds (or after ``invalidate``) and the counts are bumped locally on every placement, so a
+    burst of provisioning (e.g. a bulk import) spreads out instead of piling onto whichever
+    cluster looked emptiest at the start. With no cluster registered, organizations stay on the
+    master server without touching the database.
+    """
+
+    def __init__(self, policy: PlacementPolicy, engines: ClusterAdminEngines, load_ttl: float):
+        self.policy = policy
+        self.engines = engines
+        self.load_ttl = load_ttl
+        self._tenants: Dict[int, int] = {}
+        self._bytes: Dict[int, int] = {}
+        self._clusters: List[DatabaseCluster] = []
+        self._loaded_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.placements: Dict[Optional[int], int] = {}
+
+    def invalidate(self) -> None:
+        """Reload loads on the next placement, e.g. after the cluster registry changed."""
+        self._loaded_at = None
+
+    async def _database_bytes(self, cluster: DatabaseCluster) -> int:
+        server = await self.engines.server(cluster)
+        async with server.engine.connect() as conn:
+            return int(await conn.scalar(text("SELECT COALESCE(sum(pg_database_size(oid)), 0) FROM pg_database")))
+
+    async def _load(self) -> None:
+        async with async_session() as session:
+            dao = ClusterDAO(session)
+            self._clusters = await dao.list_clusters()
+            active = [cluster for cluster in self._clusters if cluster.is_active]
+            self._tenants = await dao.tenant_counts() if active else {}
+        if active and self.policy.needs_bytes:
+            sizes = await asyncio.gather(*(self._database_bytes(cluster) for cluster in active))
+            self._bytes = {cluster.id: size for cluster, size in zip(active, sizes)}
+        self._loaded_at = time.monotonic()
+
+    async def place(self) -> Placement:
+        """Choose the cluster for a new organization database."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Serialized so concurrent provisioning sees each other's placements
+        async with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.load_ttl:
+                await self._load()
+            if not self._clusters:
+                self.placements[None] = self.placements.get(None, 0) + 1
+                return Placement(None, master_server)
+
+            loads = [
+                ClusterLoad(cluster, self._tenants.get(cluster.id, 0), self._bytes.get(cluster.id, 0))
+                for cluster in self._clusters
+                if cluster.is_active
+            ]
+            loads = [
+                load for load in loads if load.cluster.max_tenants is None or load.tenants < load.cluster.max_tenants
+            ]
+            if not loads:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="No database cluster has capacity for another organization",
+                )
+
+            cluster = self.policy.choose(loads).cluster
+            self._tenants[cluster.id] = self._tenants.get(cluster.id, 0) + 1
+            self._bytes[cluster.id] = self._bytes.get(cluster.id, 0) + EMPTY_DATABASE_BYTES
+            self.placements[cluster.id] = self.placements.get(cluster.id, 0) + 1
+
+        logger.info("tenant_placed", extra={"cluster": cluster.name, "policy": type(self.policy).__name__})
+        return Placement(cluster.id, await self.engines.server(cluster))
+
+    def stats(self) -> Dict:
+        return {
+            "policy": type(self.policy).__name__,
+            "tenants": dict(self._tenants),
+            "bytes": dict(self._bytes),
+            "placements": {str(cluster_id): count for cluster_id, count in self.placements.items()},
+            "admin_engines": len(self.engines),
+        }
+
+
+placement_scheduler = PlacementScheduler(
+    policy=PLACEMENT_POLICIES[settings.CLUSTER_PLACEMENT_POLICY](),
+    engines=cluster_engines,
+    load_ttl=settings.CLUSTER_LOAD_TTL,
+)
@@ -0,0 +1,56 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import get_super_admin
+from app.auth.schemas import TokenData
+from app.cluster.schemas import ClusterCreate, ClusterRetrieve, ClusterUpdate
+from app.cluster.services import ClusterService
+from app.database.session import get_session
+
+router = APIRouter(prefix="/clusters", tags=["Clusters"])
+
+
+async def get_cluster_service(session: AsyncSession = Depends(get_session)) -> ClusterService:
+    return ClusterService(session)
+
+
+@router.post("", response_model=ClusterRetrieve, status_code=status.HTTP_201_CREATED)
+async def create_cluster(
+    cluster_data: ClusterCreate,
+    current_user: TokenData = Depends(get_super_admin),  # Requires super admin
+    service: ClusterService = Depends(get_cluster_service),
+):
+    """Register a database cluster for new organizations. Only super admin can perform this action."""
+    return await service.create_cluster(cluster_data)
+
+
+@router.get("", response_model=List[ClusterRetrieve])
+async def list_clusters(
+    current_user: TokenData = Depends(get_super_admin),  # Requires super admin
+    service: ClusterService = Depends(get_cluster_service),
+):
+    """List registered database clusters and how many organizations each hosts."""
+    return await service.list_clusters()
+
+
+@router.patch("/{cluster_id}", response_model=ClusterRetrieve)
+async def update_cluster(
+    cluster_id: int,
+    cluster_data: ClusterUpdate,
+    current_user: TokenData = Depends(get_super_admin),  # Requires super admin
+    service: ClusterService = Depends(get_cluster_service),
+):
+    """Update a cluster; set ``is_active`` to false to stop placing new organizations on it."""
+    return await service.update_cluster(cluster_id, cluster_data)
+
+
+@router.delete("/{cluster_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_cluster(
+    cluster_id: int,
+    current_user: TokenData = Depends(get_super_admin),  # Requires super admin
+    service: ClusterService = Depends(get_cluster_service),
+):
+    """Unregister a cluster that hosts no organizations."""
+    await service.delete_cluster(cluster_id)
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from pydantic import BaseModel, conint, constr
+
+
+class ClusterCreate(BaseModel):
+    name: constr(min_length=1, max_length=50)  # type: ignore
+    admin_url: str
+    weight: conint(ge=1) = 1  # type: ignore
+    max_tenants: Optional[conint(ge=1)] = None  # type: ignore
+
+
+class ClusterUpdate(BaseModel):
+    admin_url: Optional[str] = None
+    weight: Optional[conint(ge=1)] = None  # type: ignore
+    max_tenants: Optional[conint(ge=1)] = None  # type: ignore
+    is_active: Optional[bool] = None
+
+
+class ClusterRetrieve(BaseModel):
+    id: int
+    name: str
+    host: str
+    port: int
+    weight: int
+    max_tenants: Optional[int] = None
+    is_active: bool
+    tenants: int
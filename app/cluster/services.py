@@ -0,0 +1,94 @@
+from typing import Dict, List
+
+from fastapi import HTTPException, status
+from sqlalchemy import make_url, pool, text
+from sqlalchemy.exc import ArgumentError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.cluster.dao import ClusterDAO
+from app.cluster.engines import cluster_engines
+from app.cluster.models import DatabaseCluster
+from app.cluster.placement import placement_scheduler
+from app.cluster.schemas import ClusterCreate, ClusterRetrieve, ClusterUpdate
+from app.core.tracing import trace_methods
+
+
+def _retrieve(cluster: DatabaseCluster, tenants: Dict[int, int]) -> ClusterRetrieve:
+    url = make_url(cluster.admin_url)
+    return ClusterRetrieve(
+        id=cluster.id,
+        name=cluster.name,
+        host=url.host or "",
+        port=url.port or 5432,
+        weight=cluster.weight,
+        max_tenants=cluster.max_tenants,
+        is_active=cluster.is_active,
+        tenants=tenants.get(cluster.id, 0),
+    )
+
+
+async def check_admin_url(admin_url: str) -> None:
+    """Make sure the cluster is reachable with the given credentials before registering it."""
+    try:
+        engine = create_async_engine(admin_url, poolclass=pool.NullPool)
+    except ArgumentError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid admin URL: {str(e)}")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Cannot connect to cluster: {str(e)}")
+    finally:
+        await engine.dispose()
+
+
+@trace_methods("service")
+class ClusterService:
+    def __init__(self, session: AsyncSession):
+        self.dao = ClusterDAO(session)
+
+    async def _get(self, cluster_id: int) -> DatabaseCluster:
+        cluster = await self.dao.get(cluster_id)
+        if not cluster:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cluster not found")
+        return cluster
+
+    async def create_cluster(self, cluster_data: ClusterCreate) -> ClusterRetrieve:
+        """Register a database cluster that new organizations can be placed on."""
+        if await self.dao.get_by_name(cluster_data.name):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cluster already exists")
+        await check_admin_url(cluster_data.admin_url)
+
+        cluster = await self.dao.create(cluster_data)
+        placement_scheduler.invalidate()
+        return _retrieve(cluster, {})
+
+    async def list_clusters(self) -> List[ClusterRetrieve]:
+        """List registered clusters with their tenant counts."""
+        tenants = await self.dao.tenant_counts()
+        return [_retrieve(cluster, tenants) for cluster in await self.dao.list_clusters()]
+
+    async def update_cluster(self, cluster_id: int, cluster_data: ClusterUpdate) -> ClusterRetrieve:
+        """Change a cluster's credentials, weight, capacity or whether it accepts new organizations."""
+        await self._get(cluster_id)
+        if cluster_data.admin_url is not None:
+            await check_admin_url(cluster_data.admin_url)
+
+        cluster = await self.dao.update(cluster_id, cluster_data)
+        if cluster_data.admin_url is not None:
+            await cluster_engines.discard(cluster_id)
+        placement_scheduler.invalidate()
+        return _retrieve(cluster, await self.dao.tenant_counts())
+
+    async def delete_cluster(self, cluster_id: int) -> None:
+        """Unregister a cluster that hosts no organizations."""
+        await self._get(cluster_id)
+        if (await self.dao.tenant_counts()).get(cluster_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cluster still hosts organizations; deactivate it instead",
+            )
+
+        await self.dao.delete(cluster_id)
+        await cluster_engines.discard(cluster_id)
+        placement_scheduler.invalidate()
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING: Any = object()
+
+# Every AsyncLoadingCache registers itself here so health and metrics endpoints can report on it
+caches: Dict[str, "AsyncLoadingCache"] = {}
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU mapping whose entries expire after a per-entry TTL.
+
+    Not thread-safe; meant to be used from the event loop thread only.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None, expires_at: Optional[float] = None) -> None:
+        """Store ``value``; ``expires_at`` is a ``time.monotonic()`` deadline overriding ``ttl``."""
+        if expires_at is None:
+            expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class _LoadAbandoned(Exception):
+    """The caller that was loading a key went away before finishing."""
+
+
+class AsyncLoadingCache(Generic[K, V]):
+    """TTL cache in front of an async loader, with negative caching and single-flight misses.
+
+    ``None`` results are cached for ``negative_ttl`` seconds. Concurrent misses for one key share
+    a single loader call. ``invalidate`` also discards the result of a load already in flight.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl: float, negative_ttl: float):
+        self.name = name
+        self.negative_ttl = negative_ttl
+        self._cache: TTLCache[K, Optional[V]] = TTLCache(max_size, ttl)
+        self._inflight: Dict[K, "asyncio.Future[Optional[V]]"] = {}
+        self.coalesced = 0
+        caches[name] = self
+
+    def peek(self, key: K) -> Any:
+        """Return the cached value for ``key`` or ``_MISSING``, without loading."""
+        return self._cache.get(key, _MISSING)
+
+    def set(self, key: K, value: Optional[V]) -> None:
+        self._cache.set(key, value, ttl=self.negative_ttl if value is None else None)
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[Optional[V]]]) -> Optional[V]:
+        while True:
+            value = self._cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except _LoadAbandoned:
+                # The loading caller was cancelled; try again, possibly becoming the loader
+                continue
+
+        future: "asyncio.Future[Optional[V]]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(_LoadAbandoned() if isinstance(e, asyncio.CancelledError) else e)
+            # Waiters re-raise it; mark it retrieved so an unawaited future does not log a warning
+            future.exception()
+            raise
+        finally:
+            current = self._inflight.get(key)
+            if current is future:
+                del self._inflight[key]
+
+        # Only cache if nobody invalidated the key while the load was running
+        if current is future:
+            self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: K) -> None:
+        self._cache.delete(key)
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._inflight.clear()
+
+    def stats(self) -> Dict:
+        return {**self._cache.stats(), "coalesced": self.coalesced, "inflight": len(self._inflight)}
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
 from pydantic import EmailStr, PostgresDsn, validator
 from pydantic_settings import BaseSettings
@@ -15,6 +15,17 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL: float = 300.0
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1000
+    PRINCIPAL_CACHE_TTL: float = 30.0
+    PRINCIPAL_REFRESH_INTERVAL: float = 10.0
+
+    # Password hashing
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0
 
     # Database
     POSTGRES_HOST: str
@@ -24,6 +35,121 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
 
+    # Connection pooling ("pgbouncer" is for PgBouncer in transaction mode: no client-side pool
+    # and no prepared statement caching; the pool settings below are then ignored)
+    DB_POOL_MODE: Literal["pooled", "pgbouncer"] = "pooled"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_ECHO: bool = False
+
+    # Read replicas of the master database (JSON list of DSNs; empty sends every read to the primary)
+    DB_REPLICA_URLS: list[str] = []
+    DB_REPLICA_POLICY: Literal["round_robin", "least_loaded"] = "round_robin"
+    DB_REPLICA_MAX_LAG: float = 1.0
+    DB_REPLICA_CHECK_INTERVAL: float = 2.0
+
+    # Tenant databases
+    TENANT_POOL_SIZE: int = 2
+    TENANT_MAX_OVERFLOW: int = 3
+    TENANT_POOL_TIMEOUT: float = 10.0
+    TENANT_MAX_CONNECTIONS: int = 200
+    TENANT_ENGINE_IDLE_TTL: int = 300
+    TENANT_ENGINE_SWEEP_INTERVAL: int = 60
+    # "schema" puts each new organization in its own schema and role inside TENANT_SHARED_DATABASE
+    # instead of its own database; its sessions log in as that role, with a pool of TENANT_SCHEMA_POOL_SIZE
+    TENANT_ISOLATION: Literal["database", "schema"] = "database"
+    TENANT_SHARED_DATABASE: str = "tenants"
+    TENANT_SCHEMA_POOL_SIZE: int = 1
+    TENANT_SCHEMA_MAX_OVERFLOW: int = 1
+    TENANT_MIGRATION_CONCURRENCY: int = 16
+    TENANT_MIGRATION_TIMEOUT: float = 300.0
+    TENANT_MIGRATION_LOCK_TIMEOUT: str = "10s"
+
+    # Tenant placement across registered database clusters (with none registered the master server is used)
+    CLUSTER_PLACEMENT_POLICY: Literal["least_tenants", "least_bytes", "weighted"] = "least_tenants"
+    CLUSTER_ADMIN_POOL_SIZE: int = 2
+    CLUSTER_ADMIN_MAX_OVERFLOW: int = 2
+    CLUSTER_LOAD_TTL: float = 60.0
+
+    # Organization provisioning
+    PROVISIONING_WORKERS: int = 4
+    PROVISIONING_QUEUE_SIZE: int = 1000
+    PROVISIONING_JOB_TIMEOUT: int = 300
+    BULK_PROVISION_CONCURRENCY: int = 8
+    BULK_INSERT_BATCH_SIZE: int = 500
+    BULK_MAX_ITEMS: int = 10000
+
+    # Warm pool of spare tenant databases cloned from a template (0 disables it)
+    WARM_POOL_SIZE: int = 0
+    WARM_POOL_REFILL_CONCURRENCY: int = 2
+    WARM_POOL_TEMPLATE_DB: str = "tenant_template"
+    WARM_POOL_PREFIX: str = "warm_spare_"
+    WARM_POOL_REFILL_INTERVAL: int = 30
+
+    # Organization directory cache
+    ORG_CACHE_MAX_SIZE: int = 10000
+    ORG_CACHE_TTL: float = 60.0
+    ORG_CACHE_NEGATIVE_TTL: float = 5.0
+
+    # Organization change feed via LISTEN/NOTIFY (URL defaults to the master database)
+    ORG_CHANGE_FEED_ENABLED: bool = True
+    ORG_CHANGE_FEED_URL: Optional[str] = None
+    ORG_CHANGE_FEED_KEEPALIVE: float = 30.0
+    ORG_DIRECTORY_SNAPSHOT: bool = True
+
+    # Logging; records go through a bounded queue (dropped when full) to a writer thread.
+    # LOG_ACCESS_SAMPLE_RATE is the share of request_processed lines kept; 5xx and slow requests are always kept
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0
+    LOG_ACCESS_SLOW_THRESHOLD: float = 1.0
+    LOG_ACCESS_SUMMARY_INTERVAL: float = 60.0
+
+    # Request profiling; when enabled, PROFILING_SAMPLE_RATE of requests plus any carrying a signed
+    # X-Profile-Token header are sampled every PROFILING_INTERVAL seconds and kept in PROFILING_DIR
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL: float = 0.001
+    PROFILING_FORMAT: Literal["speedscope", "collapsed"] = "speedscope"
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 50
+    PROFILING_TOKEN_TTL: int = 900
+
+    # Request tracing; TRACING_EXPORTER is none, jsonl (to TRACING_FILE) or memory. Requests running
+    # more than TRACING_QUERY_WARN_THRESHOLD SQL statements are logged as likely N+1 queries
+    TRACING_EXPORTER: Literal["none", "jsonl", "memory"] = "none"
+    TRACING_FILE: str = "logs/traces.jsonl"
+    TRACING_QUERY_WARN_THRESHOLD: int = 25
+
+    # Health probes are answered from a snapshot refreshed every HEALTH_SAMPLE_INTERVAL seconds;
+    # /health/ready fails when the pool or event loop lag passes the limits below
+    HEALTH_SAMPLE_INTERVAL: float = 5.0
+    HEALTH_LAG_INTERVAL: float = 0.5
+    HEALTH_DB_TIMEOUT: float = 2.0
+    HEALTH_MAX_POOL_SATURATION: float = 1.0
+    HEALTH_MAX_LOOP_LAG: float = 1.0
+
+    # Organization database health; every TENANT_HEALTH_INTERVAL seconds (0 disables) each
+    # organization database is probed with a short-lived connection, at most TENANT_HEALTH_CONCURRENCY at once
+    TENANT_HEALTH_INTERVAL: float = 60.0
+    TENANT_HEALTH_CONCURRENCY: int = 50
+    TENANT_HEALTH_TIMEOUT: float = 3.0
+
+    # Organization database usage; every TENANT_USAGE_INTERVAL seconds (0 disables) one worker samples size,
+    # transactions and connections of each organization database. Raw samples are rolled up by hour after
+    # TENANT_USAGE_RAW_RETENTION_HOURS; TPS rankings average the last TENANT_USAGE_TOP_WINDOW seconds
+    TENANT_USAGE_INTERVAL: float = 300.0
+    TENANT_USAGE_RAW_RETENTION_HOURS: int = 48
+    TENANT_USAGE_ROLLUP_RETENTION_DAYS: int = 90
+    TENANT_USAGE_TOP_WINDOW: int = 3600
+
+    # Prometheus metrics; set METRICS_MULTIPROC_DIR when running several workers so /metrics sums them
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_INTERVAL: float = 1.0
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = ["*"]
 
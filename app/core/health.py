@@ -1,43 +1,185 @@
+import asyncio
 import time
-from typing import Dict
+from typing import Any, Dict, Optional
 
 import psutil
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine
 
+from app.cluster.placement import placement_scheduler
+from app.core.cache import caches
 from app.core.config import settings
-from app.database.session import get_session
+from app.core.logging import get_logger
+from app.core.security import password_hasher
+from app.database.pool import pool_stats
+from app.database.replicas import replicas
+from app.database.session import engine
+from app.database.tenant import tenant_engines
+from app.organization.health import tenant_health
+from app.organization.usage import tenant_usage
+
+logger = get_logger(__name__)
 
 router = APIRouter(tags=["Health"])
 
 
-async def check_database(session: AsyncSession) -> bool:
+async def _select_one(db_engine: AsyncEngine) -> None:
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def check_database(db_engine: AsyncEngine, timeout: float) -> bool:
     """Check database connectivity."""
     try:
-        await session.execute(text("SELECT 1"))
+        await asyncio.wait_for(_select_one(db_engine), timeout=timeout)
         return True
     except Exception:
         return False
 
 
+def _system_usage() -> Dict[str, float]:
+    return {
+        # Non-blocking: CPU use since the previous sample
+        "cpu_usage": psutil.cpu_percent(),
+        "memory_usage": psutil.virtual_memory().percent,
+        "disk_usage": psutil.disk_usage("/").percent,
+    }
+
+
+class HealthSampler:
+    """Background task refreshing system and database readings so probes only read a snapshot.
+
+    It wakes every ``lag_interval`` seconds; how late each wake-up is gives the event loop lag.
+    Every ``interval`` seconds it also refreshes the system usage and database connectivity.
+    """
+
+    def __init__(self, db_engine: AsyncEngine, interval: float, lag_interval: float, db_timeout: float):
+        self.engine = db_engine
+        self.interval = interval
+        self.lag_interval = lag_interval
+        self.db_timeout = db_timeout
+        self.snapshot: Dict[str, Any] = {}
+        self.loop_lag = 0.0
+        self.max_loop_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def sample(self) -> None:
+        started = time.perf_counter()
+        database = await check_database(self.engine, self.db_timeout)
+        self.snapshot = {
+            "timestamp": time.time(),
+            "database": database,
+            "database_latency": time.perf_counter() - started,
+            "system": await asyncio.to_thread(_system_usage),
+            "max_loop_lag": self.max_loop_lag,
+        }
+        self.max_loop_lag = self.loop_lag
+
+    def age(self) -> Optional[float]:
+        """Seconds since the last sample, or None before the first one."""
+        return time.time() - self.snapshot["timestamp"] if self.snapshot else None
+
+    async def _run(self) -> None:
+        last_sample = float("-inf")
+        while True:
+            if time.monotonic() - last_sample >= self.interval:
+                last_sample = time.monotonic()
+                try:
+                    await self.sample()
+                except Exception as e:
+                    logger.warning("health_sample_failed", extra={"error": str(e)})
+
+            woke_at = time.monotonic() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            self.loop_lag = max(time.monotonic() - woke_at, 0.0)
+            self.max_loop_lag = max(self.max_loop_lag, self.loop_lag)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+health_sampler = HealthSampler(
+    engine,
+    interval=settings.HEALTH_SAMPLE_INTERVAL,
+    lag_interval=settings.HEALTH_LAG_INTERVAL,
+    db_timeout=settings.HEALTH_DB_TIMEOUT,
+)
+
+
 @router.get("/health")
-async def health_check(session: AsyncSession = Depends(get_session)) -> Dict:
+async def health_check() -> Dict:
     """Basic health check endpoint."""
-    return {"status": "healthy", "version": settings.VERSION, "database": await check_database(session)}
+    return {"status": "healthy", "version": settings.VERSION, "database": health_sampler.snapshot.get("database")}
+
+
+@router.get("/health/live")
+async def liveness_check() -> JSONResponse:
+    """Liveness probe: the event loop answers and the health sampler is still running."""
+    age = health_sampler.age()
+    alive = age is None or age < 3 * health_sampler.interval + health_sampler.db_timeout
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if alive else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "alive" if alive else "stalled", "loop_lag": health_sampler.loop_lag, "sample_age": age},
+    )
+
+
+@router.get("/health/ready")
+async def readiness_check() -> JSONResponse:
+    """Readiness probe: the database answered the last sample, the pool has room and the loop keeps up."""
+    pool = pool_stats(engine.pool)
+    saturation = pool["saturation"]
+    reasons = []
+    if not health_sampler.snapshot:
+        reasons.append("starting")
+    elif not health_sampler.snapshot["database"]:
+        reasons.append("database_unreachable")
+    if saturation is not None and saturation >= settings.HEALTH_MAX_POOL_SATURATION:
+        reasons.append("pool_saturated")
+    if health_sampler.loop_lag > settings.HEALTH_MAX_LOOP_LAG:
+        reasons.append("event_loop_lagging")
+
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE if reasons else status.HTTP_200_OK,
+        content={
+            "status": "not_ready" if reasons else "ready",
+            "reasons": reasons,
+            "pool_saturation": saturation,
+            "loop_lag": health_sampler.loop_lag,
+        },
+    )
 
 
 @router.get("/health/detailed")
-async def detailed_health_check(session: AsyncSession = Depends(get_session)) -> Dict:
+async def detailed_health_check() -> Dict:
     """Detailed health check with system metrics."""
+    snapshot = health_sampler.snapshot
     return {
         "status": "healthy",
         "version": settings.VERSION,
         "timestamp": time.time(),
-        "database": await check_database(session),
-        "system": {
-            "cpu_usage": psutil.cpu_percent(),
-            "memory_usage": psutil.virtual_memory().percent,
-            "disk_usage": psutil.disk_usage("/").percent,
+        "database": snapshot.get("database"),
+        "system": snapshot.get("system"),
+        "sample": {
+            "age": health_sampler.age(),
+            "database_latency": snapshot.get("database_latency"),
+            "loop_lag": health_sampler.loop_lag,
+            "max_loop_lag": snapshot.get("max_loop_lag"),
         },
+        "database_pool": pool_stats(engine.pool),
+        "replicas": replicas.stats(),
+        "tenant_engines": tenant_engines.stats(),
+        "tenant_health": tenant_health.stats(),
+        "tenant_usage": tenant_usage.stats(),
+        "placement": placement_scheduler.stats(),
+        "password_hasher": password_hasher.stats(),
+        "caches": {name: cache.stats() for name, cache in caches.items()},
     }
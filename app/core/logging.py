@@ -1,10 +1,14 @@
-import json
+import asyncio
 import logging
 import logging.handlers
+import queue
+import random
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+import orjson
 
 from app.core.config import settings
 
@@ -12,13 +16,17 @@ from app.core.config import settings
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
 
+# Attributes every LogRecord has; anything else on a record was passed via ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
 
     def format(self, record: logging.LogRecord) -> str:
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            # Records are formatted later on the listener thread, so use their creation time
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat(),
             "level": record.levelname,
             "message": record.getMessage(),
             "module": record.module,
@@ -26,26 +34,58 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
-        # Add extra fields if they exist
-        if hasattr(record, "extra"):
-            log_data.update(record.extra)
+        # Add extra fields
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                log_data[key] = value
 
         # Add exception info if it exists
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_data)
+        return orjson.dumps(log_data, default=str).decode()
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread without formatting them; drops records if the queue is full."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge the arguments now, since they may change after the call; JSON and traceback
+        # formatting happen on the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+queue_handler: Optional[NonBlockingQueueHandler] = None
 
 
 def setup_logging() -> None:
-    """Configure logging for the application."""
+    """Configure logging for the application.
+
+    The root logger only enqueues records; a listener thread formats them and writes them out.
+    """
+    global _listener, queue_handler
+    if _listener is not None:
+        return
+
     logger = logging.getLogger()
     logger.setLevel(logging.INFO if not settings.DEBUG else logging.DEBUG)
 
     # Console handler with JSON formatting
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(JSONFormatter())
-    logger.addHandler(console_handler)
 
     # File handler for errors
     error_handler = logging.handlers.RotatingFileHandler(
@@ -53,12 +93,17 @@ def setup_logging() -> None:
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(JSONFormatter())
-    logger.addHandler(error_handler)
 
     # File handler for all logs
     file_handler = logging.handlers.RotatingFileHandler(LOGS_DIR / "app.log", maxBytes=10485760, backupCount=5)  # 10MB
     file_handler.setFormatter(JSONFormatter())
-    logger.addHandler(file_handler)
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(
+        queue_handler.queue, console_handler, error_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
 
     # Set logging level for third-party libraries
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
@@ -66,6 +111,95 @@ def setup_logging() -> None:
     logging.getLogger("alembic").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener, queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    logging.getLogger().removeHandler(queue_handler)
+    _listener = None
+    queue_handler = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with the given name."""
     return logging.getLogger(name)
+
+
+class AccessLog:
+    """Samples ``request_processed`` lines and periodically logs an ``access_summary`` of all requests.
+
+    Server errors and requests slower than ``slow_threshold`` seconds are always logged; other
+    requests are logged with probability ``sample_rate``.
+    """
+
+    def __init__(self, sample_rate: float, slow_threshold: float, summary_interval: float):
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.summary_interval = summary_interval
+        self._logger = get_logger("app.access")
+        self._task: Optional[asyncio.Task] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.requests = 0
+        self.sampled_out = 0
+        self.by_status: Dict[str, int] = {}
+        self.process_time = 0.0
+        self.max_process_time = 0.0
+
+    def record(self, method: str, path: str, status_code: int, process_time: float, **fields: Any) -> None:
+        status_class = f"{status_code // 100}xx"
+        self.requests += 1
+        self.by_status[status_class] = self.by_status.get(status_class, 0) + 1
+        self.process_time += process_time
+        self.max_process_time = max(self.max_process_time, process_time)
+
+        if status_code < 500 and process_time < self.slow_threshold and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return
+        self._logger.info(
+            "request_processed",
+            extra={"path": path, "method": method, "process_time": process_time, "status_code": status_code, **fields},
+        )
+
+    def summarize(self) -> None:
+        if self.requests:
+            self._logger.info(
+                "access_summary",
+                extra={
+                    "requests": self.requests,
+                    "sampled_out": self.sampled_out,
+                    "status": self.by_status,
+                    "avg_process_time": self.process_time / self.requests,
+                    "max_process_time": self.max_process_time,
+                    "dropped_log_records": queue_handler.dropped if queue_handler is not None else 0,
+                },
+            )
+        self._reset()
+
+    async def _summarize_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.summary_interval)
+            self.summarize()
+
+    def start(self) -> None:
+        if self._task is None and self.summary_interval > 0:
+            self._task = asyncio.create_task(self._summarize_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.summarize()
+
+
+access_log = AccessLog(
+    sample_rate=settings.LOG_ACCESS_SAMPLE_RATE,
+    slow_threshold=settings.LOG_ACCESS_SLOW_THRESHOLD,
+    summary_interval=settings.LOG_ACCESS_SUMMARY_INTERVAL,
+)
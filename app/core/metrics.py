@@ -0,0 +1,286 @@
+import asyncio
+import json
+import os
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Response
+
+from app.core.cache import caches
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security import password_hasher
+from app.database.replicas import replicas
+from app.database.session import engine
+from app.database.tenant import tenant_engines
+
+logger = get_logger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class Metric:
+    """One metric family: ``samples`` maps (sample name, labels) to a value."""
+
+    name: str
+    type: str
+    help: str
+    samples: Dict[Tuple[str, Labels], float] = field(default_factory=dict)
+
+    def add(self, value: float, suffix: str = "", **labels: str) -> None:
+        key = (self.name + suffix, tuple(sorted(labels.items())))
+        self.samples[key] = self.samples.get(key, 0.0) + value
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # Per-bucket counts; the last slot holds observations above the largest bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def collect(self, metric: Metric, **labels: str) -> None:
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            metric.add(cumulative, "_bucket", le=f"{bound:g}", **labels)
+        cumulative += self.counts[-1]
+        metric.add(cumulative, "_bucket", le="+Inf", **labels)
+        metric.add(self.sum, "_sum", **labels)
+        metric.add(cumulative, "_count", **labels)
+
+
+class RequestMetrics:
+    """Per-worker request counters.
+
+    Only updated from the event loop thread, so plain integers and dicts need no locking; with
+    several workers each one keeps its own and ``/metrics`` sums them in multiprocess mode.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        key = (method, route, str(status_code))
+        self.requests[key] = self.requests.get(key, 0) + 1
+        histogram = self.latency.get((method, route))
+        if histogram is None:
+            histogram = self.latency[(method, route)] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def collect(self) -> List[Metric]:
+        requests = Metric("http_requests_total", "counter", "HTTP requests by route and status code.")
+        for (method, route, status_code), count in self.requests.items():
+            requests.add(count, method=method, route=route, status=status_code)
+
+        latency = Metric("http_request_duration_seconds", "histogram", "HTTP request latency by route.")
+        for (method, route), histogram in self.latency.items():
+            histogram.collect(latency, method=method, route=route)
+
+        in_flight = Metric("http_requests_in_flight", "gauge", "HTTP requests being served.")
+        in_flight.add(self.in_flight)
+        return [requests, latency, in_flight]
+
+
+def collect_caches() -> List[Metric]:
+    hits = Metric("cache_hits_total", "counter", "Cache lookups served from memory.")
+    misses = Metric("cache_misses_total", "counter", "Cache lookups that had to load.")
+    size = Metric("cache_entries", "gauge", "Entries held by the cache.")
+    for name, cache in caches.items():
+        stats = cache.stats()
+        hits.add(stats["hits"], cache=name)
+        misses.add(stats["misses"], cache=name)
+        size.add(stats["size"], cache=name)
+    return [hits, misses, size]
+
+
+def collect_database() -> List[Metric]:
+    in_use = Metric("db_pool_connections_in_use", "gauge", "Connections checked out of the pool.")
+    capacity = Metric("db_pool_capacity", "gauge", "Most connections the pool hands out at once.")
+    checkouts = Metric("db_pool_checkouts_total", "counter", "Connections checked out of the pool.")
+    timeouts = Metric("db_pool_timeouts_total", "counter", "Checkouts that gave up waiting for a connection.")
+    wait = Metric("db_pool_wait_seconds_total", "counter", "Time spent waiting for pooled connections.")
+
+    pools = [("master", engine.pool)] + [
+        (replica.engine.url.host or "", replica.engine.pool) for replica in replicas.replicas
+    ]
+    for name, pool in pools:
+        pool_metrics = pool.metrics
+        in_use.add(pool_metrics.in_use, pool=name)
+        if pool.capacity() is not None:
+            capacity.add(pool.capacity(), pool=name)
+        checkouts.add(pool_metrics.checkouts, pool=name)
+        timeouts.add(pool_metrics.timeouts, pool=name)
+        wait.add(pool_metrics.wait_seconds, pool=name)
+
+    # Tenant engines come and go, so only their current totals are reported
+    tenants = tenant_engines.stats()
+    tenant_engine_count = Metric("tenant_engines", "gauge", "Open tenant database engines.")
+    tenant_engine_count.add(tenants["engines"])
+    in_use.add(tenants["checked_out"], pool="tenants")
+    return [in_use, capacity, checkouts, timeouts, wait, tenant_engine_count]
+
+
+def collect_password_hasher() -> List[Metric]:
+    queue_depth = Metric("password_hash_queue_depth", "gauge", "Password hashes waiting for a worker.")
+    in_flight = Metric("password_hash_in_flight", "gauge", "Password hashes admitted to the executor.")
+    completed = Metric("password_hash_completed_total", "counter", "Password hashes computed.")
+    rejected = Metric("password_hash_rejected_total", "counter", "Password hashes rejected with a 503.")
+    seconds = Metric("password_hash_seconds_total", "counter", "Time spent computing password hashes.")
+
+    queue_depth.add(password_hasher.stats()["queue_depth"])
+    in_flight.add(password_hasher.in_flight)
+    completed.add(password_hasher.completed)
+    rejected.add(password_hasher.rejected)
+    seconds.add(password_hasher.hash_seconds)
+    return [queue_depth, in_flight, completed, rejected, seconds]
+
+
+request_metrics = RequestMetrics()
+
+# Subsystems register callables returning their current metrics
+collectors: List[Callable[[], List[Metric]]] = [
+    request_metrics.collect,
+    collect_caches,
+    collect_database,
+    collect_password_hasher,
+]
+
+
+def collect() -> List[Metric]:
+    metrics: List[Metric] = []
+    for collector in collectors:
+        try:
+            metrics.extend(collector())
+        except Exception as e:
+            logger.warning("metrics_collector_failed", extra={"collector": repr(collector), "error": str(e)})
+    return metrics
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render(metrics: List[Metric]) -> str:
+    """Render metric families in the Prometheus text exposition format."""
+    families: Dict[str, Metric] = {}
+    for metric in metrics:
+        family = families.setdefault(metric.name, Metric(metric.name, metric.type, metric.help))
+        for key, value in metric.samples.items():
+            family.samples[key] = family.samples.get(key, 0.0) + value
+
+    lines: List[str] = []
+    for family in families.values():
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        for (name, labels), value in family.samples.items():
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+            lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+class MultiprocessStore:
+    """Shares each worker's metrics through ``<directory>/<pid>.json`` so any worker can serve the sum.
+
+    Counters and histograms of exited workers are kept so totals never go backwards; their
+    gauges are dropped. Clear the directory before starting the server.
+    """
+
+    def __init__(self, directory: str, flush_interval: float):
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def flush(self) -> None:
+        payload = [
+            {
+                "name": m.name,
+                "type": m.type,
+                "help": m.help,
+                "samples": [[n, list(lb), v] for (n, lb), v in m.samples.items()],
+            }
+            for m in collect()
+        ]
+        path = self.directory / f"{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload))
+        tmp.replace(path)
+
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def read(self) -> List[Metric]:
+        metrics: List[Metric] = []
+        for path in self.directory.glob("*.json"):
+            try:
+                payload = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            alive = self._alive(int(path.stem))
+            for entry in payload:
+                if entry["type"] == "gauge" and not alive:
+                    continue
+                metric = Metric(entry["name"], entry["type"], entry["help"])
+                for name, labels, value in entry["samples"]:
+                    metric.samples[(name, tuple(tuple(label) for label in labels))] = value
+                metrics.append(metric)
+        return metrics
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning("metrics_flush_failed", extra={"error": str(e)})
+
+    def start(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.flush()
+
+
+multiprocess_store: Optional[MultiprocessStore] = (
+    MultiprocessStore(settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_INTERVAL)
+    if settings.METRICS_MULTIPROC_DIR
+    else None
+)
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics for this worker, or for all workers in multiprocess mode."""
+    if multiprocess_store is None:
+        body = render(collect())
+    else:
+        multiprocess_store.flush()
+        body = render(multiprocess_store.read())
+    return Response(body, media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,52 +1,93 @@
 import time
 import traceback
-from typing import Callable
 
-from fastapi import Request, Response, status
+from fastapi import status
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.logging import get_logger
+from app.core.logging import access_log, get_logger
+from app.core.metrics import request_metrics
+from app.core.tracing import end_trace, start_trace
 
 logger = get_logger(__name__)
 
 
-async def error_handler_middleware(request: Request, call_next: Callable) -> Response:
-    """Global error handling middleware."""
-    try:
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-
-        # Log request details
-        logger.info(
-            "request_processed",
-            extra={
-                "path": request.url.path,
-                "method": request.method,
-                "process_time": process_time,
-                "status_code": response.status_code,
-            },
-        )
-
-        return response
-
-    except SQLAlchemyError as e:
-        logger.error("database_error", extra={"error": str(e), "path": request.url.path, "method": request.method})
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "Database error occurred"}
-        )
-
-    except Exception as e:
-        logger.error(
-            "unhandled_error",
-            extra={
-                "error": str(e),
-                "path": request.url.path,
-                "method": request.method,
-                "traceback": traceback.format_exc(),
-            },
-        )
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "Internal server error"}
-        )
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, so metrics are not labelled per organization name or ID."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class ErrorHandlerMiddleware:
+    """Global error handling, request logging and metrics as a pure ASGI middleware.
+
+    Messages are passed straight through rather than via ``BaseHTTPMiddleware``'s extra task and
+    memory stream, so streaming responses are not held up and each request costs one coroutine.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = True
+            await send(message)
+
+        request_metrics.in_flight += 1
+        trace = start_trace(f'{scope["method"]} {scope["path"]}')
+        try:
+            await self.app(scope, receive, send_wrapper)
+            access_log.record(
+                scope["method"],
+                scope["path"],
+                status_code,
+                time.perf_counter() - start_time,
+                trace_id=trace.trace_id,
+                queries=trace.queries,
+                db_time=trace.db_time,
+            )
+
+        except SQLAlchemyError as e:
+            logger.error("database_error", extra={"error": str(e), "path": scope["path"], "method": scope["method"]})
+            if response_started:
+                # Part of the response is already on the wire; all we can do is abort the connection
+                raise
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+            response = JSONResponse(status_code=status_code, content={"detail": "Database error occurred"})
+            await response(scope, receive, send)
+
+        except Exception as e:
+            logger.error(
+                "unhandled_error",
+                extra={
+                    "error": str(e),
+                    "path": scope["path"],
+                    "method": scope["method"],
+                    "traceback": traceback.format_exc(),
+                },
+            )
+            if response_started:
+                # Part of the response is already on the wire; all we can do is abort the connection
+                raise
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+            response = JSONResponse(status_code=status_code, content={"detail": "Internal server error"})
+            await response(scope, receive, send)
+
+        finally:
+            end_trace(trace, route=route_template(scope), status_code=status_code)
+            request_metrics.in_flight -= 1
+            request_metrics.observe(
+                scope["method"], route_template(scope), status_code, time.perf_counter() - start_time
+            )
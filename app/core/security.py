@@ -1,10 +1,16 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
+from fastapi import HTTPException, status
 from jose import jwt
 from passlib.context import CryptContext
 
-from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
+from app.core.cache import TTLCache
+from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY, settings
+from app.core.tracing import traced
 
 # Security settings
 # SECRET_KEY = "your_jwt_secret_change_this_in_production"  # Change this!
@@ -13,6 +19,8 @@ from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -22,9 +30,140 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _timed(fn: Callable[..., T], *args: Any) -> Tuple[T, float]:
+    start = time.perf_counter()
+    return fn(*args), time.perf_counter() - start
+
+
+class PasswordHasher:
+    """Runs bcrypt on a thread or process pool so hashing never blocks the event loop.
+
+    At most ``workers + max_queue`` calls are admitted at once; callers beyond that wait up to
+    ``queue_timeout`` seconds for a slot and are then rejected with a 503.
+    """
+
+    def __init__(self, executor_type: str, workers: int, max_queue: int, queue_timeout: float):
+        self.executor_type = executor_type
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the running loop rather than the import-time one.
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers + self.max_queue)
+        return self._slots
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        slots = self._get_slots()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Password hashing queue is full",
+                headers={"Retry-After": "1"},
+            )
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self._get_executor(), _timed, fn, *args)
+        finally:
+            self.in_flight -= 1
+            slots.release()
+
+        self.completed += 1
+        self.hash_seconds += elapsed
+        self.max_hash_seconds = max(self.max_hash_seconds, elapsed)
+        self.wait_seconds += max(time.perf_counter() - start - elapsed, 0.0)
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "queue_depth": self.waiting + max(self.in_flight - self.workers, 0),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_hash_seconds": self.hash_seconds / self.completed if self.completed else 0.0,
+            "max_hash_seconds": self.max_hash_seconds,
+            "avg_wait_seconds": self.wait_seconds / self.completed if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._slots = None
+
+
+password_hasher = PasswordHasher(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
+
+
+@traced("bcrypt")
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+@traced("bcrypt")
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+
 def create_access_token(data: Dict[str, Any]) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+# Decoded claims keyed by the raw token, so repeated requests with one bearer token skip jwt.decode
+claims_cache: TTLCache[str, Dict[str, Any]] = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.TOKEN_CACHE_TTL
+)
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verify and decode a JWT, reusing earlier results for the same token until it expires."""
+    claims = claims_cache.get(token)
+    if claims is not None:
+        return claims
+
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    ttl = settings.TOKEN_CACHE_TTL
+    if "exp" in claims:
+        ttl = min(ttl, claims["exp"] - time.time())
+    if ttl > 0:
+        claims_cache.set(token, claims, ttl=ttl)
+    return claims
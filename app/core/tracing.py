@@ -0,0 +1,266 @@
+import functools
+import inspect
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+C = TypeVar("C", bound=type)
+
+SQL_MAX_LENGTH = 1000
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    kind: str
+    start: float
+    duration: float = 0.0
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+def _new_id(bits: int = 64) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Trace:
+    """Spans and database totals of one request."""
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.trace_id = _new_id(128)
+        self.root = Span(self.trace_id, _new_id(), None, name, "http", time.time(), attributes=attributes)
+        self.spans: List[Span] = []
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements: "Counter[str]" = Counter()
+        self._started = time.perf_counter()
+        self._tokens: Tuple[Token, Token] = (_trace.set(self), _span.set(self.root))
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_span: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _trace.get()
+
+
+class SpanExporter:
+    """Receives the spans of each finished request; the base class drops them."""
+
+    def export(self, spans: List[Span]) -> None:
+        pass
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps finished spans in a list, for tests."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    def export(self, spans: List[Span]) -> None:
+        self.spans.extend(spans)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class JsonlExporter(SpanExporter):
+    """Appends spans, one JSON object per line, from a background thread."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._queue: "queue.SimpleQueue[Optional[List[Span]]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self, spans: List[Span]) -> None:
+        if self._thread is not None:
+            self._queue.put(spans)
+
+    def _write(self) -> None:
+        with self.path.open("ab") as f:
+            while True:
+                spans = self._queue.get()
+                if spans is None:
+                    return
+                f.write(b"".join(orjson.dumps(asdict(span), default=str) + b"\n" for span in spans))
+                if self._queue.empty():
+                    f.flush()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._write, name="trace-exporter", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+def _make_exporter(kind: str) -> SpanExporter:
+    if kind == "jsonl":
+        return JsonlExporter(settings.TRACING_FILE)
+    if kind == "memory":
+        return InMemoryExporter()
+    return SpanExporter()
+
+
+exporter = _make_exporter(settings.TRACING_EXPORTER)
+
+
+def start_trace(name: str, **attributes: Any) -> Trace:
+    """Begin a request trace in the current context; pair with ``end_trace``."""
+    return Trace(name, attributes)
+
+
+def end_trace(trace: Trace, **attributes: Any) -> None:
+    """Close the request span, export the trace and warn if the request ran suspiciously many queries."""
+    trace_token, span_token = trace._tokens
+    _span.reset(span_token)
+    _trace.reset(trace_token)
+
+    root = trace.root
+    root.duration = time.perf_counter() - trace._started
+    root.attributes.update(attributes, queries=trace.queries, db_time=trace.db_time)
+    exporter.export(trace.spans + [root])
+
+    if trace.queries > settings.TRACING_QUERY_WARN_THRESHOLD:
+        logger.warning(
+            "too_many_queries",
+            extra={
+                "trace_id": trace.trace_id,
+                "request": root.name,
+                "queries": trace.queries,
+                "db_time": trace.db_time,
+                # Many runs of one statement usually mean a query per row (N+1)
+                "repeated": [{"count": count, "statement": sql} for sql, count in trace.statements.most_common(3)],
+            },
+        )
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Optional[Span]]:
+    """Record a child span of the current span; a no-op outside a request trace."""
+    trace = _trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _span.get()
+    current = Span(trace.trace_id, _new_id(), parent.span_id if parent else None, name, kind, time.time())
+    current.attributes.update(attributes)
+    token = _span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _span.reset(token)
+        trace.spans.append(current)
+
+
+def traced(kind: str, name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorate an async function so each call runs in a span."""
+
+    def decorator(fn: F) -> F:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _trace.get() is None:
+                return await fn(*args, **kwargs)
+            with span(span_name, kind):
+                return await fn(*args, **kwargs)
+
+        wrapper.__traced__ = True  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def trace_methods(kind: str) -> Callable[[C], C]:
+    """Class decorator wrapping every coroutine method defined on the class in a span."""
+
+    def decorator(cls: C) -> C:
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("__") or not inspect.iscoroutinefunction(value) or getattr(value, "__traced__", False):
+                continue
+            setattr(cls, attr, traced(kind, f"{cls.__name__}.{attr}")(value))
+        return cls
+
+    return decorator
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool):
+    trace = _trace.get()
+    if trace is None:
+        return
+    parent = _span.get()
+    sql_span = Span(
+        trace.trace_id,
+        _new_id(),
+        parent.span_id if parent else None,
+        "sql",
+        "sql",
+        time.time(),
+        attributes={"statement": statement[:SQL_MAX_LENGTH], "executemany": executemany},
+    )
+    conn.info.setdefault("trace_spans", []).append((sql_span, time.perf_counter()))
+
+
+def _finish_sql_span(conn: Any, error: Optional[str] = None) -> None:
+    pending = conn.info.get("trace_spans")
+    trace = _trace.get()
+    if not pending or trace is None:
+        return
+    sql_span, started = pending.pop()
+    sql_span.duration = time.perf_counter() - started
+    sql_span.error = error
+    trace.spans.append(sql_span)
+    trace.queries += 1
+    trace.db_time += sql_span.duration
+    trace.statements[sql_span.attributes["statement"]] += 1
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool):
+    _finish_sql_span(conn)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context: Any) -> None:
+    if exception_context.connection is not None:
+        _finish_sql_span(exception_context.connection, type(exception_context.original_exception).__name__)
@@ -1,58 +1,175 @@
-from typing import Generic, List, Optional, Type, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Generic,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Row, Select, column, delete, insert, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.tracing import trace_methods
+from app.database.replicas import REPLICA, read_from_replica
+
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+@trace_methods("dao")
 class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType], session: AsyncSession):
         self.model = model
         self.session = session
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Subclass DAO methods get a span of their own, like the inherited ones
+        trace_methods("dao")(cls)
+
+    async def lookup(self, stmt: Select) -> Optional[Row]:
+        """First row of a read-only lookup, preferably from a read replica.
+
+        A replica miss is re-checked on the primary, since the row may not have been replayed yet.
+        """
+        row = (await self.session.execute(stmt, bind_arguments=REPLICA)).first()
+        if row is None and read_from_replica(self.session):
+            row = (await self.session.execute(stmt)).first()
+        return row
+
     async def get(self, id: int) -> Optional[ModelType]:
         """Get a record by ID."""
-        result = await self.session.execute(select(self.model).where(self.model.id == id))
-        return result.scalars().first()
+        row = await self.lookup(select(self.model).where(self.model.id == id))
+        return row[0] if row else None
 
     async def get_all(self) -> List[ModelType]:
         """Get all records."""
-        result = await self.session.execute(select(self.model))
+        result = await self.session.execute(select(self.model), bind_arguments=REPLICA)
         return list(result.scalars().all())
 
-    async def create(self, obj_in: CreateSchemaType) -> ModelType:
-        """Create a new record."""
-        obj_data = obj_in.model_dump()
-        db_obj = self.model(**obj_data)
-        self.session.add(db_obj)
+    async def get_page(self, *filters: Any, after_id: Optional[int] = None, limit: int = 100) -> List[ModelType]:
+        """Get up to ``limit`` records ordered by ID, starting after ``after_id`` (keyset pagination)."""
+        stmt = select(self.model).where(*filters).order_by(self.model.id).limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(self.model.id > after_id)
+        result = await self.session.execute(stmt, bind_arguments=REPLICA)
+        return list(result.scalars().all())
+
+    async def stream(self, *filters: Any, batch_size: int = 1000) -> AsyncIterator[ModelType]:
+        """Yield records ordered by ID from a server-side cursor, fetching ``batch_size`` rows at a time."""
+        # Server-side cursors need a transaction, which the AUTOCOMMIT master engine never opens.
+        # REPEATABLE READ also gives the whole export one consistent snapshot.
+        await self.session.connection(bind_arguments=REPLICA, execution_options={"isolation_level": "REPEATABLE READ"})
+        stmt = select(self.model).where(*filters).order_by(self.model.id).execution_options(yield_per=batch_size)
+        result = await self.session.stream_scalars(stmt, bind_arguments=REPLICA)
+        async for obj in result:
+            yield obj
+
+    async def insert(self, values: Dict[str, Any]) -> ModelType:
+        """Insert a record from column values with a single INSERT ... RETURNING."""
+        result = await self.session.scalars(insert(self.model).values(**values).returning(self.model))
+        db_obj = result.one()
         await self.session.commit()
-        await self.session.refresh(db_obj)
         return db_obj
 
+    async def insert_many(self, rows: Sequence[Dict[str, Any]]) -> List[ModelType]:
+        """Insert records from column values with one batched INSERT ... RETURNING, preserving order."""
+        if not rows:
+            return []
+        result = await self.session.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True), list(rows)
+        )
+        db_objs = list(result.all())
+        await self.session.commit()
+        return db_objs
+
+    async def create(self, obj_in: CreateSchemaType) -> ModelType:
+        """Create a new record."""
+        return await self.insert(obj_in.model_dump())
+
+    async def create_many(self, objs_in: Sequence[CreateSchemaType]) -> List[ModelType]:
+        """Create many records in a single round trip."""
+        return await self.insert_many([obj_in.model_dump() for obj_in in objs_in])
+
     async def update(self, id: int, obj_in: UpdateSchemaType) -> Optional[ModelType]:
         """Update a record."""
-        db_obj = await self.get(id)
-        if not db_obj:
-            return None
-
         obj_data = obj_in.model_dump(exclude_unset=True)
-        for field, value in obj_data.items():
-            setattr(db_obj, field, value)
+        if not obj_data:
+            return await self.get(id)
 
+        result = await self.session.scalars(
+            update(self.model).where(self.model.id == id).values(**obj_data).returning(self.model)
+        )
+        db_obj = result.one_or_none()
+        await self.session.commit()
+        return db_obj
+
+    async def update_many(self, objs_in: Mapping[int, UpdateSchemaType]) -> int:
+        """Update many records by ID; returns how many records were updated.
+
+        Records setting the same columns share one ``UPDATE ... FROM (VALUES ...) RETURNING`` statement,
+        so the count comes from the returned IDs rather than the driver's executemany rowcount.
+        """
+        groups: Dict[Tuple[str, ...], List[Tuple[Any, ...]]] = {}
+        for id, obj_in in objs_in.items():
+            obj_data = obj_in.model_dump(exclude_unset=True)
+            if obj_data:
+                columns = tuple(sorted(obj_data))
+                groups.setdefault(columns, []).append((id, *(obj_data[name] for name in columns)))
+        if not groups:
+            return 0
+
+        table = self.model.__table__
+        updated = 0
+        for columns, rows in groups.items():
+            source = values(*(column(name, table.c[name].type) for name in ("id", *columns)), name="source").data(rows)
+            stmt = (
+                update(table)
+                .where(table.c.id == source.c.id)
+                .values({name: source.c[name] for name in columns})
+                .returning(table.c.id)
+            )
+            updated += len((await self.session.execute(stmt)).all())
+        await self.session.commit()
+        return updated
+
+    async def upsert(self, obj_in: CreateSchemaType, conflict_columns: Sequence[str]) -> ModelType:
+        """Insert a record, or update the existing one that conflicts on ``conflict_columns``."""
+        obj_data = obj_in.model_dump()
+        stmt = pg_insert(self.model).values(**obj_data)
+        updates = [column for column in obj_data if column not in conflict_columns] or list(conflict_columns)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: stmt.excluded[column] for column in updates},
+        )
+        result = await self.session.scalars(stmt.returning(self.model), execution_options={"populate_existing": True})
+        db_obj = result.one()
         await self.session.commit()
-        await self.session.refresh(db_obj)
         return db_obj
 
     async def delete(self, id: int) -> bool:
         """Delete a record."""
-        db_obj = await self.get(id)
-        if not db_obj:
-            return False
+        result = await self.session.execute(delete(self.model).where(self.model.id == id).returning(self.model.id))
+        deleted = result.scalar_one_or_none()
+        await self.session.commit()
+        return deleted is not None
 
-        await self.session.delete(db_obj)
+    async def delete_many(self, ids: Sequence[int]) -> List[int]:
+        """Delete many records by ID in one statement; returns the IDs that were deleted."""
+        if not ids:
+            return []
+        result = await self.session.execute(
+            delete(self.model).where(self.model.id.in_(list(ids))).returning(self.model.id)
+        )
+        deleted = list(result.scalars().all())
         await self.session.commit()
-        return True
+        return deleted
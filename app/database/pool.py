@@ -0,0 +1,112 @@
+import time
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
+
+from app.core.config import settings
+
+
+class PoolMetrics:
+    """Checkout counters for one engine's pool; survives ``engine.dispose()``."""
+
+    def __init__(self) -> None:
+        self.in_use = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_wait(self, elapsed: float) -> None:
+        self.wait_seconds += elapsed
+        self.max_wait_seconds = max(self.max_wait_seconds, elapsed)
+
+
+class _InstrumentedPool(Pool):
+    """Times every checkout (queue wait plus connect for a fresh connection) and tracks usage."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+        self.metrics.checkouts += 1
+        self.metrics.in_use += 1
+        return record
+
+    def _do_return_conn(self, record: Any) -> None:
+        self.metrics.in_use -= 1
+        super()._do_return_conn(record)
+
+    def recreate(self) -> Pool:
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def capacity(self) -> Optional[int]:
+        """Most connections the pool hands out at once, or ``None`` when unbounded."""
+        return None
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    def capacity(self) -> Optional[int]:
+        if self._max_overflow < 0:
+            return None
+        return self.size() + self._max_overflow
+
+
+class InstrumentedNullPool(_InstrumentedPool, NullPool):
+    pass
+
+
+def pool_stats(pool: Pool) -> Dict:
+    """Usage and checkout latency of an instrumented pool."""
+    metrics: PoolMetrics = pool.metrics
+    capacity = pool.capacity()
+    return {
+        "pool": type(pool).__name__,
+        "capacity": capacity,
+        "in_use": metrics.in_use,
+        "saturation": metrics.in_use / capacity if capacity else None,
+        "checkouts": metrics.checkouts,
+        "timeouts": metrics.timeouts,
+        "avg_wait_seconds": metrics.wait_seconds / metrics.checkouts if metrics.checkouts else 0.0,
+        "max_wait_seconds": metrics.max_wait_seconds,
+    }
+
+
+def engine_options(pool_size: int, max_overflow: int, pool_timeout: float) -> Dict[str, Any]:
+    """``create_async_engine`` pool arguments for the configured ``DB_POOL_MODE``."""
+    if settings.DB_POOL_MODE == "pgbouncer":
+        # PgBouncer in transaction mode pools server connections itself and may run consecutive
+        # statements on different backends, so keep no client pool and no prepared statements.
+        return {
+            "poolclass": InstrumentedNullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        }
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    }
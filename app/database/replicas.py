@@ -0,0 +1,158 @@
+import asyncio
+import itertools
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.database.pool import engine_options, pool_stats
+
+logger = get_logger(__name__)
+
+# Pass as ``bind_arguments`` to let a RoutingSession serve the statement from a read replica
+REPLICA: Dict[str, Any] = {"replica": True}
+
+REPLICATION_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+@dataclass
+class Replica:
+    url: str
+    engine: AsyncEngine
+    # Seconds behind the primary from the last check; None until checked or while unreachable
+    lag: Optional[float] = None
+
+
+class ReplicaSet:
+    """Read replicas of the master database, picked round-robin or by fewest checked-out connections.
+
+    A background task measures replication lag every ``check_interval`` seconds. Replicas that
+    are unreachable or more than ``max_lag`` seconds behind are skipped; with none left, reads
+    go to the primary.
+    """
+
+    def __init__(self, urls: List[str], policy: str, max_lag: float, check_interval: float):
+        self.policy = policy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.replicas = [
+            Replica(
+                url=url,
+                engine=create_async_engine(
+                    url,
+                    echo=settings.DB_ECHO,
+                    isolation_level="AUTOCOMMIT",
+                    **engine_options(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT),
+                ),
+            )
+            for url in urls
+        ]
+        self._next = itertools.count()
+        self._checker: Optional[asyncio.Task] = None
+        self.primary_fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Pick a replica within the lag budget, or None to use the primary."""
+        candidates = [replica for replica in self.replicas if replica.lag is not None and replica.lag <= self.max_lag]
+        if not candidates:
+            if self.replicas:
+                self.primary_fallbacks += 1
+            return None
+        if self.policy == "least_loaded":
+            return min(candidates, key=lambda replica: replica.engine.pool.metrics.in_use).engine
+        return candidates[next(self._next) % len(candidates)].engine
+
+    async def _measure(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                lag = await asyncio.wait_for(conn.scalar(REPLICATION_LAG_SQL), timeout=self.check_interval)
+            replica.lag = float(lag)
+        except Exception as e:
+            if replica.lag is not None:
+                logger.warning("replica_unavailable", extra={"replica": replica.engine.url.host, "error": str(e)})
+            replica.lag = None
+
+    async def check(self) -> None:
+        """Refresh the replication lag of every replica."""
+        await asyncio.gather(*(self._measure(replica) for replica in self.replicas))
+
+    async def _check_forever(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        if self.enabled and self._checker is None:
+            self._checker = asyncio.create_task(self._check_forever())
+
+    async def close(self) -> None:
+        if self._checker is not None:
+            self._checker.cancel()
+            await asyncio.gather(self._checker, return_exceptions=True)
+            self._checker = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> Dict:
+        return {
+            "policy": self.policy,
+            "max_lag": self.max_lag,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [
+                {"host": replica.engine.url.host, "lag": replica.lag, **pool_stats(replica.engine.pool)}
+                for replica in self.replicas
+            ],
+        }
+
+
+replicas = ReplicaSet(
+    urls=settings.DB_REPLICA_URLS,
+    policy=settings.DB_REPLICA_POLICY,
+    max_lag=settings.DB_REPLICA_MAX_LAG,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL,
+)
+
+
+class RoutingSession(Session):
+    """Session that serves statements executed with ``bind_arguments=REPLICA`` from a read replica.
+
+    Everything else goes to the primary. The first write (or any non-SELECT statement) pins the
+    session to the primary, so later reads in the same request see it. A session keeps using the
+    replica it picked first, so its reads never go backwards in time.
+    """
+
+    def __init__(self, *args: Any, replica_set: Optional[ReplicaSet] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.replica_set = replicas if replica_set is None else replica_set
+        self.pinned_to_primary = False
+        self.replica_engine: Optional[AsyncEngine] = None
+        self.last_read_from_replica = False
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, replica: bool = False, **kw: Any) -> Engine:
+        self.last_read_from_replica = False
+        if replica and not self.pinned_to_primary:
+            if self.replica_engine is None:
+                self.replica_engine = self.replica_set.choose()
+            if self.replica_engine is not None:
+                self.last_read_from_replica = True
+                return self.replica_engine.sync_engine
+        elif clause is None or not clause.is_select:
+            self.pinned_to_primary = True
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+def read_from_replica(session: AsyncSession) -> bool:
+    """Whether the last statement run on ``session`` was served by a replica."""
+    return getattr(session.sync_session, "last_read_from_replica", False)
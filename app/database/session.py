@@ -1,16 +1,25 @@
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, NamedTuple, Tuple
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import pool, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import DATABASE_URL
+from app.core.config import DATABASE_URL, settings
+from app.core.tracing import traced
+from app.database.pool import engine_options
+from app.database.replicas import RoutingSession
 
 # Create async engine for the master database
-engine = create_async_engine(DATABASE_URL, echo=True, isolation_level="AUTOCOMMIT")
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=settings.DB_ECHO,
+    isolation_level="AUTOCOMMIT",
+    **engine_options(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT),
+)
 
-# Create async session factory
-async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# Create async session factory; reads marked with REPLICA may be served by a read replica
+async_session = sessionmaker(engine, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -21,24 +30,165 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def create_database(db_name: str, user: str, password: str) -> str:
-    """Create a new database for an organization."""
+@asynccontextmanager
+async def try_advisory_lock(db_engine: AsyncEngine, key: int) -> AsyncIterator[bool]:
+    """Try to take a Postgres advisory lock for the duration of the block; yields whether it was taken.
+
+    The lock is transaction-scoped, so it is released with the transaction on the backend that took it.
+    A session-level lock behind PgBouncer transaction pooling could be unlocked on another backend and leak.
+    """
+    async with db_engine.connect() as conn:
+        # The admin engine autocommits, which would end the transaction (and the lock) with the statement
+        await conn.execution_options(isolation_level="READ COMMITTED")
+        async with conn.begin():
+            yield await conn.scalar(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key})
+
+
+class DatabaseServer(NamedTuple):
+    """A Postgres server that hosts organization databases, reached through an AUTOCOMMIT admin engine."""
+
+    engine: AsyncEngine
+    host: str
+    port: int
+
+
+# The master database server; the default home of organization databases
+master_server = DatabaseServer(engine, settings.POSTGRES_HOST, int(settings.POSTGRES_PORT))
+
+
+def tenant_db_url(db_name: str, user: str, password: str, server: DatabaseServer = master_server) -> str:
+    """Build the connection string for an organization database."""
+    return f"postgresql+asyncpg://{user}:{password}@{server.host}:{server.port}/{db_name}"
+
+
+@traced("ddl")
+async def create_database(
+    db_name: str, user: str, password: str, server: DatabaseServer = master_server
+) -> Tuple[str, bool]:
+    """Create a new database for an organization.
+
+    Returns the connection string and whether the database was created, rather than already existing.
+    """
     try:
-        async with engine.connect() as conn:
+        async with server.engine.connect() as conn:
             # Create new database (needs AUTOCOMMIT mode)
             await conn.execute(text(f'CREATE DATABASE "{db_name}"'))
 
+    except Exception as e:
+        # If database already exists, just return the connection string
+        if "already exists" in str(e):
+            return tenant_db_url(db_name, user, password, server), False
+        raise e
+
+    return await create_database_user(db_name, user, password, server), True
+
+
+@traced("ddl")
+async def create_database_user(db_name: str, user: str, password: str, server: DatabaseServer = master_server) -> str:
+    """Create the organization's user and grant it access to an existing database."""
+    async with server.engine.connect() as conn:
+        try:
             # Create user with password
             await conn.execute(text(f"CREATE USER \"{user}\" WITH PASSWORD '{password}'"))
+        except Exception as e:
+            if "already exists" not in str(e):
+                raise e
 
-            # Grant privileges
-            await conn.execute(text(f'GRANT ALL PRIVILEGES ON DATABASE "{db_name}" TO "{user}"'))
+        # Grant privileges
+        await conn.execute(text(f'GRANT ALL PRIVILEGES ON DATABASE "{db_name}" TO "{user}"'))
 
-            # Return the connection string for the new database
-            return f"postgresql+asyncpg://{user}:{password}@db:5432/{db_name}"
+    # Return the connection string for the new database
+    return tenant_db_url(db_name, user, password, server)
 
-    except Exception as e:
-        # If database/user already exists, just return the connection string
-        if "already exists" in str(e):
-            return f"postgresql+asyncpg://{user}:{password}@db:5432/{db_name}"
-        raise e
+
+@traced("ddl")
+async def grant_schema_privileges(db_name: str, user: str, server: DatabaseServer = master_server) -> None:
+    """Grant the organization's user access to objects already present in its database."""
+    tenant_engine = create_async_engine(
+        server.engine.url.set(database=db_name), isolation_level="AUTOCOMMIT", poolclass=pool.NullPool
+    )
+    try:
+        async with tenant_engine.connect() as conn:
+            await conn.execute(text(f'GRANT ALL ON SCHEMA public TO "{user}"'))
+            await conn.execute(text(f'GRANT ALL ON ALL TABLES IN SCHEMA public TO "{user}"'))
+            await conn.execute(text(f'GRANT ALL ON ALL SEQUENCES IN SCHEMA public TO "{user}"'))
+    finally:
+        await tenant_engine.dispose()
+
+
+async def _ensure_shared_database(server: DatabaseServer) -> None:
+    """Create the shared tenant database that schema tenants live in."""
+    async with server.engine.connect() as conn:
+        try:
+            await conn.execute(text(f'CREATE DATABASE "{settings.TENANT_SHARED_DATABASE}"'))
+        except Exception as e:
+            # Concurrent creators can also lose on the catalog's unique index
+            if "already exists" not in str(e) and "duplicate key" not in str(e):
+                raise e
+
+
+@traced("ddl")
+async def create_schema(
+    schema: str, user: str, password: str, server: DatabaseServer = master_server
+) -> Tuple[str, bool]:
+    """Create an organization's schema and role inside the shared tenant database.
+
+    Returns the connection string and whether the schema was created, rather than already existing.
+    """
+    shared = settings.TENANT_SHARED_DATABASE
+    await _ensure_shared_database(server)
+
+    async with server.engine.connect() as conn:
+        try:
+            await conn.execute(text(f"CREATE USER \"{user}\" WITH PASSWORD '{password}'"))
+        except Exception as e:
+            if "already exists" not in str(e):
+                raise e
+        # Tenant sessions log in as this role; it is no member of any other role, so it only reaches its schema
+        await conn.execute(text(f'GRANT CONNECT ON DATABASE "{shared}" TO "{user}"'))
+
+    shared_engine = create_async_engine(
+        server.engine.url.set(database=shared), isolation_level="AUTOCOMMIT", poolclass=pool.NullPool
+    )
+    try:
+        async with shared_engine.connect() as conn:
+            try:
+                await conn.execute(text(f'CREATE SCHEMA "{schema}" AUTHORIZATION "{user}"'))
+                created = True
+            except Exception as e:
+                if "already exists" not in str(e):
+                    raise e
+                created = False
+            await conn.execute(text("REVOKE CREATE ON SCHEMA public FROM PUBLIC"))
+            # Tenant sessions log in as this role, which puts them in its schema
+            await conn.execute(text(f'ALTER ROLE "{user}" IN DATABASE "{shared}" SET search_path = "{schema}"'))
+    finally:
+        await shared_engine.dispose()
+
+    return tenant_db_url(shared, user, password, server), created
+
+
+@traced("ddl")
+async def drop_database(db_name: str, user: str, server: DatabaseServer = master_server) -> None:
+    """Drop an organization's database and user."""
+    async with server.engine.connect() as conn:
+        await conn.execute(text(f'DROP DATABASE IF EXISTS "{db_name}"'))
+        await conn.execute(text(f'DROP USER IF EXISTS "{user}"'))
+
+
+@traced("ddl")
+async def drop_schema(schema: str, user: str, server: DatabaseServer = master_server) -> None:
+    """Drop an organization's schema and role from the shared tenant database."""
+    shared = settings.TENANT_SHARED_DATABASE
+    shared_engine = create_async_engine(
+        server.engine.url.set(database=shared), isolation_level="AUTOCOMMIT", poolclass=pool.NullPool
+    )
+    try:
+        async with shared_engine.connect() as conn:
+            await conn.execute(text(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE'))
+    finally:
+        await shared_engine.dispose()
+
+    async with server.engine.connect() as conn:
+        await conn.execute(text(f'REVOKE CONNECT ON DATABASE "{shared}" FROM "{user}"'))
+        await conn.execute(text(f'DROP USER IF EXISTS "{user}"'))
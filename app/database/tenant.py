@@ -0,0 +1,195 @@
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.database.pool import engine_options, pool_stats
+
+logger = get_logger(__name__)
+
+
+class TenantCapacityError(Exception):
+    """Raised when the connection budget cannot fit another tenant engine."""
+
+
+@dataclass
+class TenantEngine:
+    db_url: str
+    engine: AsyncEngine
+    session_factory: sessionmaker
+    slots: int
+    leases: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+    def session(self) -> AsyncSession:
+        return self.session_factory()
+
+
+class TenantEngineRegistry:
+    """Lazily built pooled engines for tenant databases, keyed by ``db_url``.
+
+    Each engine reserves ``pool_size + max_overflow`` slots out of ``max_connections``. Schema
+    tenants log in to the shared database as their own role, so each gets its own (smaller) engine,
+    sized by ``schema_pool_size``; a tenant's role can only reach its own schema.
+    When the budget is exhausted the least recently used idle engine is disposed, and a
+    background sweeper disposes engines that have been idle for longer than ``idle_ttl``.
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        max_overflow: int,
+        pool_timeout: float,
+        max_connections: int,
+        idle_ttl: float,
+        sweep_interval: float,
+        schema_pool_size: int = 1,
+        schema_max_overflow: int = 1,
+    ):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.schema_pool_size = schema_pool_size
+        self.schema_max_overflow = schema_max_overflow
+        self.pool_timeout = pool_timeout
+        self.max_connections = max_connections
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self._engines: "OrderedDict[str, TenantEngine]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+
+    @property
+    def reserved_connections(self) -> int:
+        return sum(entry.slots for entry in self._engines.values())
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def _build(self, db_url: str, pool_size: int, max_overflow: int) -> TenantEngine:
+        engine = create_async_engine(
+            db_url, echo=settings.DB_ECHO, **engine_options(pool_size, max_overflow, self.pool_timeout)
+        )
+        return TenantEngine(
+            db_url=db_url,
+            engine=engine,
+            session_factory=sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+            slots=pool_size + max_overflow,
+        )
+
+    def _make_room(self, slots: int) -> List[TenantEngine]:
+        """Pop idle engines in LRU order until ``slots`` more connections fit in the budget."""
+        evicted: List[TenantEngine] = []
+        reserved = self.reserved_connections
+        while reserved + slots > self.max_connections:
+            victim = next((entry for entry in self._engines.values() if entry.leases == 0), None)
+            if victim is None:
+                raise TenantCapacityError(
+                    f"All {self.max_connections} tenant connection slots are held by active tenants"
+                )
+            del self._engines[victim.db_url]
+            evicted.append(victim)
+            reserved -= victim.slots
+        return evicted
+
+    async def _dispose(self, entries: List[TenantEngine]) -> None:
+        for entry in entries:
+            try:
+                await entry.engine.dispose()
+            except Exception as e:
+                logger.warning("tenant_engine_dispose_failed", extra={"error": str(e)})
+
+    async def acquire(self, db_url: str, schema: Optional[str] = None) -> TenantEngine:
+        """Lease the engine for ``db_url``, building it if needed. Pair with :meth:`release`.
+
+        Tenants with a ``schema`` live in a shared database and get a pool sized for schema tenants.
+        """
+        # Bookkeeping runs without awaiting so concurrent acquires never see a half-built entry.
+        evicted: List[TenantEngine] = []
+        entry = self._engines.get(db_url)
+        if entry is None:
+            if schema is None:
+                pool_size, max_overflow = self.pool_size, self.max_overflow
+            else:
+                pool_size, max_overflow = self.schema_pool_size, self.schema_max_overflow
+            evicted = self._make_room(pool_size + max_overflow)
+            entry = self._build(db_url, pool_size, max_overflow)
+            self._engines[db_url] = entry
+        else:
+            self._engines.move_to_end(db_url)
+        entry.leases += 1
+        entry.last_used = time.monotonic()
+
+        await self._dispose(evicted)
+        return entry
+
+    def release(self, entry: TenantEngine) -> None:
+        entry.leases -= 1
+        entry.last_used = time.monotonic()
+
+    @asynccontextmanager
+    async def session(self, db_url: str, schema: Optional[str] = None) -> AsyncGenerator[AsyncSession, None]:
+        """Open a session on the tenant database at ``db_url``; ``schema`` marks a schema tenant."""
+        entry = await self.acquire(db_url, schema)
+        try:
+            async with entry.session() as session:
+                yield session
+        finally:
+            self.release(entry)
+
+    async def sweep(self) -> int:
+        """Dispose engines that have been idle for longer than ``idle_ttl``."""
+        cutoff = time.monotonic() - self.idle_ttl
+        expired = [entry for entry in self._engines.values() if entry.leases == 0 and entry.last_used < cutoff]
+        for entry in expired:
+            del self._engines[entry.db_url]
+        await self._dispose(expired)
+        return len(expired)
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning("tenant_engine_sweep_failed", extra={"error": str(e)})
+
+    def start(self) -> None:
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        entries = list(self._engines.values())
+        self._engines.clear()
+        await self._dispose(entries)
+
+    def stats(self) -> Dict:
+        pools = [pool_stats(entry.engine.pool) for entry in self._engines.values()]
+        return {
+            "engines": len(self._engines),
+            "reserved_connections": self.reserved_connections,
+            "max_connections": self.max_connections,
+            "checked_out": sum(pool["in_use"] for pool in pools),
+            "pool_timeouts": sum(pool["timeouts"] for pool in pools),
+            "max_wait_seconds": max((pool["max_wait_seconds"] for pool in pools), default=0.0),
+        }
+
+
+tenant_engines = TenantEngineRegistry(
+    pool_size=settings.TENANT_POOL_SIZE,
+    max_overflow=settings.TENANT_MAX_OVERFLOW,
+    pool_timeout=settings.TENANT_POOL_TIMEOUT,
+    max_connections=settings.TENANT_MAX_CONNECTIONS,
+    idle_ttl=settings.TENANT_ENGINE_IDLE_TTL,
+    sweep_interval=settings.TENANT_ENGINE_SWEEP_INTERVAL,
+    schema_pool_size=settings.TENANT_SCHEMA_POOL_SIZE,
+    schema_max_overflow=settings.TENANT_SCHEMA_MAX_OVERFLOW,
+)
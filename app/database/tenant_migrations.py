@@ -0,0 +1,283 @@
+"""Apply the tenant Alembic migrations (``alembic -n tenant``) to every organization database.
+
+Tenants are migrated concurrently, each in its own ``alembic`` process that is killed once it
+exceeds the timeout; Postgres rolls back its transaction. A tenant only counts as migrated once
+its database reports the target revision. Every finished tenant is appended to a progress file,
+so re-running the same command resumes where it stopped and retries failures.
+When the warm pool is enabled its template database is migrated too, so new spares start at head.
+
+    python -m app.database.tenant_migrations                      # upgrade every tenant to head
+    python -m app.database.tenant_migrations --dry-run            # report pending revisions only
+    python -m app.database.tenant_migrations --sql migrations/    # write offline SQL per starting revision
+    python -m app.database.tenant_migrations --organization acme --concurrency 4 --timeout 60
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import pool, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from app.core.config import settings
+from app.database.session import async_session
+from app.database.warm_pool import ALEMBIC_INI, warm_pool
+from app.organization.dao import OrganizationDAO
+
+
+class Tenant(NamedTuple):
+    name: str
+    db_url: str
+    schema: Optional[str] = None
+
+
+@dataclass
+class TenantResult:
+    organization: str
+    status: str
+    revision: str
+    from_revision: Optional[str] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def tenant_config(**kwargs) -> Config:
+    return Config(str(ALEMBIC_INI), ini_section="tenant", **kwargs)
+
+
+async def load_tenants(names: Sequence[str] = ()) -> List[Tenant]:
+    """Read organization databases from the master database, optionally only the named ones.
+
+    The warm pool template is included when the pool is enabled and no names are given.
+    """
+    wanted = {name.lower() for name in names}
+    tenants: List[Tenant] = []
+    if warm_pool.enabled and not wanted:
+        template_url = warm_pool.engine.url.set(database=warm_pool.template)
+        tenants.append(Tenant(warm_pool.template, template_url.render_as_string(hide_password=False)))
+    async with async_session() as session:
+        async for org in OrganizationDAO(session).stream_organizations():
+            if org.db_url and (not wanted or org.name.lower() in wanted):
+                tenants.append(Tenant(org.name, org.db_url, org.schema_name))
+    return tenants
+
+
+async def current_revision(db_url: str, schema: Optional[str] = None) -> Optional[str]:
+    """The tenant database's (or schema's) Alembic revision, or None if it was never migrated."""
+    table = f'"{schema}".alembic_version' if schema else "alembic_version"
+    engine = create_async_engine(db_url, poolclass=pool.NullPool)
+    try:
+        async with engine.connect() as conn:
+            return await conn.scalar(text(f"SELECT version_num FROM {table}"))
+    except ProgrammingError as e:
+        if "alembic_version" in str(e):
+            return None
+        raise
+    finally:
+        await engine.dispose()
+
+
+class ProgressLog:
+    """Append-only JSON lines file of finished tenants."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def succeeded(self, revision: str) -> Dict[str, Dict]:
+        """Tenants already migrated to ``revision`` by an earlier run."""
+        done: Dict[str, Dict] = {}
+        if self.path.exists():
+            with self.path.open() as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry["revision"] != revision:
+                        continue
+                    if entry["status"] in ("succeeded", "up_to_date"):
+                        done[entry["organization"]] = entry
+                    else:
+                        done.pop(entry["organization"], None)
+        return done
+
+    def record(self, result: TenantResult) -> None:
+        with self.path.open("a") as f:
+            f.write(json.dumps(asdict(result)) + "\n")
+
+
+class TenantMigrationRunner:
+    def __init__(self, revision: str, concurrency: int, timeout: float, progress: ProgressLog):
+        self.revision = revision
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.progress = progress
+
+    def alembic_command(self) -> List[str]:
+        return [sys.executable, "-m", "alembic", "-c", str(ALEMBIC_INI), "-n", "tenant", "upgrade", self.revision]
+
+    async def _upgrade(self, tenant: Tenant) -> TenantResult:
+        start = time.perf_counter()
+        result = TenantResult(tenant.name, "succeeded", self.revision)
+        try:
+            result.from_revision = await asyncio.wait_for(
+                current_revision(tenant.db_url, tenant.schema), timeout=self.timeout
+            )
+            if result.from_revision == self.revision:
+                result.status = "up_to_date"
+                return result
+
+            env = {
+                **os.environ,
+                "TENANT_DATABASE_URL": tenant.db_url,
+                "TENANT_SCHEMA": tenant.schema or "",
+                "TENANT_LOCK_TIMEOUT": settings.TENANT_MIGRATION_LOCK_TIMEOUT,
+            }
+            proc = await asyncio.create_subprocess_exec(
+                *self.alembic_command(), env=env, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                result.status = "timed_out"
+                result.error = f"Killed after {self.timeout:g}s"
+                return result
+
+            if proc.returncode != 0:
+                lines = [line for line in stderr.decode(errors="replace").splitlines() if line.strip()]
+                result.status = "failed"
+                result.error = lines[-1][:500] if lines else f"alembic exited with {proc.returncode}"
+                return result
+
+            # A migration that was rolled back still exits 0, so only the database can confirm it
+            reached = await asyncio.wait_for(current_revision(tenant.db_url, tenant.schema), timeout=self.timeout)
+            if reached != self.revision:
+                result.status = "failed"
+                result.error = f"alembic exited cleanly but the database is still at {reached or 'base'}"
+        except asyncio.TimeoutError:
+            result.status = "timed_out"
+            result.error = "Timed out connecting"
+        except Exception as e:
+            result.status = "failed"
+            result.error = str(e)[:500]
+        finally:
+            result.seconds = round(time.perf_counter() - start, 3)
+        return result
+
+    async def run(self, tenants: Sequence[Tenant]) -> List[TenantResult]:
+        """Migrate ``tenants`` with bounded concurrency, skipping those a previous run finished."""
+        done = self.progress.succeeded(self.revision)
+        results = [TenantResult(t.name, "skipped", self.revision) for t in tenants if t.name in done]
+        pending = [tenant for tenant in tenants if tenant.name not in done]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        finished = 0
+
+        async def migrate(tenant: Tenant) -> TenantResult:
+            nonlocal finished
+            async with semaphore:
+                result = await self._upgrade(tenant)
+            self.progress.record(result)
+            finished += 1
+            print(
+                f"[{finished}/{len(pending)}] {tenant.name}: {result.status} ({result.seconds:.1f}s)",
+                file=sys.stderr,
+                flush=True,
+            )
+            return result
+
+        results.extend(await asyncio.gather(*(migrate(tenant) for tenant in pending)))
+        return results
+
+
+async def dry_run(tenants: Sequence[Tenant], revision: str, concurrency: int) -> Dict[Optional[str], List[str]]:
+    """Group tenants by their current revision without changing anything."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def read(tenant: Tenant) -> Optional[str]:
+        async with semaphore:
+            try:
+                return await current_revision(tenant.db_url, tenant.schema)
+            except Exception as e:
+                return f"unreachable: {str(e)[:200]}"
+
+    groups: Dict[Optional[str], List[str]] = {}
+    for tenant, current in zip(tenants, await asyncio.gather(*(read(tenant) for tenant in tenants))):
+        groups.setdefault(current, []).append(tenant.name)
+    return groups
+
+
+def write_offline_sql(groups: Dict[Optional[str], List[str]], revision: str, out_dir: Path) -> List[Path]:
+    """Render the upgrade SQL once per starting revision instead of once per tenant."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for current in groups:
+        if current == revision or (current or "").startswith("unreachable"):
+            continue
+        path = out_dir / f"{current or 'base'}-{revision}.sql"
+        with path.open("w") as f:
+            command.upgrade(tenant_config(output_buffer=f), f"{current}:{revision}" if current else revision, sql=True)
+        paths.append(path)
+    return paths
+
+
+def print_report(results: Sequence[TenantResult], elapsed: float) -> None:
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    print(f"\n{len(results)} tenants in {elapsed:.1f}s: " + ", ".join(f"{n} {s}" for s, n in sorted(counts.items())))
+
+    slowest = sorted((r for r in results if r.status == "succeeded"), key=lambda r: r.seconds, reverse=True)[:5]
+    if slowest:
+        print("slowest: " + ", ".join(f"{r.organization} {r.seconds:.1f}s" for r in slowest))
+    for result in results:
+        if result.status in ("failed", "timed_out"):
+            print(f"  {result.status:<10} {result.organization}: {result.error}")
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    script = ScriptDirectory.from_config(tenant_config())
+    revision = script.get_revision(args.revision).revision
+    tenants = await load_tenants(args.organization)
+    print(f"{len(tenants)} tenant databases, target revision {revision}", file=sys.stderr)
+
+    if args.dry_run or args.sql:
+        groups = await dry_run(tenants, revision, args.concurrency)
+        for current, names in sorted(groups.items(), key=lambda item: -len(item[1])):
+            label = "up to date" if current == revision else f"at {current or 'base'}"
+            print(f"{len(names):>6} {label}: {', '.join(names[:10])}{' ...' if len(names) > 10 else ''}")
+        if args.sql:
+            for path in write_offline_sql(groups, revision, Path(args.sql)):
+                print(f"wrote {path}")
+        return 0
+
+    runner = TenantMigrationRunner(revision, args.concurrency, args.timeout, ProgressLog(Path(args.state)))
+    start = time.perf_counter()
+    results = await runner.run(tenants)
+    print_report(results, time.perf_counter() - start)
+    return 1 if any(result.status in ("failed", "timed_out") for result in results) else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--revision", default="head", help="Tenant revision to upgrade to")
+    parser.add_argument("--organization", action="append", default=[], help="Only migrate this organization")
+    parser.add_argument("--concurrency", type=int, default=settings.TENANT_MIGRATION_CONCURRENCY)
+    parser.add_argument("--timeout", type=float, default=settings.TENANT_MIGRATION_TIMEOUT, help="Seconds per tenant")
+    parser.add_argument("--state", default="tenant_migrations.jsonl", help="Progress file used to resume")
+    parser.add_argument("--dry-run", action="store_true", help="Report each tenant's revision without migrating")
+    parser.add_argument("--sql", metavar="DIR", help="Write offline upgrade SQL to DIR instead of migrating")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import asyncio
+import uuid
+import zlib
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import pool, text
+from sqlalchemy.exc import DBAPIError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.database.session import engine, try_advisory_lock
+
+logger = get_logger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def tenant_head() -> str:
+    """The head revision of the tenant Alembic migrations."""
+    return ScriptDirectory.from_config(Config(str(ALEMBIC_INI), ini_section="tenant")).get_current_head()
+
+
+class WarmDatabasePool:
+    """Keeps spare tenant databases, cloned from a template, ready to be claimed by rename.
+
+    Spares are ordinary databases named ``<prefix><random>``, so the pool state lives in
+    ``pg_database`` and is shared by every worker and replica. Refills are serialized across
+    processes with an advisory lock; claims race safely because ``ALTER DATABASE ... RENAME``
+    succeeds for exactly one claimant.
+
+    Spare names carry the tenant schema revision they were cloned at (``<prefix><revision>_<random>``).
+    Only spares at the current head are claimed; older ones are dropped on refill, and no spares are
+    cloned while the template itself is behind head.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        target_size: int,
+        refill_concurrency: int,
+        template: str,
+        prefix: str,
+        refill_interval: float,
+        revision: Optional[str] = None,
+    ):
+        self.engine = engine
+        self.target_size = target_size
+        self.refill_concurrency = refill_concurrency
+        self.template = template
+        self.prefix = prefix
+        self.refill_interval = refill_interval
+        self._revision = revision
+        self._lock_key = zlib.crc32(f"warm_pool:{prefix}".encode())
+        self._wakeup: Optional[asyncio.Event] = None
+        self._maintainer: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.target_size > 0
+
+    @property
+    def revision(self) -> str:
+        """Tenant schema revision new spares must be at, read from the migration scripts on first use."""
+        if self._revision is None:
+            self._revision = tenant_head()
+        return self._revision
+
+    @property
+    def spare_prefix(self) -> str:
+        """Name prefix of spares at the current revision."""
+        return f"{self.prefix}{self.revision}_"
+
+    async def list_spares(self, prefix: Optional[str] = None) -> List[str]:
+        """List spare databases, by default only those at the current revision."""
+        prefix = self.spare_prefix if prefix is None else prefix
+        pattern = prefix.replace("\\", "\\\\").replace("_", "\\_").replace("%", "\\%") + "%"
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text("SELECT datname FROM pg_database WHERE datname LIKE :pattern ORDER BY datname"),
+                {"pattern": pattern},
+            )
+            return list(result.scalars().all())
+
+    async def claim(self, db_name: str) -> bool:
+        """Rename a spare database to ``db_name``. Returns False when no spare could be claimed."""
+        if not self.enabled:
+            return False
+
+        for spare in await self.list_spares():
+            try:
+                async with self.engine.connect() as conn:
+                    await conn.execute(text(f'ALTER DATABASE "{spare}" RENAME TO "{db_name}"'))
+            except DBAPIError as e:
+                if "already exists" in str(e):
+                    # The target name is taken; let the regular create path handle it
+                    return False
+                # Claimed by another worker in the meantime, try the next one
+                logger.debug("warm_pool_claim_skipped", extra={"spare": spare, "error": str(e)})
+                continue
+
+            logger.info("warm_pool_claimed", extra={"spare": spare, "db_name": db_name})
+            if self._wakeup is not None:
+                self._wakeup.set()
+            return True
+
+        logger.warning("warm_pool_empty", extra={"db_name": db_name})
+        return False
+
+    async def template_revision(self) -> Optional[str]:
+        """The template database's tenant schema revision, or None if it was never migrated."""
+        # NullPool: cloning fails while anyone is connected to the template
+        template = create_async_engine(self.engine.url.set(database=self.template), poolclass=pool.NullPool)
+        try:
+            async with template.connect() as conn:
+                return await conn.scalar(text("SELECT version_num FROM alembic_version"))
+        except ProgrammingError as e:
+            if "alembic_version" in str(e):
+                return None
+            raise
+        finally:
+            await template.dispose()
+
+    async def _drop_outdated(self) -> None:
+        current = set(await self.list_spares())
+        for spare in await self.list_spares(self.prefix):
+            if spare in current:
+                continue
+            try:
+                async with self.engine.connect() as conn:
+                    await conn.execute(text(f'DROP DATABASE IF EXISTS "{spare}"'))
+                logger.info("warm_pool_outdated_spare_dropped", extra={"spare": spare})
+            except DBAPIError as e:
+                # Being claimed or otherwise in use; retried on the next refill
+                logger.debug("warm_pool_drop_skipped", extra={"spare": spare, "error": str(e)})
+
+    async def _create_spare(self, semaphore: asyncio.Semaphore) -> None:
+        name = f"{self.spare_prefix}{uuid.uuid4().hex[:16]}"
+        async with semaphore:
+            async with self.engine.connect() as conn:
+                await conn.execute(text(f'CREATE DATABASE "{name}" TEMPLATE "{self.template}"'))
+
+    async def refill(self) -> int:
+        """Clone the template until the pool holds ``target_size`` spares; returns how many were created."""
+        async with try_advisory_lock(self.engine, self._lock_key) as locked:
+            if not locked:
+                # Another process is already refilling
+                return 0
+            await self._drop_outdated()
+            missing = self.target_size - len(await self.list_spares())
+            if missing <= 0:
+                return 0
+
+            template_revision = await self.template_revision()
+            if template_revision != self.revision:
+                logger.error(
+                    "warm_pool_template_outdated",
+                    extra={"template": self.template, "revision": template_revision, "expected": self.revision},
+                )
+                return 0
+
+            semaphore = asyncio.Semaphore(self.refill_concurrency)
+            results = await asyncio.gather(
+                *(self._create_spare(semaphore) for _ in range(missing)), return_exceptions=True
+            )
+
+        errors = [result for result in results if isinstance(result, Exception)]
+        for error in errors:
+            logger.error("warm_pool_refill_failed", extra={"template": self.template, "error": str(error)})
+        return missing - len(errors)
+
+    async def _maintain(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                created = await self.refill()
+                if created:
+                    logger.info("warm_pool_refilled", extra={"created": created})
+            except Exception as e:
+                logger.error("warm_pool_maintainer_failed", extra={"error": str(e)})
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.refill_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        if self.enabled and self._maintainer is None:
+            self._wakeup = asyncio.Event()
+            self._maintainer = asyncio.create_task(self._maintain())
+
+    async def stop(self) -> None:
+        if self._maintainer is not None:
+            self._maintainer.cancel()
+            await asyncio.gather(self._maintainer, return_exceptions=True)
+            self._maintainer = None
+            self._wakeup = None
+
+
+warm_pool = WarmDatabasePool(
+    engine=engine,
+    target_size=settings.WARM_POOL_SIZE,
+    refill_concurrency=settings.WARM_POOL_REFILL_CONCURRENCY,
+    template=settings.WARM_POOL_TEMPLATE_DB,
+    prefix=settings.WARM_POOL_PREFIX,
+    refill_interval=settings.WARM_POOL_REFILL_INTERVAL,
+)
@@ -4,10 +4,25 @@ from typing import AsyncGenerator, Dict
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.auth.principals import principal_store
+from app.cluster.engines import cluster_engines
 from app.core.config import settings
+from app.core.health import health_sampler
 from app.core.health import router as health_router
-from app.core.logging import setup_logging
-from app.core.middleware import error_handler_middleware
+from app.core.logging import access_log, setup_logging, shutdown_logging
+from app.core.metrics import multiprocess_store
+from app.core.metrics import router as metrics_router
+from app.core.middleware import ErrorHandlerMiddleware
+from app.core.security import password_hasher
+from app.core.tracing import exporter as trace_exporter
+from app.database.replicas import replicas
+from app.database.tenant import tenant_engines
+from app.database.warm_pool import warm_pool
+from app.organization.directory import org_directory
+from app.organization.health import tenant_health
+from app.organization.jobs import provisioning_queue
+from app.organization.usage import tenant_usage
+from app.profiling.profiler import ProfilingMiddleware
 from app.routers import api_router
 
 
@@ -17,9 +32,41 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Lifecycle event handler for FastAPI application.
     """
     setup_logging()
+    access_log.start()
+    trace_exporter.start()
+    if multiprocess_store is not None:
+        multiprocess_store.start()
+    replicas.start()
+    health_sampler.start()
+    tenant_engines.start()
+    provisioning_queue.start()
+    warm_pool.start()
+    if settings.ORG_CHANGE_FEED_ENABLED:
+        org_directory.start()
+    principal_store.start()
+    tenant_health.start()
+    tenant_usage.start()
 
     yield
 
+    await tenant_usage.stop()
+    await tenant_health.stop()
+    await principal_store.stop()
+    await health_sampler.stop()
+
+    await org_directory.stop()
+    await warm_pool.stop()
+    await provisioning_queue.stop()
+    await tenant_engines.close()
+    await cluster_engines.close()
+    await replicas.close()
+    password_hasher.shutdown()
+    if multiprocess_store is not None:
+        await multiprocess_store.stop()
+    await access_log.stop()
+    trace_exporter.stop()
+    shutdown_logging()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -37,11 +84,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling, inside error handling so failed requests are profiled too
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # Add error handling middleware
-app.middleware("http")(error_handler_middleware)
+app.add_middleware(ErrorHandlerMiddleware)
 
 # Include routers
 app.include_router(health_router, prefix="/api/v1")
+app.include_router(metrics_router)
 app.include_router(api_router)
 
 
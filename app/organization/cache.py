@@ -0,0 +1,24 @@
+from app.core.cache import AsyncLoadingCache
+from app.core.config import settings
+
+# Keyed by lowercased organization name
+org_by_name: AsyncLoadingCache = AsyncLoadingCache(
+    "organizations_by_name",
+    max_size=settings.ORG_CACHE_MAX_SIZE,
+    ttl=settings.ORG_CACHE_TTL,
+    negative_ttl=settings.ORG_CACHE_NEGATIVE_TTL,
+)
+
+# Keyed by admin email, holds the credentials used by /admin/login
+org_login_by_email: AsyncLoadingCache = AsyncLoadingCache(
+    "organization_logins_by_email",
+    max_size=settings.ORG_CACHE_MAX_SIZE,
+    ttl=settings.ORG_CACHE_TTL,
+    negative_ttl=settings.ORG_CACHE_NEGATIVE_TTL,
+)
+
+
+def invalidate_organization(name: str, admin_email: str) -> None:
+    """Drop cached entries, including negative ones, for an organization that was written."""
+    org_by_name.invalidate(name.lower())
+    org_login_by_email.invalidate(admin_email)
@@ -1,51 +1,395 @@
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, insert, make_url, or_, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash
+from app.cluster.dao import ClusterDAO
+from app.cluster.engines import cluster_engines
+from app.cluster.placement import placement_scheduler
+from app.core.config import settings
+from app.core.security import get_password_hash_async
 from app.database.dao import BaseDAO
-from app.database.session import create_database
-from app.organization.models import Organization
-from app.organization.schemas import OrgCreate, OrgRetrieve
+from app.database.replicas import REPLICA
+from app.database.session import (
+    create_database,
+    create_database_user,
+    create_schema,
+    drop_database,
+    drop_schema,
+    grant_schema_privileges,
+    master_server,
+)
+from app.database.warm_pool import warm_pool
+from app.organization.cache import (
+    invalidate_organization,
+    org_by_name,
+    org_login_by_email,
+)
+from app.organization.directory import org_directory
+from app.organization.models import (
+    ACTIVE_JOB_STATUSES,
+    HOURLY_RESOLUTION,
+    RAW_RESOLUTION,
+    JobStatus,
+    Organization,
+    ProvisioningJob,
+    TenantUsageSample,
+)
+from app.organization.schemas import (
+    JobRetrieve,
+    OrgCreate,
+    OrgRetrieve,
+    TenantUsageRetrieve,
+)
+
+
+class OrgCredentials(NamedTuple):
+    name: str
+    admin_password: str
+
+
+class ProvisionedDatabase(NamedTuple):
+    db_url: str
+    cluster_id: Optional[int]
+    schema_name: Optional[str] = None
+    # False when an existing database (or schema) was reused; only created ones may be dropped on failure
+    created: bool = True
 
 
 class OrganizationDAO(BaseDAO[Organization, OrgCreate, OrgRetrieve]):
     def __init__(self, session: AsyncSession):
         super().__init__(Organization, session)
 
-    async def create_organization(self, org_data: OrgCreate) -> Organization:
-        """Create a new organization with its own database."""
-        # Create new database and user for the organization
+    async def provision_database(self, org_data: OrgCreate) -> ProvisionedDatabase:
+        """Create the organization's database (or schema) and user on the cluster chosen for it."""
         db_user = f"user_{org_data.organization_name.lower()}"
         db_pass = f"org_pass_{org_data.password}"
         db_name = org_data.organization_name.lower()
+        placement = await placement_scheduler.place()
+
+        if settings.TENANT_ISOLATION == "schema":
+            db_url, created = await create_schema(db_name, db_user, db_pass, placement.server)
+            return ProvisionedDatabase(db_url, placement.cluster_id, schema_name=db_name, created=created)
+
+        # Prefer renaming a pre-cloned spare over running CREATE DATABASE; spares live on the master server
+        if placement.cluster_id is None and await warm_pool.claim(db_name):
+            db_url = await create_database_user(db_name, db_user, db_pass)
+            await grant_schema_privileges(db_name, db_user)
+            return ProvisionedDatabase(db_url, None)
 
-        db_url = await create_database(db_name, db_user, db_pass)
+        db_url, created = await create_database(db_name, db_user, db_pass, placement.server)
+        return ProvisionedDatabase(db_url, placement.cluster_id, created=created)
+
+    async def create_organization(
+        self, org_data: OrgCreate, database: Optional[ProvisionedDatabase] = None
+    ) -> Organization:
+        """Create a new organization with its own database."""
+        # Create new database and user for the organization
+        if database is None:
+            database = await self.provision_database(org_data)
 
         # Create organization record
-        org = Organization(
-            name=org_data.organization_name,
-            db_url=db_url,
-            admin_email=org_data.email,
-            admin_password=get_password_hash(org_data.password),
+        org = await self.insert(
+            {
+                "name": org_data.organization_name,
+                "db_url": database.db_url,
+                "cluster_id": database.cluster_id,
+                "schema_name": database.schema_name,
+                "admin_email": org_data.email,
+                "admin_password": await get_password_hash_async(org_data.password),
+            }
         )
-        self.session.add(org)
-        await self.session.commit()
-        await self.session.refresh(org)
+        invalidate_organization(org.name, org.admin_email)
         return org
 
+    async def prepare_organization(self, org_data: OrgCreate) -> Tuple[Dict[str, Any], ProvisionedDatabase]:
+        """Provision the organization's database and build its ``organizations`` row without inserting it."""
+        # Hash first: a hash rejected by a saturated worker pool must not leave a new database behind
+        admin_password = await get_password_hash_async(org_data.password)
+        database = await self.provision_database(org_data)
+        row = {
+            "name": org_data.organization_name,
+            "db_url": database.db_url,
+            "cluster_id": database.cluster_id,
+            "schema_name": database.schema_name,
+            "admin_email": org_data.email,
+            "admin_password": admin_password,
+        }
+        return row, database
+
+    async def discard_database(self, database: ProvisionedDatabase) -> None:
+        """Drop a provisioned database (or schema) and its user after the organization failed to be created."""
+        server = master_server
+        if database.cluster_id is not None:
+            cluster = await ClusterDAO(self.session).get(database.cluster_id)
+            server = await cluster_engines.server(cluster)
+        url = make_url(database.db_url)
+        if database.schema_name:
+            await drop_schema(database.schema_name, url.username, server)
+        else:
+            await drop_database(url.database, url.username, server)
+
+    async def insert_organizations(self, rows: Sequence[Dict[str, Any]]) -> List[Organization]:
+        """Insert prepared organization rows in a single batched statement."""
+        orgs = await self.insert_many(rows)
+        for org in orgs:
+            invalidate_organization(org.name, org.admin_email)
+        return orgs
+
+    async def existing_names(self, names: Sequence[str]) -> Set[str]:
+        """Return which of ``names`` (lowercased) already belong to an organization."""
+        lowered = list({name.lower() for name in names})
+        if not lowered:
+            return set()
+        result = await self.session.execute(
+            select(func.lower(Organization.name)).where(func.lower(Organization.name).in_(lowered))
+        )
+        return set(result.scalars().all())
+
+    @staticmethod
+    def _name_prefix_filters(name_prefix: Optional[str]) -> List[Any]:
+        if not name_prefix:
+            return []
+        escaped = name_prefix.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        # A literal lowercase prefix lets the planner range-scan ix_organizations_name_lower
+        return [func.lower(Organization.name).like(f"{escaped}%", escape="\\")]
+
+    async def list_organizations(
+        self, after_id: Optional[int] = None, limit: int = 100, name_prefix: Optional[str] = None
+    ) -> List[Organization]:
+        """List organizations ordered by ID, optionally filtered by name prefix."""
+        return await self.get_page(*self._name_prefix_filters(name_prefix), after_id=after_id, limit=limit)
+
+    def stream_organizations(self, name_prefix: Optional[str] = None) -> AsyncIterator[Organization]:
+        """Stream organizations ordered by ID, optionally filtered by name prefix."""
+        return self.stream(*self._name_prefix_filters(name_prefix))
+
     async def get_by_name(self, name: str) -> Optional[Organization]:
-        """Get organization by name."""
-        result = await self.session.execute(select(Organization).where(Organization.name.ilike(name)))
-        return result.scalars().first()
+        """Get organization by name, served from the directory snapshot or cache when possible."""
+        org = org_directory.get_by_name(name) if org_directory.ready else None
+        if org is not None:
+            return org
+        return await org_by_name.get_or_load(name.lower(), lambda: self._fetch_by_name(name))
+
+    async def _fetch_by_name(self, name: str) -> Optional[Organization]:
+        row = await self.lookup(select(Organization).where(func.lower(Organization.name) == func.lower(name)))
+        return row[0] if row else None
 
     async def get_by_admin_email(self, email: str) -> Optional[Organization]:
         """Get organization by admin email."""
-        result = await self.session.execute(select(Organization).where(Organization.admin_email == email))
-        return result.scalars().first()
+        row = await self.lookup(select(Organization).where(Organization.admin_email == email))
+        return row[0] if row else None
+
+    async def get_login_credentials(self, email: str) -> Optional[OrgCredentials]:
+        """Get the organization name and admin password hash for an admin email, cached."""
+        org = org_directory.get_by_admin_email(email) if org_directory.ready else None
+        if org is not None:
+            return OrgCredentials(org.name, org.admin_password)
+        return await org_login_by_email.get_or_load(email, lambda: self._fetch_login_credentials(email))
+
+    async def _fetch_login_credentials(self, email: str) -> Optional[OrgCredentials]:
+        row = await self.lookup(
+            select(Organization.name, Organization.admin_password).where(Organization.admin_email == email).limit(1)
+        )
+        return OrgCredentials(*row) if row else None
 
     async def exists_by_name(self, name: str) -> bool:
         """Check if organization exists by name."""
-        org = await self.get_by_name(name)
-        return org is not None
+        result = await self.session.execute(
+            select(Organization.id).where(func.lower(Organization.name) == func.lower(name)).limit(1)
+        )
+        return result.first() is not None
+
+
+class ProvisioningJobDAO(BaseDAO[ProvisioningJob, OrgCreate, JobRetrieve]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(ProvisioningJob, session)
+
+    async def create_job(self, org_data: OrgCreate) -> ProvisioningJob:
+        """Record a pending provisioning job for an organization."""
+        return await self.insert({"organization_name": org_data.organization_name, "admin_email": org_data.email})
+
+    async def get_active_by_name(self, name: str) -> Optional[ProvisioningJob]:
+        """Get the pending or running job for an organization name."""
+        result = await self.session.execute(
+            select(ProvisioningJob).where(
+                func.lower(ProvisioningJob.organization_name) == name.lower(),
+                ProvisioningJob.status.in_(ACTIVE_JOB_STATUSES),
+            )
+        )
+        return result.scalars().first()
+
+    async def active_names(self, names: Sequence[str]) -> Set[str]:
+        """Return which of ``names`` (lowercased) have a pending or running job."""
+        lowered = list({name.lower() for name in names})
+        if not lowered:
+            return set()
+        result = await self.session.execute(
+            select(func.lower(ProvisioningJob.organization_name)).where(
+                func.lower(ProvisioningJob.organization_name).in_(lowered),
+                ProvisioningJob.status.in_(ACTIVE_JOB_STATUSES),
+            )
+        )
+        return set(result.scalars().all())
+
+    async def set_status(self, job_id: int, status: JobStatus, **fields) -> None:
+        """Update a job's status along with any progress fields."""
+        await self.session.execute(
+            update(ProvisioningJob).where(ProvisioningJob.id == job_id).values(status=status.value, **fields)
+        )
+        await self.session.commit()
+
+    async def claim(self, job_id: int) -> bool:
+        """Move a pending job to running. Returns False if it is no longer pending, e.g. it was reaped."""
+        result = await self.session.execute(
+            update(ProvisioningJob)
+            .where(ProvisioningJob.id == job_id, ProvisioningJob.status == JobStatus.PENDING.value)
+            .values(status=JobStatus.RUNNING.value, step="create_database")
+            .returning(ProvisioningJob.id)
+        )
+        claimed = result.scalar_one_or_none() is not None
+        await self.session.commit()
+        return claimed
+
+    async def fail_stale(self, running_for: timedelta, pending_for: timedelta) -> int:
+        """Fail jobs whose worker is gone, e.g. after a restart.
+
+        Running jobs go once they stop reporting progress; pending ones only once they can no longer be queued.
+        """
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(ProvisioningJob)
+            .where(
+                or_(
+                    and_(
+                        ProvisioningJob.status == JobStatus.RUNNING.value,
+                        ProvisioningJob.updated_at < now - running_for,
+                    ),
+                    and_(
+                        ProvisioningJob.status == JobStatus.PENDING.value,
+                        ProvisioningJob.updated_at < now - pending_for,
+                    ),
+                )
+            )
+            .values(status=JobStatus.FAILED.value, error="Provisioning was interrupted")
+        )
+        await self.session.commit()
+        return result.rowcount
+
+
+# Moves raw samples past retention into hourly rollups; an hour split across two runs is merged
+_ROLLUP_SQL = text(
+    f"""
+    WITH expired AS (
+        DELETE FROM tenant_usage_samples
+        WHERE resolution = {RAW_RESOLUTION} AND sampled_at < :raw_cutoff
+        RETURNING organization_id, sampled_at, size_bytes, xact_commit, blks_read, connections, tps
+    )
+    INSERT INTO tenant_usage_samples
+        (organization_id, resolution, sampled_at, size_bytes, xact_commit, blks_read, connections, tps)
+    SELECT organization_id, {HOURLY_RESOLUTION}, date_trunc('hour', sampled_at),
+           max(size_bytes), max(xact_commit), max(blks_read), max(connections), avg(tps)
+    FROM expired
+    GROUP BY organization_id, date_trunc('hour', sampled_at)
+    ON CONFLICT (organization_id, resolution, sampled_at) DO UPDATE SET
+        size_bytes = GREATEST(tenant_usage_samples.size_bytes, EXCLUDED.size_bytes),
+        xact_commit = GREATEST(tenant_usage_samples.xact_commit, EXCLUDED.xact_commit),
+        blks_read = GREATEST(tenant_usage_samples.blks_read, EXCLUDED.blks_read),
+        connections = GREATEST(tenant_usage_samples.connections, EXCLUDED.connections),
+        tps = COALESCE((tenant_usage_samples.tps + EXCLUDED.tps) / 2, tenant_usage_samples.tps, EXCLUDED.tps)
+    """
+)
+
+USAGE_ORDER = {"size": "size_bytes", "tps": "tps", "connections": "connections"}
+
+
+class TenantUsageDAO(BaseDAO[TenantUsageSample, TenantUsageRetrieve, TenantUsageRetrieve]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(TenantUsageSample, session)
+
+    async def database_tenants(self) -> List[Organization]:
+        """Organizations with a database of their own, i.e. not a schema in a shared one."""
+        result = await self.session.execute(select(Organization).where(Organization.schema_name.is_(None)))
+        return list(result.scalars().all())
+
+    async def add_samples(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Insert raw samples with one executemany INSERT."""
+        if rows:
+            samples = [{"resolution": RAW_RESOLUTION, **row} for row in rows]
+            await self.session.execute(insert(TenantUsageSample), samples)
+            await self.session.commit()
+
+    async def latest_commits(self, since: datetime) -> Dict[int, Tuple[datetime, int]]:
+        """The newest raw sample's ``(sampled_at, xact_commit)`` per organization, among those since ``since``."""
+        result = await self.session.execute(
+            select(TenantUsageSample.organization_id, TenantUsageSample.sampled_at, TenantUsageSample.xact_commit)
+            .where(TenantUsageSample.resolution == RAW_RESOLUTION, TenantUsageSample.sampled_at >= since)
+            .distinct(TenantUsageSample.organization_id)
+            .order_by(TenantUsageSample.organization_id, TenantUsageSample.sampled_at.desc())
+        )
+        return {row.organization_id: (row.sampled_at, row.xact_commit) for row in result}
+
+    async def downsample(self, raw_cutoff: datetime, rollup_cutoff: datetime) -> None:
+        """Roll raw samples older than ``raw_cutoff`` up by hour and drop rollups older than ``rollup_cutoff``."""
+        await self.session.execute(_ROLLUP_SQL, {"raw_cutoff": raw_cutoff})
+        await self.session.execute(
+            TenantUsageSample.__table__.delete().where(
+                TenantUsageSample.resolution == HOURLY_RESOLUTION, TenantUsageSample.sampled_at < rollup_cutoff
+            )
+        )
+        await self.session.commit()
+
+    async def top(self, by: str, limit: int, since: datetime) -> List[TenantUsageRetrieve]:
+        """Organizations with the largest size, connections (latest sample) or average TPS since ``since``."""
+        recent = (TenantUsageSample.resolution == RAW_RESOLUTION, TenantUsageSample.sampled_at >= since)
+        latest = (
+            select(TenantUsageSample)
+            .where(*recent)
+            .distinct(TenantUsageSample.organization_id)
+            .order_by(TenantUsageSample.organization_id, TenantUsageSample.sampled_at.desc())
+            .subquery()
+        )
+        average = (
+            select(TenantUsageSample.organization_id, func.avg(TenantUsageSample.tps).label("tps"))
+            .where(*recent)
+            .group_by(TenantUsageSample.organization_id)
+            .subquery()
+        )
+        columns = {"size_bytes": latest.c.size_bytes, "connections": latest.c.connections, "tps": average.c.tps}
+        stmt = (
+            select(
+                Organization.id,
+                Organization.name,
+                latest.c.size_bytes,
+                latest.c.connections,
+                average.c.tps,
+                latest.c.sampled_at,
+            )
+            .join(latest, latest.c.organization_id == Organization.id)
+            .join(average, average.c.organization_id == Organization.id)
+            .order_by(columns[USAGE_ORDER[by]].desc().nulls_last())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt, bind_arguments=REPLICA)
+        return [
+            TenantUsageRetrieve(
+                organization_id=row.id,
+                organization_name=row.name,
+                size_bytes=row.size_bytes,
+                connections=row.connections,
+                tps=row.tps,
+                sampled_at=row.sampled_at,
+            )
+            for row in result
+        ]
@@ -0,0 +1,30 @@
+from typing import AsyncGenerator
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.session import get_session
+from app.database.tenant import TenantCapacityError, tenant_engines
+from app.organization.dao import OrganizationDAO
+
+
+async def get_tenant_session(
+    organization_name: str, session: AsyncSession = Depends(get_session)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session bound to the organization's own database, or its schema in a shared one."""
+    org = await OrganizationDAO(session).get_by_name(organization_name)
+    if not org:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
+
+    try:
+        tenant = await tenant_engines.acquire(org.db_url, org.schema_name)
+    except TenantCapacityError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Tenant connection capacity exhausted"
+        )
+
+    try:
+        async with tenant.session() as tenant_session:
+            yield tenant_session
+    finally:
+        tenant_engines.release(tenant)
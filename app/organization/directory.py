@@ -0,0 +1,197 @@
+import asyncio
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+import asyncpg
+from sqlalchemy import make_url
+
+from app.core.config import DATABASE_URL, settings
+from app.core.logging import get_logger
+from app.organization.cache import (
+    invalidate_organization,
+    org_by_name,
+    org_login_by_email,
+)
+from app.organization.models import Organization
+
+logger = get_logger(__name__)
+
+CHANNEL = "organizations_changed"
+ORG_COLUMNS = "id, name, db_url, admin_email, admin_password, cluster_id, schema_name"
+
+
+def asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class OrganizationDirectory:
+    """Process-local view of ``organizations`` kept coherent by a dedicated LISTEN connection.
+
+    Row triggers NOTIFY on every insert, update, delete and truncate. Each change invalidates the
+    directory caches and, when the snapshot is enabled, is applied to in-memory indexes by name and
+    admin email. After the listener connection drops the snapshot stops serving reads (lookups fall
+    back to the cache and the database) until it reconnects and resyncs from a full reload.
+    Snapshot misses also fall back, so a worker always sees organizations it has just created.
+    """
+
+    def __init__(self, dsn: str, snapshot: bool, keepalive: float, max_reconnect_delay: float = 30.0):
+        self.dsn = dsn
+        self.snapshot = snapshot
+        self.keepalive = keepalive
+        self.max_reconnect_delay = max_reconnect_delay
+        self.ready = False
+        self._by_id: Dict[int, Organization] = {}
+        self._by_name: Dict[str, Organization] = {}
+        self._by_email: Dict[str, Organization] = {}
+        self._events: Optional["asyncio.Queue[Dict[str, Any]]"] = None
+        self._task: Optional[asyncio.Task] = None
+        self.resyncs = 0
+        self.changes = 0
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get_by_name(self, name: str) -> Optional[Organization]:
+        return self._by_name.get(name.lower())
+
+    def get_by_admin_email(self, email: str) -> Optional[Organization]:
+        return self._by_email.get(email)
+
+    def _remove(self, org_id: int) -> None:
+        org = self._by_id.pop(org_id, None)
+        if org is None:
+            return
+        if self._by_name.get(org.name.lower()) is org:
+            del self._by_name[org.name.lower()]
+        if self._by_email.get(org.admin_email) is org:
+            del self._by_email[org.admin_email]
+
+    def _add(self, record: asyncpg.Record) -> None:
+        org = Organization(**dict(record))
+        self._remove(org.id)
+        self._by_id[org.id] = org
+        self._by_name[org.name.lower()] = org
+        if org.admin_email is not None:
+            self._by_email.setdefault(org.admin_email, org)
+
+    async def _resync(self, conn: asyncpg.Connection) -> None:
+        # Anything cached may have missed invalidations while we were not listening
+        org_by_name.clear()
+        org_login_by_email.clear()
+        if self.snapshot:
+            records = await conn.fetch(f"SELECT {ORG_COLUMNS} FROM organizations ORDER BY id")
+            self._by_id.clear()
+            self._by_name.clear()
+            self._by_email.clear()
+            for record in records:
+                self._add(record)
+        self.resyncs += 1
+        logger.info("org_directory_resynced", extra={"organizations": len(self._by_id)})
+
+    async def _apply(self, conn: asyncpg.Connection, events: List[Dict[str, Any]]) -> None:
+        if any(event.get("op") == "TRUNCATE" for event in events):
+            await self._resync(conn)
+            return
+
+        changed_ids = set()
+        for event in events:
+            if event.get("old_name") is not None:
+                invalidate_organization(event["old_name"], event.get("old_admin_email") or "")
+            changed_ids.add(event["id"])
+        self.changes += len(events)
+
+        # One query for the whole burst, e.g. a bulk import
+        records = await conn.fetch(
+            f"SELECT {ORG_COLUMNS} FROM organizations WHERE id = ANY($1::int[])", list(changed_ids)
+        )
+        for record in records:
+            invalidate_organization(record["name"], record["admin_email"] or "")
+        if self.snapshot:
+            for org_id in changed_ids:
+                self._remove(org_id)
+            for record in records:
+                self._add(record)
+
+    def _on_notify(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("org_directory_bad_payload", extra={"payload": payload})
+            return
+        if self._events is not None:
+            self._events.put_nowait(event)
+
+    @staticmethod
+    def _drain(queue: "asyncio.Queue[Dict[str, Any]]", first: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        events = [first]
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return events
+
+    async def _listen(self) -> None:
+        self._events = asyncio.Queue()
+        conn = await asyncpg.connect(self.dsn)
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _: lost.set())
+        try:
+            # Subscribe before loading so changes committed during the reload are queued, not lost
+            await conn.add_listener(CHANNEL, self._on_notify)
+            await self._resync(conn)
+            self.ready = self.snapshot
+
+            while not lost.is_set():
+                try:
+                    first = await asyncio.wait_for(self._events.get(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    # Termination callbacks do not fire on half-open connections; probe instead
+                    await asyncio.wait_for(conn.execute("SELECT 1"), timeout=self.keepalive)
+                    continue
+                await self._apply(conn, list(self._drain(self._events, first)))
+        finally:
+            self.ready = False
+            self._events = None
+            if not conn.is_closed():
+                await conn.close(timeout=5)
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            resyncs = self.resyncs
+            error: Optional[str] = None
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = str(e)
+            if self.resyncs > resyncs:
+                # The connection was healthy for a while, so start backing off from scratch
+                delay = 1.0
+            logger.warning("org_directory_listener_lost", extra={"error": error, "retry_in": delay})
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "organizations": len(self._by_id),
+            "resyncs": self.resyncs,
+            "changes": self.changes,
+        }
+
+
+org_directory = OrganizationDirectory(
+    dsn=asyncpg_dsn(settings.ORG_CHANGE_FEED_URL or DATABASE_URL),
+    snapshot=settings.ORG_DIRECTORY_SNAPSHOT,
+    keepalive=settings.ORG_CHANGE_FEED_KEEPALIVE,
+)
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import asyncpg
+from sqlalchemy import Row, select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.database.replicas import REPLICA
+from app.database.session import async_session
+from app.organization.directory import asyncpg_dsn
+from app.organization.models import Organization
+from app.organization.schemas import TenantHealth, TenantHealthPage
+
+logger = get_logger(__name__)
+
+
+class TenantHealthChecker:
+    """Probes every organization database concurrently and keeps the latest result per organization.
+
+    Each probe opens a short-lived connection (not the pooled tenant engines), runs ``SELECT 1`` and
+    closes it, all within ``timeout`` seconds; at most ``concurrency`` probes run at once.
+    """
+
+    def __init__(self, concurrency: int, timeout: float, interval: float):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.interval = interval
+        self.results: Dict[int, TenantHealth] = {}
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_seconds: Optional[float] = None
+        self._running: Optional["asyncio.Future[None]"] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _connect_and_select(self, dsn: str) -> None:
+        conn = await asyncpg.connect(dsn, timeout=self.timeout)
+        try:
+            await conn.fetchval("SELECT 1")
+        finally:
+            await conn.close(timeout=self.timeout)
+
+    async def probe(self, org_id: int, name: str, db_url: str, slots: asyncio.Semaphore) -> TenantHealth:
+        previous = self.results.get(org_id)
+        last_healthy_at = previous.last_healthy_at if previous else None
+        async with slots:
+            started = time.perf_counter()
+            error: Optional[str] = None
+            try:
+                await asyncio.wait_for(self._connect_and_select(asyncpg_dsn(db_url)), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                error = f"timed out after {self.timeout}s"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            latency = time.perf_counter() - started
+
+        checked_at = datetime.utcnow()
+        if error is None:
+            last_healthy_at = checked_at
+        return TenantHealth(
+            organization_id=org_id,
+            organization_name=name,
+            healthy=error is None,
+            latency=latency,
+            error=error,
+            checked_at=checked_at,
+            last_healthy_at=last_healthy_at,
+        )
+
+    async def _load_organizations(self) -> Sequence[Row]:
+        async with async_session() as session:
+            result = await session.execute(
+                select(Organization.id, Organization.name, Organization.db_url).order_by(Organization.id),
+                bind_arguments=REPLICA,
+            )
+            return result.all()
+
+    async def _check_all(self) -> None:
+        started = time.perf_counter()
+        orgs = await self._load_organizations()
+        slots = asyncio.Semaphore(self.concurrency)
+        checked = await asyncio.gather(*(self.probe(org.id, org.name, org.db_url, slots) for org in orgs))
+        # Replace wholesale so deleted organizations drop out
+        self.results = {health.organization_id: health for health in checked}
+        self.last_run_at = datetime.utcnow()
+        self.last_run_seconds = time.perf_counter() - started
+
+        unhealthy = sum(1 for health in checked if not health.healthy)
+        log = logger.warning if unhealthy else logger.info
+        log(
+            "tenant_health_checked",
+            extra={"tenants": len(checked), "unhealthy": unhealthy, "seconds": self.last_run_seconds},
+        )
+
+    async def check_all(self) -> None:
+        """Probe all organizations; callers arriving during a run wait for that run instead of starting another."""
+        if self._running is None:
+            self._running = asyncio.ensure_future(self._check_all())
+            self._running.add_done_callback(self._clear_running)
+        await asyncio.shield(self._running)
+
+    def _clear_running(self, future: "asyncio.Future[None]") -> None:
+        self._running = None
+
+    def page(self, after_id: Optional[int], limit: int, unhealthy_only: bool) -> TenantHealthPage:
+        items: List[TenantHealth] = []
+        for org_id in sorted(self.results):
+            if after_id is not None and org_id <= after_id:
+                continue
+            health = self.results[org_id]
+            if unhealthy_only and health.healthy:
+                continue
+            items.append(health)
+            if len(items) == limit:
+                break
+        return TenantHealthPage(
+            items=items,
+            next_after_id=items[-1].organization_id if len(items) == limit else None,
+            **self.stats(),
+        )
+
+    async def _check_forever(self) -> None:
+        while True:
+            try:
+                await self.check_all()
+            except Exception as e:
+                logger.warning("tenant_health_check_failed", extra={"error": str(e)})
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._check_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "tenants": len(self.results),
+            "unhealthy": sum(1 for health in self.results.values() if not health.healthy),
+            "last_run_at": self.last_run_at,
+            "last_run_seconds": self.last_run_seconds,
+        }
+
+
+tenant_health = TenantHealthChecker(
+    concurrency=settings.TENANT_HEALTH_CONCURRENCY,
+    timeout=settings.TENANT_HEALTH_TIMEOUT,
+    interval=settings.TENANT_HEALTH_INTERVAL,
+)
@@ -0,0 +1,158 @@
+import asyncio
+import math
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.database.session import async_session
+from app.organization.dao import (
+    OrganizationDAO,
+    ProvisionedDatabase,
+    ProvisioningJobDAO,
+)
+from app.organization.models import JobStatus, Organization
+from app.organization.schemas import OrgCreate
+
+logger = get_logger(__name__)
+
+
+class ProvisioningQueue:
+    """Bounded queue of organization provisioning jobs drained by a fixed pool of workers.
+
+    Job state lives in ``provisioning_jobs``; the request payload only lives in memory, so jobs
+    orphaned by a restart are failed by the reaper: running ones once they stop reporting progress,
+    pending ones once they have waited longer than a full queue takes to drain. Workers claim a job
+    with a conditional update, so a reaped job is never picked up afterwards.
+    """
+
+    def __init__(self, workers: int, max_size: int, job_timeout: float):
+        self.workers = workers
+        self.max_size = max_size
+        self.job_timeout = job_timeout
+        self._queue: Optional["asyncio.Queue[Tuple[int, OrgCreate]]"] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._reap()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def submit(self, job_id: int, org_data: OrgCreate) -> bool:
+        """Queue a job, returning False when the queue is full or not running."""
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait((job_id, org_data))
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id, org_data = await self._queue.get()
+            try:
+                async with async_session() as session:
+                    await self._run(session, job_id, org_data)
+            except Exception as e:
+                logger.error("provisioning_job_crashed", extra={"job_id": job_id, "error": str(e)})
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, session: AsyncSession, job_id: int, org_data: OrgCreate) -> None:
+        jobs = ProvisioningJobDAO(session)
+        if not await jobs.claim(job_id):
+            logger.warning("provisioning_job_skipped", extra={"job_id": job_id})
+            return
+
+        created: List[ProvisionedDatabase] = []
+        try:
+            org = await asyncio.wait_for(
+                self._provision(session, jobs, job_id, org_data, created), timeout=self.job_timeout
+            )
+        except Exception as e:
+            await session.rollback()
+            error = "Provisioning timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+            logger.error("provisioning_job_failed", extra={"job_id": job_id, "error": error})
+            for database in created:
+                await self._discard(session, org_data, database)
+            await jobs.set_status(job_id, JobStatus.FAILED, error=error)
+            return
+
+        await jobs.set_status(job_id, JobStatus.SUCCEEDED, step=None, organization_id=org.id)
+        logger.info("provisioning_job_succeeded", extra={"job_id": job_id, "organization_id": org.id})
+
+    async def _provision(
+        self,
+        session: AsyncSession,
+        jobs: ProvisioningJobDAO,
+        job_id: int,
+        org_data: OrgCreate,
+        created: List[ProvisionedDatabase],
+    ) -> Organization:
+        orgs = OrganizationDAO(session)
+
+        # Claiming the job already moved it to the create_database step
+        database = await orgs.provision_database(org_data)
+        if database.created:
+            created.append(database)
+
+        await jobs.set_status(job_id, JobStatus.RUNNING, step="create_organization")
+        return await orgs.create_organization(org_data, database=database)
+
+    async def _discard(self, session: AsyncSession, org_data: OrgCreate, database: ProvisionedDatabase) -> None:
+        """Drop the database a failed job created, unless its organization made it in after all."""
+        orgs = OrganizationDAO(session)
+        try:
+            if await orgs.exists_by_name(org_data.organization_name):
+                return
+            await orgs.discard_database(database)
+        except Exception as e:
+            logger.error(
+                "orphaned_organization_database", extra={"organization": org_data.organization_name, "error": str(e)}
+            )
+
+    async def reap(self, session: AsyncSession) -> int:
+        """Fail jobs with no live worker, returning how many were failed."""
+        # Running jobs update their row on every step, so one silent for twice the timeout has no live worker.
+        # Pending jobs only wait in memory; past the time a full queue takes to drain, no worker holds them.
+        drain = math.ceil(self.max_size / self.workers) * self.job_timeout
+        failed = await ProvisioningJobDAO(session).fail_stale(
+            running_for=timedelta(seconds=self.job_timeout * 2),
+            pending_for=timedelta(seconds=drain + self.job_timeout * 2),
+        )
+        if failed:
+            logger.warning("provisioning_jobs_reaped", extra={"count": failed})
+        return failed
+
+    async def _reap(self) -> None:
+        while True:
+            try:
+                async with async_session() as session:
+                    await self.reap(session)
+            except Exception as e:
+                logger.warning("provisioning_reaper_failed", extra={"error": str(e)})
+            await asyncio.sleep(self.job_timeout)
+
+
+provisioning_queue = ProvisioningQueue(
+    workers=settings.PROVISIONING_WORKERS,
+    max_size=settings.PROVISIONING_QUEUE_SIZE,
+    job_timeout=settings.PROVISIONING_JOB_TIMEOUT,
+)
@@ -1,13 +1,91 @@
-from sqlalchemy import Column, Integer, String
+import enum
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    text,
+)
 
 from app.database.base import Base
 
 
 class Organization(Base):
     __tablename__ = "organizations"
+    __table_args__ = (
+        # Serves case-insensitive lookups and lower(name) LIKE 'prefix%' scans
+        Index("ix_organizations_name_lower", text("lower(name) text_pattern_ops"), unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True)
     db_url = Column(String)
-    admin_email = Column(String)
+    admin_email = Column(String, index=True)
     admin_password = Column(String)
+    # Database cluster hosting the organization's database; NULL for the master server
+    cluster_id = Column(Integer, ForeignKey("database_clusters.id"), index=True)
+    # Schema holding the organization inside a shared database; NULL when it has a database of its own
+    schema_name = Column(String)
+
+
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+ACTIVE_JOB_STATUSES = (JobStatus.PENDING.value, JobStatus.RUNNING.value)
+
+
+class ProvisioningJob(Base):
+    __tablename__ = "provisioning_jobs"
+    id = Column(Integer, primary_key=True)
+    organization_name = Column(String, nullable=False)
+    admin_email = Column(String, nullable=False)
+    status = Column(String, nullable=False, default=JobStatus.PENDING.value)
+    step = Column(String)
+    error = Column(String)
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="SET NULL"))
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# Only one in-flight job per organization name
+Index(
+    "ix_provisioning_jobs_active_name",
+    func.lower(ProvisioningJob.organization_name),
+    unique=True,
+    postgresql_where=ProvisioningJob.status.in_(ACTIVE_JOB_STATUSES),
+)
+
+
+# TenantUsageSample.resolution of samples as collected, and of their hourly rollups
+RAW_RESOLUTION = 0
+HOURLY_RESOLUTION = 3600
+
+
+class TenantUsageSample(Base):
+    """Resource usage of one organization database at one point in time.
+
+    Raw samples past their retention are rolled up into one sample per organization and hour.
+    """
+
+    __tablename__ = "tenant_usage_samples"
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    resolution = Column(Integer, primary_key=True)
+    sampled_at = Column(DateTime, primary_key=True)
+    size_bytes = Column(BigInteger, nullable=False)
+    # Cumulative pg_stat_database counters
+    xact_commit = Column(BigInteger, nullable=False)
+    blks_read = Column(BigInteger, nullable=False)
+    connections = Column(Integer, nullable=False)
+    # Commits per second since the previous sample; NULL when there was none to compare with
+    tps = Column(Float)
@@ -1,10 +1,27 @@
-from fastapi import APIRouter, Depends
+import json
+from typing import Any, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_super_admin
 from app.auth.schemas import TokenData
+from app.core.config import settings
 from app.database.session import get_session
-from app.organization.schemas import AdminLogin, OrgCreate, OrgRetrieve, Token
+from app.organization.health import tenant_health
+from app.organization.models import ProvisioningJob
+from app.organization.schemas import (
+    AdminLogin,
+    BulkOrgResponse,
+    JobRetrieve,
+    OrgCreate,
+    OrgPage,
+    OrgRetrieve,
+    TenantHealthPage,
+    TenantUsageRetrieve,
+    Token,
+)
 from app.organization.services import OrganizationService
 
 router = APIRouter()
@@ -14,15 +31,99 @@ async def get_org_service(session: AsyncSession = Depends(get_session)) -> Organ
     return OrganizationService(session)
 
 
-@router.post("/org/create", response_model=OrgRetrieve)
+def job_response(job: ProvisioningJob) -> JobRetrieve:
+    return JobRetrieve(
+        job_id=job.id,
+        organization_name=job.organization_name,
+        status=job.status,
+        step=job.step,
+        error=job.error,
+        organization_id=job.organization_id,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+async def read_bulk_items(request: Request) -> List[Any]:
+    """Read a JSON array of organizations, or one organization per line for ``application/x-ndjson``."""
+    items: List[Any] = []
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            items.extend(_parse_ndjson_line(line) for line in lines if line.strip())
+            if len(items) > settings.BULK_MAX_ITEMS:
+                break
+        if buffer.strip():
+            items.append(_parse_ndjson_line(buffer))
+    else:
+        try:
+            items = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request body must be valid JSON")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a list of organizations")
+
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} organizations per request",
+        )
+    return items
+
+
+def _parse_ndjson_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        # Reported as a validation failure for that item
+        return line.decode(errors="replace")
+
+
+@router.post("/org/create", response_model=JobRetrieve, status_code=status.HTTP_202_ACCEPTED)
 async def create_org(
     payload: OrgCreate,
     current_user: TokenData = Depends(get_super_admin),  # Requires super admin
     service: OrganizationService = Depends(get_org_service),
 ):
-    """Create a new organization with its own database. Only super admin can perform this action."""
-    org = await service.create_organization(payload)
-    return OrgRetrieve(organization_name=org.name, db_url=org.db_url, admin_email=org.admin_email)
+    """Queue creation of a new organization with its own database. Only super admin can perform this action."""
+    job = await service.submit_organization(payload)
+    return job_response(job)
+
+
+@router.post(
+    "/org/bulk",
+    response_model=BulkOrgResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": OrgCreate.model_json_schema()}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def bulk_create_org(
+    request: Request,
+    current_user: TokenData = Depends(get_super_admin),  # Requires super admin
+    service: OrganizationService = Depends(get_org_service),
+):
+    """Create many organizations in one request. Only super admin can perform this action."""
+    items = await read_bulk_items(request)
+    return await service.bulk_create_organizations(items)
+
+
+@router.get("/org/jobs/{job_id}", response_model=JobRetrieve)
+async def get_org_job(
+    job_id: int,
+    current_user: TokenData = Depends(get_super_admin),  # Requires super admin
+    service: OrganizationService = Depends(get_org_service),
+):
+    """Get the progress of an organization provisioning job."""
+    job = await service.get_job(job_id)
+    return job_response(job)
 
 
 @router.get("/org/get", response_model=OrgRetrieve)
@@ -32,6 +133,46 @@ async def get_org(organization_name: str, service: OrganizationService = Depends
     return OrgRetrieve(organization_name=org.name, db_url=org.db_url, admin_email=org.admin_email)
 
 
+@router.get("/org/list", response_model=OrgPage)
+async def list_orgs(
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    name_prefix: Optional[str] = None,
+    stream: bool = False,
+    current_user: TokenData = Depends(get_super_admin),  # Requires super admin
+    service: OrganizationService = Depends(get_org_service),
+):
+    """List organizations by keyset page, or stream all of them as NDJSON with ``stream=true``."""
+    if stream:
+        return StreamingResponse(service.export_organizations(name_prefix), media_type="application/x-ndjson")
+    return await service.list_organizations(after_id=after_id, limit=limit, name_prefix=name_prefix)
+
+
+@router.get("/org/health", response_model=TenantHealthPage)
+async def org_database_health(
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    unhealthy: bool = False,
+    refresh: bool = False,
+    current_user: TokenData = Depends(get_super_admin),  # Requires super admin
+):
+    """Latest health of each organization database by keyset page; ``refresh=true`` probes them all first."""
+    if refresh:
+        await tenant_health.check_all()
+    return tenant_health.page(after_id=after_id, limit=limit, unhealthy_only=unhealthy)
+
+
+@router.get("/org/usage/top", response_model=List[TenantUsageRetrieve])
+async def top_org_usage(
+    by: Literal["size", "tps", "connections"] = "size",
+    limit: int = Query(10, ge=1, le=1000),
+    current_user: TokenData = Depends(get_super_admin),  # Requires super admin
+    service: OrganizationService = Depends(get_org_service),
+):
+    """Organizations using the most storage, transactions per second or connections."""
+    return await service.top_usage(by=by, limit=limit)
+
+
 @router.post("/admin/login", response_model=Token)
 async def admin_login(payload: AdminLogin, service: OrganizationService = Depends(get_org_service)):
     """Login for organization admin."""
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel, EmailStr, constr
 
 
@@ -24,3 +27,61 @@ class AdminLogin(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+
+
+class JobRetrieve(BaseModel):
+    job_id: int
+    organization_name: str
+    status: str
+    step: Optional[str] = None
+    error: Optional[str] = None
+    organization_id: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class BulkOrgResult(BaseModel):
+    index: int
+    organization_name: Optional[str] = None
+    status: str
+    error: Optional[str] = None
+    organization: Optional[OrgRetrieve] = None
+
+
+class BulkOrgResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkOrgResult]
+
+
+class OrgPage(BaseModel):
+    items: List[OrgRetrieve]
+    next_after_id: Optional[int] = None
+
+
+class TenantHealth(BaseModel):
+    organization_id: int
+    organization_name: str
+    healthy: bool
+    latency: float
+    error: Optional[str] = None
+    checked_at: datetime
+    last_healthy_at: Optional[datetime] = None
+
+
+class TenantHealthPage(BaseModel):
+    items: List[TenantHealth]
+    next_after_id: Optional[int] = None
+    tenants: int
+    unhealthy: int
+    last_run_at: Optional[datetime] = None
+    last_run_seconds: Optional[float] = None
+
+
+class TenantUsageRetrieve(BaseModel):
+    organization_id: int
+    organization_name: str
+    size_bytes: int
+    connections: int
+    tps: Optional[float] = None
+    sampled_at: datetime
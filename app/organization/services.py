@@ -1,27 +1,213 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
 from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token, verify_password
-from app.organization.dao import OrganizationDAO
-from app.organization.models import Organization
-from app.organization.schemas import AdminLogin, OrgCreate, Token
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security import create_access_token, verify_password_async
+from app.core.tracing import trace_methods
+from app.database.session import async_session
+from app.organization.dao import (
+    OrganizationDAO,
+    ProvisionedDatabase,
+    ProvisioningJobDAO,
+    TenantUsageDAO,
+)
+from app.organization.jobs import provisioning_queue
+from app.organization.models import JobStatus, Organization, ProvisioningJob
+from app.organization.schemas import (
+    AdminLogin,
+    BulkOrgResponse,
+    BulkOrgResult,
+    OrgCreate,
+    OrgPage,
+    OrgRetrieve,
+    TenantUsageRetrieve,
+    Token,
+)
+
+logger = get_logger(__name__)
+
+EXPORT_CHUNK_ROWS = 200
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    messages = []
+    for err in error.errors():
+        location = ".".join(str(part) for part in err["loc"])
+        messages.append(f"{location}: {err['msg']}" if location else err["msg"])
+    return "; ".join(messages)
+
+
+def _retrieve(org: Organization) -> OrgRetrieve:
+    return OrgRetrieve(organization_name=org.name, db_url=org.db_url, admin_email=org.admin_email)
+
 
+def _created(index: int, org: Organization) -> BulkOrgResult:
+    return BulkOrgResult(index=index, organization_name=org.name, status="created", organization=_retrieve(org))
 
+
+def _failed(index: int, error: str, name: Optional[str] = None) -> BulkOrgResult:
+    return BulkOrgResult(index=index, organization_name=name, status="failed", error=error)
+
+
+@trace_methods("service")
 class OrganizationService:
     def __init__(self, session: AsyncSession):
         self.dao = OrganizationDAO(session)
+        self.jobs = ProvisioningJobDAO(session)
+        self.usage = TenantUsageDAO(session)
 
-    async def create_organization(self, org_data: OrgCreate) -> Organization:
-        """Create a new organization with its database."""
-        # Check if organization exists
+    async def submit_organization(self, org_data: OrgCreate) -> ProvisioningJob:
+        """Queue a background job that creates the organization and its database."""
         if await self.dao.exists_by_name(org_data.organization_name):
             raise HTTPException(status_code=400, detail="Organization already exists")
+        if await self.jobs.get_active_by_name(org_data.organization_name):
+            raise HTTPException(status_code=400, detail="Organization is already being provisioned")
+
+        try:
+            job = await self.jobs.create_job(org_data)
+        except IntegrityError:
+            # Lost a race with a concurrent request for the same name
+            await self.jobs.session.rollback()
+            raise HTTPException(status_code=400, detail="Organization is already being provisioned")
+
+        if not provisioning_queue.submit(job.id, org_data):
+            await self.jobs.set_status(job.id, JobStatus.FAILED, error="Provisioning queue is full")
+            raise HTTPException(status_code=503, detail="Provisioning queue is full, retry later")
+        return job
+
+    async def bulk_create_organizations(self, items: Sequence[Any]) -> BulkOrgResponse:
+        """Create many organizations, provisioning their databases concurrently and inserting in batches."""
+        results: List[Optional[BulkOrgResult]] = [None] * len(items)
 
+        # Validate and drop duplicates within the request
+        candidates: List[Tuple[int, OrgCreate]] = []
+        seen: Set[str] = set()
+        for index, item in enumerate(items):
+            try:
+                org_data = OrgCreate.model_validate(item)
+            except ValidationError as e:
+                results[index] = _failed(index, _format_validation_error(e))
+                continue
+            name = org_data.organization_name.lower()
+            if name in seen:
+                results[index] = _failed(index, "Duplicate organization name in request", org_data.organization_name)
+                continue
+            seen.add(name)
+            candidates.append((index, org_data))
+
+        # Check existing and in-flight names with one query each instead of one per item
+        names = [org_data.organization_name for _, org_data in candidates]
+        taken = await self.dao.existing_names(names) | await self.jobs.active_names(names)
+        to_create: List[Tuple[int, OrgCreate]] = []
+        for index, org_data in candidates:
+            if org_data.organization_name.lower() in taken:
+                results[index] = _failed(index, "Organization already exists", org_data.organization_name)
+            else:
+                to_create.append((index, org_data))
+
+        semaphore = asyncio.Semaphore(settings.BULK_PROVISION_CONCURRENCY)
+
+        async def prepare(org_data: OrgCreate) -> Tuple[Dict[str, Any], ProvisionedDatabase]:
+            async with semaphore:
+                return await self.dao.prepare_organization(org_data)
+
+        batch_size = settings.BULK_INSERT_BATCH_SIZE
+        for start in range(0, len(to_create), batch_size):
+            end = start + batch_size
+            chunk = to_create[start:end]
+            prepared = await asyncio.gather(*(prepare(org_data) for _, org_data in chunk), return_exceptions=True)
+
+            rows: List[Tuple[int, Dict[str, Any]]] = []
+            # Databases this request created, by organization name; reused ones are never dropped
+            created: Dict[str, ProvisionedDatabase] = {}
+            for (index, org_data), outcome in zip(chunk, prepared):
+                if isinstance(outcome, BaseException):
+                    error = outcome.detail if isinstance(outcome, HTTPException) else str(outcome)
+                    results[index] = _failed(
+                        index, f"Failed to create organization: {error}", org_data.organization_name
+                    )
+                    continue
+                row, database = outcome
+                rows.append((index, row))
+                if database.created:
+                    created[row["name"]] = database
+            await self._insert_batch(rows, results, created)
+
+        final = [result for result in results if result is not None]
+        created = sum(1 for result in final if result.status == "created")
+        return BulkOrgResponse(created=created, failed=len(final) - created, results=final)
+
+    async def _insert_batch(
+        self,
+        rows: List[Tuple[int, Dict[str, Any]]],
+        results: List[Optional[BulkOrgResult]],
+        created: Dict[str, ProvisionedDatabase],
+    ) -> None:
+        if not rows:
+            return
         try:
-            org = await self.dao.create_organization(org_data)
-            return org
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to create organization: {str(e)}")
+            await self._insert_rows(rows, results, created)
+        except BaseException:
+            # Don't leave databases behind for rows that never made it into ``organizations``
+            await self.dao.session.rollback()
+            await self._discard([row for index, row in rows if results[index] is None], created)
+            raise
+
+    async def _insert_rows(
+        self,
+        rows: List[Tuple[int, Dict[str, Any]]],
+        results: List[Optional[BulkOrgResult]],
+        created: Dict[str, ProvisionedDatabase],
+    ) -> None:
+        try:
+            orgs = await self.dao.insert_organizations([row for _, row in rows])
+        except SQLAlchemyError:
+            await self.dao.session.rollback()
+        else:
+            for (index, _), org in zip(rows, orgs):
+                results[index] = _created(index, org)
+            return
+
+        # One conflicting row aborts the whole statement; retry row by row to report per item
+        rejected: List[Dict[str, Any]] = []
+        for index, row in rows:
+            try:
+                org = (await self.dao.insert_organizations([row]))[0]
+            except SQLAlchemyError as e:
+                await self.dao.session.rollback()
+                results[index] = _failed(index, f"Failed to create organization: {e.__class__.__name__}", row["name"])
+                rejected.append(row)
+            else:
+                results[index] = _created(index, org)
+        await self._discard(rejected, created)
+
+    async def _discard(self, rows: List[Dict[str, Any]], created: Dict[str, ProvisionedDatabase]) -> None:
+        for row in rows:
+            database = created.get(row["name"])
+            if database is None:
+                # The database existed before this request; it is not ours to drop
+                continue
+            try:
+                # The name may have been taken concurrently, in which case the database belongs to the winner
+                if await self.dao.exists_by_name(row["name"]):
+                    continue
+                await self.dao.discard_database(database)
+            except Exception as e:
+                logger.error("orphaned_organization_database", extra={"organization": row["name"], "error": str(e)})
+
+    async def get_job(self, job_id: int) -> ProvisioningJob:
+        """Get provisioning job by id."""
+        job = await self.jobs.get(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Provisioning job not found")
+        return job
 
     async def get_organization(self, name: str) -> Organization:
         """Get organization by name."""
@@ -30,11 +216,37 @@ class OrganizationService:
             raise HTTPException(status_code=404, detail="Organization not found")
         return org
 
+    async def list_organizations(
+        self, after_id: Optional[int] = None, limit: int = 100, name_prefix: Optional[str] = None
+    ) -> OrgPage:
+        """Get one keyset page of organizations."""
+        orgs = await self.dao.list_organizations(after_id=after_id, limit=limit, name_prefix=name_prefix)
+        next_after_id = orgs[-1].id if len(orgs) == limit else None
+        return OrgPage(items=[_retrieve(org) for org in orgs], next_after_id=next_after_id)
+
+    async def top_usage(self, by: str, limit: int = 10) -> List[TenantUsageRetrieve]:
+        """Get the organizations with the largest size, TPS or connection count."""
+        since = datetime.utcnow() - timedelta(seconds=settings.TENANT_USAGE_TOP_WINDOW)
+        return await self.usage.top(by=by, limit=limit, since=since)
+
+    async def export_organizations(self, name_prefix: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield every organization as NDJSON, a chunk of lines at a time."""
+        # The response streams after the request-scoped session is released, so use a dedicated one
+        async with async_session() as session:
+            lines: List[str] = []
+            async for org in OrganizationDAO(session).stream_organizations(name_prefix):
+                lines.append(_retrieve(org).model_dump_json())
+                if len(lines) >= EXPORT_CHUNK_ROWS:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+
     async def admin_login(self, login_data: AdminLogin) -> Token:
         """Handle admin login and token generation."""
-        org = await self.dao.get_by_admin_email(login_data.email)
+        org = await self.dao.get_login_credentials(login_data.email)
 
-        if not org or not verify_password(login_data.password, org.admin_password):
+        if not org or not await verify_password_async(login_data.password, org.admin_password):
             raise HTTPException(
                 status_code=401,
                 detail="Incorrect email or password",
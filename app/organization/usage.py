@@ -0,0 +1,184 @@
+import asyncio
+import time
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.cluster.dao import ClusterDAO
+from app.cluster.engines import cluster_engines
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.database.session import async_session, engine, master_server, try_advisory_lock
+from app.organization.dao import TenantUsageDAO
+from app.organization.models import Organization
+
+logger = get_logger(__name__)
+
+# One round trip per server covers all of its organization databases
+_USAGE_SQL = text(
+    """
+    SELECT d.datname, pg_database_size(d.oid) AS size_bytes, s.xact_commit, s.blks_read, s.numbackends
+    FROM pg_database d JOIN pg_stat_database s ON s.datid = d.oid
+    WHERE d.datname IN :names
+    """
+).bindparams(bindparam("names", expanding=True))
+
+
+class DatabaseUsage(NamedTuple):
+    size_bytes: int
+    xact_commit: int
+    blks_read: int
+    connections: int
+
+
+def _rate(previous: Optional[Tuple[datetime, int]], row: Dict) -> Optional[float]:
+    """Commits per second since the ``previous`` (sampled_at, xact_commit), or None without a usable one."""
+    if previous is None:
+        return None
+    sampled_at, xact_commit = previous
+    elapsed = (row["sampled_at"] - sampled_at).total_seconds()
+    # The counter goes backwards after a stats reset or a server restart
+    if elapsed <= 0 or row["xact_commit"] < xact_commit:
+        return None
+    return (row["xact_commit"] - xact_commit) / elapsed
+
+
+class TenantUsageCollector:
+    """Periodically samples size and activity of every organization database into ``tenant_usage_samples``.
+
+    Databases are grouped by the server hosting them and each server is queried once per round.
+    TPS is the commit delta since the organization's newest stored sample, whichever worker took it.
+    Raw samples older than ``raw_retention`` are rolled up by hour; rollups are kept for ``rollup_retention``.
+    """
+
+    def __init__(self, db_engine: AsyncEngine, interval: float, raw_retention: timedelta, rollup_retention: timedelta):
+        self.engine = db_engine
+        self.interval = interval
+        self.raw_retention = raw_retention
+        self.rollup_retention = rollup_retention
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_seconds: Optional[float] = None
+        self.last_samples = 0
+        self._lock_key = zlib.crc32(b"tenant_usage")
+        self._task: Optional[asyncio.Task] = None
+
+    async def _load_organizations(self) -> Dict[Optional[int], List[Organization]]:
+        """Organization databases grouped by cluster ID (None for the master server)."""
+        async with async_session() as session:
+            orgs = await TenantUsageDAO(session).database_tenants()
+        by_cluster: Dict[Optional[int], List[Organization]] = defaultdict(list)
+        for org in orgs:
+            by_cluster[org.cluster_id].append(org)
+        return by_cluster
+
+    async def _servers(self, cluster_ids: Sequence[Optional[int]]) -> Dict[Optional[int], AsyncEngine]:
+        servers: Dict[Optional[int], AsyncEngine] = {None: master_server.engine}
+        if any(cluster_id is not None for cluster_id in cluster_ids):
+            async with async_session() as session:
+                clusters = await ClusterDAO(session).list_clusters()
+            for cluster in clusters:
+                servers[cluster.id] = (await cluster_engines.server(cluster)).engine
+        return servers
+
+    async def _fetch(self, server: AsyncEngine, names: List[str]) -> Dict[str, DatabaseUsage]:
+        async with server.connect() as conn:
+            result = await conn.execute(_USAGE_SQL, {"names": names})
+            return {row.datname: DatabaseUsage(*row[1:]) for row in result}
+
+    async def _sample_cluster(
+        self, servers: Dict[Optional[int], AsyncEngine], cluster_id: Optional[int], orgs: List[Organization]
+    ) -> List[Dict]:
+        server = servers.get(cluster_id)
+        if server is None:
+            logger.warning("tenant_usage_unknown_cluster", extra={"cluster_id": cluster_id})
+            return []
+        names = {make_url(org.db_url).database: org.id for org in orgs}
+        try:
+            usage = await self._fetch(server, list(names))
+        except Exception as e:
+            logger.warning("tenant_usage_fetch_failed", extra={"cluster_id": cluster_id, "error": str(e)})
+            return []
+        return [self._sample(names[name], reading) for name, reading in usage.items()]
+
+    def _sample(self, org_id: int, usage: DatabaseUsage) -> Dict:
+        return {
+            "organization_id": org_id,
+            "sampled_at": datetime.utcnow(),
+            "size_bytes": usage.size_bytes,
+            "xact_commit": usage.xact_commit,
+            "blks_read": usage.blks_read,
+            "connections": usage.connections,
+            "tps": None,
+        }
+
+    async def _store(self, rows: List[Dict], now: datetime) -> None:
+        async with async_session() as session:
+            dao = TenantUsageDAO(session)
+            # Any worker may have taken the previous sample, so the database holds the baseline. Looking back
+            # a few intervals bounds the scan; an organization without a recent sample gets no rate this round.
+            previous = await dao.latest_commits(since=now - timedelta(seconds=self.interval * 3))
+            for row in rows:
+                row["tps"] = _rate(previous.get(row["organization_id"]), row)
+            await dao.add_samples(rows)
+            await dao.downsample(now - self.raw_retention, now - self.rollup_retention)
+
+    async def collect(self) -> int:
+        """Sample every organization database once; returns the number of samples stored."""
+        started = time.perf_counter()
+        by_cluster = await self._load_organizations()
+        servers = await self._servers(list(by_cluster))
+        batches = await asyncio.gather(
+            *(self._sample_cluster(servers, cluster_id, orgs) for cluster_id, orgs in by_cluster.items())
+        )
+        rows = [row for batch in batches for row in batch]
+        await self._store(rows, datetime.utcnow())
+
+        self.last_run_at = datetime.utcnow()
+        self.last_run_seconds = time.perf_counter() - started
+        self.last_samples = len(rows)
+        logger.info("tenant_usage_collected", extra={"samples": len(rows), "seconds": self.last_run_seconds})
+        return len(rows)
+
+    async def _collect_once(self) -> None:
+        async with try_advisory_lock(self.engine, self._lock_key) as locked:
+            if not locked:
+                # Another worker is collecting
+                return
+            await self.collect()
+
+    async def _collect_forever(self) -> None:
+        while True:
+            try:
+                await self._collect_once()
+            except Exception as e:
+                logger.warning("tenant_usage_collect_failed", extra={"error": str(e)})
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._collect_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "last_samples": self.last_samples,
+            "last_run_at": self.last_run_at,
+            "last_run_seconds": self.last_run_seconds,
+        }
+
+
+tenant_usage = TenantUsageCollector(
+    engine,
+    interval=settings.TENANT_USAGE_INTERVAL,
+    raw_retention=timedelta(hours=settings.TENANT_USAGE_RAW_RETENTION_HOURS),
+    rollup_retention=timedelta(days=settings.TENANT_USAGE_ROLLUP_RETENTION_DAYS),
+)
@@ -0,0 +1,222 @@
+import asyncio
+import hashlib
+import hmac
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import SECRET_KEY, settings
+from app.core.logging import get_logger
+from app.core.middleware import route_template
+from app.profiling.store import ProfileStore, profile_store
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = "X-Profile-Token"
+_PROFILE_HEADER_KEY = PROFILE_HEADER.lower().encode()
+
+# (function, file, first line)
+Frame = Tuple[str, str, int]
+WAITING: Frame = ("(waiting)", "", 0)
+
+
+def _frame_key(frame: FrameType) -> Frame:
+    code = frame.f_code
+    return getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno
+
+
+def _awaiting_stack(coro: Any) -> List[FrameType]:
+    """Frames of a suspended coroutine and everything it awaits, outermost first."""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return frames
+
+
+class Profile:
+    """Stack samples of one request's task, counted by unique stack."""
+
+    def __init__(self, task: asyncio.Task, loop: asyncio.AbstractEventLoop, thread_id: int, interval: float):
+        self.task = task
+        self.loop = loop
+        self.thread_id = thread_id
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.stacks: "Counter[Tuple[Frame, ...]]" = Counter()
+
+    def sample(self, frames: Dict[int, FrameType]) -> None:
+        root = self.task.get_coro()
+        if asyncio.current_task(self.loop) is self.task:
+            # Running on the loop thread: walk its real stack up to the task's own coroutine
+            stack = []
+            frame: Optional[FrameType] = frames.get(self.thread_id)
+            root_frame = getattr(root, "cr_frame", None)
+            while frame is not None:
+                stack.append(_frame_key(frame))
+                if frame is root_frame:
+                    break
+                frame = frame.f_back
+            stack.reverse()
+        else:
+            # Suspended, e.g. on the database, a lock or the bcrypt executor: record where it waits
+            stack = [_frame_key(frame) for frame in _awaiting_stack(root)] + [WAITING]
+        self.stacks[tuple(stack)] += 1
+
+    def collapsed(self) -> bytes:
+        """Brendan Gregg's collapsed stack format, as read by flamegraph.pl and speedscope."""
+        lines = [
+            ";".join(f"{name} ({file}:{line})" for name, file, line in stack) + f" {count}"
+            for stack, count in self.stacks.items()
+        ]
+        return "\n".join(lines).encode() + b"\n"
+
+    def speedscope(self, name: str) -> bytes:
+        frames: Dict[Frame, int] = {}
+        samples = []
+        weights = []
+        for stack, count in self.stacks.items():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(count * self.interval)
+        return orjson.dumps(
+            {
+                "$schema": "https://www.speedscope.app/file-format-schema.json",
+                "name": name,
+                "exporter": settings.PROJECT_NAME,
+                "shared": {"frames": [{"name": n, "file": f, "line": line} for n, f, line in frames]},
+                "profiles": [
+                    {
+                        "type": "sampled",
+                        "name": name,
+                        "unit": "seconds",
+                        "startValue": 0,
+                        "endValue": self.duration,
+                        "samples": samples,
+                        "weights": weights,
+                    }
+                ],
+            }
+        )
+
+
+class Sampler:
+    """Background thread sampling the stacks of all profiled requests every ``interval`` seconds.
+
+    The thread only runs while at least one request is being profiled.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._profiles: Dict[asyncio.Task, Profile] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, task: asyncio.Task) -> Profile:
+        profile = Profile(task, asyncio.get_running_loop(), threading.get_ident(), self.interval)
+        with self._lock:
+            self._profiles[task] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+        return profile
+
+    def stop(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles.pop(profile.task, None)
+        profile.duration = time.perf_counter() - profile.started
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._profiles:
+                    self._thread = None
+                    return
+                profiles = list(self._profiles.values())
+            frames = sys._current_frames()
+            for profile in profiles:
+                profile.sample(frames)
+
+
+def sign_profile_token(expires_at: int) -> str:
+    signature = hmac.new(SECRET_KEY.encode(), f"profile:{expires_at}".encode(), hashlib.sha256).hexdigest()
+    return f"{expires_at}.{signature}"
+
+
+def verify_profile_token(token: str) -> bool:
+    expires_at = token.partition(".")[0]
+    if not expires_at.isdigit() or int(expires_at) < time.time():
+        return False
+    return hmac.compare_digest(sign_profile_token(int(expires_at)), token)
+
+
+class ProfilingMiddleware:
+    """Profiles a random ``sample_rate`` share of requests, plus any carrying a valid ``X-Profile-Token``.
+
+    Only installed when ``PROFILING_ENABLED`` is set; other requests pay one random draw and a header scan.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = settings.PROFILING_SAMPLE_RATE,
+        sampler: Optional[Sampler] = None,
+        store: ProfileStore = profile_store,
+        format: str = settings.PROFILING_FORMAT,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.sampler = sampler or Sampler(settings.PROFILING_INTERVAL)
+        self.store = store
+        self.format = format
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        for key, value in scope["headers"]:
+            if key == _PROFILE_HEADER_KEY:
+                return verify_profile_token(value.decode("latin-1"))
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        task = asyncio.current_task()
+        assert task is not None
+        profile = self.sampler.start(task)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.sampler.stop(profile)
+            await self._save(scope, status_code, profile)
+
+    async def _save(self, scope: Scope, status_code: int, profile: Profile) -> None:
+        name = f"{scope['method']} {route_template(scope)} {status_code}"
+        content = profile.speedscope(name) if self.format == "speedscope" else profile.collapsed()
+        try:
+            await asyncio.to_thread(
+                self.store.save, scope["method"], route_template(scope), profile.duration, self.format, content
+            )
+        except OSError as e:
+            logger.warning("profile_save_failed", extra={"error": str(e)})
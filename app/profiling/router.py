@@ -0,0 +1,41 @@
+import time
+from datetime import datetime
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.auth.dependencies import get_super_admin
+from app.auth.schemas import TokenData
+from app.core.config import settings
+from app.profiling.profiler import PROFILE_HEADER, sign_profile_token
+from app.profiling.schemas import ProfileRetrieve, ProfileToken
+from app.profiling.store import profile_store
+
+router = APIRouter(prefix="/profiles", tags=["Profiling"])
+
+
+@router.get("", response_model=List[ProfileRetrieve])
+async def list_profiles(current_user: TokenData = Depends(get_super_admin)):  # Requires super admin
+    """List stored request profiles, newest first."""
+    return profile_store.list()
+
+
+@router.post("/token", response_model=ProfileToken)
+async def create_profile_token(current_user: TokenData = Depends(get_super_admin)):  # Requires super admin
+    """Issue a short-lived token; requests sending it in ``X-Profile-Token`` are always profiled."""
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Profiling is not enabled")
+    expires_at = int(time.time()) + settings.PROFILING_TOKEN_TTL
+    return ProfileToken(
+        header=PROFILE_HEADER, token=sign_profile_token(expires_at), expires_at=datetime.fromtimestamp(expires_at)
+    )
+
+
+@router.get("/{name}")
+async def download_profile(name: str, current_user: TokenData = Depends(get_super_admin)):  # Requires super admin
+    """Download a stored profile; open ``.speedscope.json`` files at https://www.speedscope.app."""
+    path = profile_store.path(name)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, filename=name)
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ProfileRetrieve(BaseModel):
+    name: str
+    size: int
+    created_at: datetime
+
+
+class ProfileToken(BaseModel):
+    header: str
+    token: str
+    expires_at: datetime
@@ -0,0 +1,60 @@
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import settings
+from app.profiling.schemas import ProfileRetrieve
+
+EXTENSIONS = {"speedscope": ".speedscope.json", "collapsed": ".collapsed.txt"}
+_NAME = re.compile(r"^\d+-[A-Z]+-[\w.-]+-\d+ms\.(speedscope\.json|collapsed\.txt)$")
+
+
+class ProfileStore:
+    """Ring buffer of profile files in ``directory``; the oldest are deleted beyond ``max_files``.
+
+    File names start with the capture time in milliseconds, so name order is age order.
+    """
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def _files(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(path for path in self.directory.iterdir() if _NAME.match(path.name))
+
+    def save(self, method: str, route: str, duration: float, format: str, content: bytes) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^\w.-]+", "_", route).strip("_") or "root"
+        name = f"{int(time.time() * 1000)}-{method}-{slug}-{int(duration * 1000)}ms{EXTENSIONS[format]}"
+        path = self.directory / name
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(content)
+        tmp.replace(path)
+
+        files = self._files()
+        for old in files[: max(len(files) - self.max_files, 0)]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def list(self) -> List[ProfileRetrieve]:
+        profiles = []
+        for path in reversed(self._files()):
+            stat = path.stat()
+            profiles.append(
+                ProfileRetrieve(name=path.name, size=stat.st_size, created_at=datetime.fromtimestamp(stat.st_mtime))
+            )
+        return profiles
+
+    def path(self, name: str) -> Optional[Path]:
+        """Path of a stored profile, or None; names that are not profile file names never resolve."""
+        if not _NAME.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+
+profile_store = ProfileStore(directory=settings.PROFILING_DIR, max_files=settings.PROFILING_MAX_FILES)
@@ -1,9 +1,13 @@
 from fastapi import APIRouter
 
 from app.auth.router import router as auth_router
+from app.cluster.router import router as cluster_router
 from app.organization.router import router as org_router
+from app.profiling.router import router as profiling_router
 
 api_router = APIRouter()
 
 api_router.include_router(auth_router)
 api_router.include_router(org_router)
+api_router.include_router(cluster_router)
+api_router.include_router(profiling_router)
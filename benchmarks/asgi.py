@@ -0,0 +1,55 @@
+"""Minimal in-process ASGI driver so benchmarks measure the app, not an HTTP client or socket."""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+async def call(app: Callable, method: str, path: str, headers: Optional[Headers] = None) -> int:
+    """Send one request through ``app`` and return the response status."""
+    scope: Dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers or [],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    status = 0
+    sent_request = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def requests_per_second(
+    app: Callable, method: str, path: str, headers: Optional[Headers] = None, requests: int = 5000
+) -> float:
+    """Run ``requests`` sequential requests (after a short warm-up) and return the rate achieved."""
+    for _ in range(min(requests // 10, 200)):
+        await call(app, method, path, headers)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        status = await call(app, method, path, headers)
+        assert status == 200, status
+    return requests / (time.perf_counter() - start)
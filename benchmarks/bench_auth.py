@@ -0,0 +1,83 @@
+"""Compare authenticated requests per second before and after the stateless JWT fast path.
+
+The "before" chain mirrors the previous dependencies: both get_current_user and get_super_admin
+declared an unused request session and every request ran jwt.decode. Runs without a database.
+
+    python -m benchmarks.bench_auth --requests 5000
+"""
+
+import argparse
+import asyncio
+from typing import AsyncGenerator, Dict
+
+from fastapi import Depends, FastAPI, HTTPException
+from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import get_super_admin, oauth2_scheme
+from app.auth.schemas import TokenData
+from app.core.config import ALGORITHM, SECRET_KEY
+from app.core.security import create_access_token
+from app.database.session import async_session
+from benchmarks.asgi import requests_per_second
+
+
+async def legacy_get_session() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def legacy_get_current_user(
+    token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(legacy_get_session)
+) -> TokenData:
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return TokenData(email=payload["sub"], is_super_admin=payload.get("is_super_admin", False))
+
+
+async def legacy_get_super_admin(
+    current_user: TokenData = Depends(legacy_get_current_user), session: AsyncSession = Depends(legacy_get_session)
+) -> TokenData:
+    if not current_user.is_super_admin:
+        raise HTTPException(status_code=403)
+    return current_user
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before")
+    async def before(user: TokenData = Depends(legacy_get_super_admin)) -> Dict:
+        return {"email": user.email}
+
+    @app.get("/after")
+    async def after(user: TokenData = Depends(get_super_admin)) -> Dict:
+        return {"email": user.email}
+
+    return app
+
+
+async def run(requests: int) -> None:
+    app = build_app()
+    token = create_access_token({"sub": "bench@example.com", "is_super_admin": True})
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+
+    before = await requests_per_second(app, "GET", "/before", headers, requests)
+    after = await requests_per_second(app, "GET", "/after", headers, requests)
+    print(f"{'variant':<10}{'req/s':>12}")
+    print(f"{'before':<10}{before:>12.0f}")
+    print(f"{'after':<10}{after:>12.0f}")
+    print(f"speedup: {after / before:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare per-request overhead of the pure ASGI error handling middleware against the previous
+``app.middleware("http")`` function, which ran on Starlette's BaseHTTPMiddleware. Runs without a database.
+
+    python -m benchmarks.bench_middleware --requests 5000
+"""
+
+import argparse
+import asyncio
+import time
+import traceback
+from typing import Callable, Dict
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.logging import get_logger
+from app.core.middleware import ErrorHandlerMiddleware
+from benchmarks.asgi import requests_per_second
+
+logger = get_logger(__name__)
+
+
+async def legacy_error_handler_middleware(request: Request, call_next: Callable) -> Response:
+    try:
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logger.info(
+            "request_processed",
+            extra={
+                "path": request.url.path,
+                "method": request.method,
+                "process_time": process_time,
+                "status_code": response.status_code,
+            },
+        )
+        return response
+    except SQLAlchemyError as e:
+        logger.error("database_error", extra={"error": str(e), "path": request.url.path, "method": request.method})
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "Database error occurred"}
+        )
+    except Exception as e:
+        logger.error("unhandled_error", extra={"error": str(e), "traceback": traceback.format_exc()})
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "Internal server error"}
+        )
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+    if variant == "before":
+        app.middleware("http")(legacy_error_handler_middleware)
+    elif variant == "after":
+        app.add_middleware(ErrorHandlerMiddleware)
+
+    @app.get("/ping")
+    async def ping() -> Dict:
+        return {"status": "ok"}
+
+    return app
+
+
+async def run(requests: int) -> None:
+    results = {}
+    for variant in ("none", "before", "after"):
+        results[variant] = await requests_per_second(build_app(variant), "GET", "/ping", requests=requests)
+
+    baseline_us = 1e6 / results["none"]
+    print(f"{'variant':<10}{'req/s':>12}{'overhead us/req':>18}")
+    for variant, rate in results.items():
+        print(f"{variant:<10}{rate:>12.0f}{1e6 / rate - baseline_us:>18.1f}")
+    print(f"speedup: {results['after'] / results['before']:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.organization import dao as org_dao
+from app.organization.dao import OrganizationDAO, ProvisionedDatabase
+from app.organization.schemas import OrgCreate
+from app.organization.services import OrganizationService
+
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeOrgDAO:
+    """Organizations live in a dict; names in ``conflicting`` violate a constraint on insert.
+
+    Names in ``reused`` already have a database, which provisioning reuses instead of creating.
+    """
+
+    def __init__(self, existing=(), conflicting=(), broken=False, reused=()):
+        self.session = FakeSession()
+        self.rows = {name.lower(): SimpleNamespace(id=i) for i, name in enumerate(existing)}
+        self.conflicting = set(conflicting)
+        self.broken = broken
+        self.reused = set(reused)
+        self.provisioned = []
+        self.discarded = []
+        self.batches = []
+
+    async def existing_names(self, names):
+        return {name.lower() for name in names if name.lower() in self.rows}
+
+    async def exists_by_name(self, name):
+        return name.lower() in self.rows
+
+    async def prepare_organization(self, org_data):
+        name = org_data.organization_name
+        self.provisioned.append(name)
+        db_url = f"postgresql+asyncpg://u:p@db/{name.lower()}"
+        database = ProvisionedDatabase(db_url, None, created=name not in self.reused)
+        return {"name": name, "db_url": db_url, "admin_email": org_data.email}, database
+
+    async def insert_organizations(self, rows):
+        self.batches.append([row["name"] for row in rows])
+        if self.broken:
+            raise ConnectionResetError("connection lost")
+        if any(row["name"] in self.conflicting for row in rows):
+            raise IntegrityError("INSERT INTO organizations", {}, Exception("duplicate key"))
+        orgs = []
+        for row in rows:
+            org = SimpleNamespace(
+                id=len(self.rows) + 1, name=row["name"], db_url=row["db_url"], admin_email=row["admin_email"]
+            )
+            self.rows[row["name"].lower()] = org
+            orgs.append(org)
+        return orgs
+
+    async def discard_database(self, database):
+        self.discarded.append(database.db_url.rsplit("/", 1)[-1])
+
+
+class FakeJobDAO:
+    def __init__(self, active=()):
+        self.active = {name.lower() for name in active}
+
+    async def active_names(self, names):
+        return {name.lower() for name in names if name.lower() in self.active}
+
+
+def service(dao: FakeOrgDAO, jobs: FakeJobDAO = None) -> OrganizationService:
+    svc = OrganizationService.__new__(OrganizationService)
+    svc.dao = dao
+    svc.jobs = jobs or FakeJobDAO()
+    return svc
+
+
+def item(name: str):
+    return {"organization_name": name, "email": f"admin@{name.lower()}.com", "password": "secret-password"}
+
+
+def outcome(response):
+    return [(result.index, result.status, result.error) for result in response.results]
+
+
+def test_creates_all_valid_items_in_batches(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_INSERT_BATCH_SIZE", 2)
+    dao = FakeOrgDAO()
+
+    response = asyncio.run(service(dao).bulk_create_organizations([item(f"org{i}") for i in range(5)]))
+    assert response.created == 5 and response.failed == 0
+    assert dao.batches == [["org0", "org1"], ["org2", "org3"], ["org4"]]
+    assert [result.organization.organization_name for result in response.results] == [f"org{i}" for i in range(5)]
+
+
+def test_reports_invalid_duplicate_and_taken_names_per_item():
+    dao = FakeOrgDAO(existing=["Taken"])
+    jobs = FakeJobDAO(active=["pending"])
+    items = [item("acme"), {"organization_name": "x"}, item("ACME"), item("taken"), item("pending"), item("globex")]
+
+    response = asyncio.run(service(dao, jobs).bulk_create_organizations(items))
+    statuses = outcome(response)
+    assert [(index, status) for index, status, _ in statuses] == [
+        (0, "created"),
+        (1, "failed"),
+        (2, "failed"),
+        (3, "failed"),
+        (4, "failed"),
+        (5, "created"),
+    ]
+    assert statuses[2][2] == "Duplicate organization name in request"
+    assert statuses[3][2] == statuses[4][2] == "Organization already exists"
+    # Only the two new organizations got a database
+    assert dao.provisioned == ["acme", "globex"]
+
+
+def test_failed_batch_falls_back_to_rows_and_drops_rejected_databases():
+    dao = FakeOrgDAO(conflicting=["bad"])
+
+    response = asyncio.run(service(dao).bulk_create_organizations([item("good"), item("bad"), item("fine")]))
+    assert [(index, status) for index, status, _ in outcome(response)] == [
+        (0, "created"),
+        (1, "failed"),
+        (2, "created"),
+    ]
+    assert response.results[1].error == "Failed to create organization: IntegrityError"
+    assert dao.batches == [["good", "bad", "fine"], ["good"], ["bad"], ["fine"]]
+    assert dao.discarded == ["bad"]
+    assert dao.session.rollbacks == 2
+
+
+def test_database_owned_by_a_concurrent_winner_is_kept():
+    dao = FakeOrgDAO(conflicting=["race"])
+    original = dao.insert_organizations
+
+    async def insert_organizations(rows):
+        # Another request created "race" between our name check and our insert
+        dao.rows["race"] = SimpleNamespace(id=99)
+        return await original(rows)
+
+    dao.insert_organizations = insert_organizations
+    response = asyncio.run(service(dao).bulk_create_organizations([item("race")]))
+    assert response.failed == 1
+    assert dao.discarded == []
+
+
+def test_unexpected_insert_error_drops_the_chunk_databases_and_raises():
+    dao = FakeOrgDAO(broken=True)
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(service(dao).bulk_create_organizations([item("one"), item("two")]))
+    assert dao.discarded == ["one", "two"]
+
+
+def test_reused_database_is_not_dropped():
+    dao = FakeOrgDAO(conflicting=["bad", "old"], reused=["old"])
+
+    response = asyncio.run(service(dao).bulk_create_organizations([item("bad"), item("old")]))
+    assert response.failed == 2
+    # "old" was already there before the request, so only the database created for "bad" goes
+    assert dao.discarded == ["bad"]
+
+
+def test_password_is_hashed_before_the_database_is_created(monkeypatch):
+    provisioned = []
+
+    async def hash_password(password):
+        raise HTTPException(status_code=503, detail="Password hashing is overloaded")
+
+    async def provision_database(org_data):
+        provisioned.append(org_data.organization_name)
+
+    monkeypatch.setattr(org_dao, "get_password_hash_async", hash_password)
+    dao = OrganizationDAO(None)
+    dao.provision_database = provision_database
+    org_data = OrgCreate(organization_name="Acme", email="admin@acme.com", password="secret-password")
+
+    with pytest.raises(HTTPException):
+        asyncio.run(dao.prepare_organization(org_data))
+    assert provisioned == []
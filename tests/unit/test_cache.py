@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+from app.core.cache import AsyncLoadingCache, TTLCache
+
+
+def test_ttl_cache_lru_and_expiry() -> None:
+    """Test LRU eviction and per-entry expiry."""
+    cache: TTLCache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    cache.set("d", 4, expires_at=time.monotonic() - 1)
+    assert cache.get("d", "missing") == "missing"
+    assert cache.expirations == 1
+
+
+def test_concurrent_misses_are_coalesced() -> None:
+    """Test that concurrent misses for one key run a single load and cache negative results."""
+    cache: AsyncLoadingCache = AsyncLoadingCache("test_coalesced", max_size=10, ttl=60, negative_ttl=60)
+    calls = 0
+
+    async def loader() -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return None
+
+    async def scenario() -> None:
+        results = await asyncio.gather(*(cache.get_or_load("missing", loader) for _ in range(5)))
+        assert results == [None] * 5
+        assert await cache.get_or_load("missing", loader) is None
+
+    asyncio.run(scenario())
+    assert calls == 1
+    assert cache.coalesced == 4
+
+
+def test_invalidate_discards_inflight_load() -> None:
+    """Test that a load racing with an invalidation does not repopulate the cache."""
+    cache: AsyncLoadingCache = AsyncLoadingCache("test_invalidate", max_size=10, ttl=60, negative_ttl=60)
+
+    async def scenario() -> None:
+        async def stale_loader() -> str:
+            await asyncio.sleep(0.01)
+            return "stale"
+
+        load = asyncio.ensure_future(cache.get_or_load("org", stale_loader))
+        await asyncio.sleep(0)
+        cache.invalidate("org")
+        assert await load == "stale"
+
+        async def fresh_loader() -> str:
+            return "fresh"
+
+        assert await cache.get_or_load("org", fresh_loader) == "fresh"
+
+    asyncio.run(scenario())
@@ -0,0 +1,57 @@
+import asyncio
+import re
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql
+
+from app.database.dao import BaseDAO
+from app.organization.models import Organization
+
+
+class OrgUpdate(BaseModel):
+    name: Optional[str] = None
+    admin_email: Optional[str] = None
+
+
+class RecordingSession:
+    """Pretends every submitted ID except 404 exists."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        ids = [int(id) for id in re.findall(r"\((\d+), ", sql)]
+        rows = [(id,) for id in ids if id != 404]
+        return type("Result", (), {"all": lambda self: rows})()
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_update_many_counts_updated_rows_not_submitted_ones():
+    session = RecordingSession()
+    dao = BaseDAO(Organization, session)
+    updates = {
+        1: OrgUpdate(name="acme"),
+        2: OrgUpdate(name="globex"),
+        3: OrgUpdate(name="initech", admin_email="admin@initech.com"),
+        4: OrgUpdate(),
+        404: OrgUpdate(name="missing"),
+    }
+
+    assert asyncio.run(dao.update_many(updates)) == 3
+    # One statement per distinct set of columns; the empty update is skipped
+    assert len(session.statements) == 2 and session.commits == 1
+    sql = " ".join(str(session.statements[0].compile(dialect=postgresql.dialect())).split())
+    assert sql.startswith("UPDATE organizations SET name=source.name FROM (VALUES")
+    assert sql.endswith("WHERE organizations.id = source.id RETURNING organizations.id")
+
+
+def test_update_many_without_changes_runs_nothing():
+    session = RecordingSession()
+    assert asyncio.run(BaseDAO(Organization, session).update_many({1: OrgUpdate()})) == 0
+    assert session.statements == [] and session.commits == 0
@@ -0,0 +1,44 @@
+import json
+import logging
+import queue
+
+from app.core.logging import AccessLog, JSONFormatter, NonBlockingQueueHandler
+
+
+def make_record(msg: str, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    line = json.loads(JSONFormatter().format(make_record("request_processed", path="/health", status_code=200)))
+    assert line["message"] == "request_processed"
+    assert line["path"] == "/health"
+    assert line["status_code"] == 200
+    assert "args" not in line and "msecs" not in line
+
+
+def test_queue_handler_drops_records_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(make_record("first"))
+    handler.handle(make_record("second"))
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_access_log_samples_but_keeps_errors_and_summarizes(caplog):
+    access_log = AccessLog(sample_rate=0.0, slow_threshold=1.0, summary_interval=0)
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        for _ in range(10):
+            access_log.record("GET", "/health", 200, 0.01)
+        access_log.record("GET", "/api/v1/organizations", 503, 0.01)
+        access_log.record("GET", "/api/v1/organizations", 200, 2.0)
+        access_log.summarize()
+
+    assert [r.message for r in caplog.records] == ["request_processed", "request_processed", "access_summary"]
+    summary = caplog.records[-1]
+    assert summary.requests == 12
+    assert summary.sampled_out == 10
+    assert summary.status == {"2xx": 11, "5xx": 1}
+    assert access_log.requests == 0
@@ -0,0 +1,42 @@
+import os
+
+from app.core.metrics import Metric, MultiprocessStore, RequestMetrics, render
+
+
+def test_request_metrics_render_cumulative_histogram():
+    request_metrics = RequestMetrics(buckets=(0.1, 1.0))
+    request_metrics.observe("GET", "/api/v1/organizations/{org_id}", 200, 0.05)
+    request_metrics.observe("GET", "/api/v1/organizations/{org_id}", 200, 0.5)
+    request_metrics.observe("GET", "/api/v1/organizations/{org_id}", 404, 3.0)
+
+    text = render(request_metrics.collect())
+    labels = 'method="GET",route="/api/v1/organizations/{org_id}"'
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert f'http_request_duration_seconds_bucket{{le="0.1",{labels}}} 1' in text
+    assert f'http_request_duration_seconds_bucket{{le="1",{labels}}} 2' in text
+    assert f'http_request_duration_seconds_bucket{{le="+Inf",{labels}}} 3' in text
+    assert f"http_request_duration_seconds_count{{{labels}}} 3" in text
+    assert f'http_requests_total{{{labels},status="404"}} 1' in text
+    assert "http_requests_in_flight 0" in text
+
+
+def test_multiprocess_store_sums_workers_and_drops_dead_gauges(tmp_path, monkeypatch):
+    store = MultiprocessStore(str(tmp_path), flush_interval=1.0)
+
+    def worker_metrics(requests: float, in_flight: float):
+        counter = Metric("http_requests_total", "counter", "Requests.")
+        counter.add(requests, route="/health")
+        gauge = Metric("http_requests_in_flight", "gauge", "In flight.")
+        gauge.add(in_flight)
+        return [counter, gauge]
+
+    monkeypatch.setattr("app.core.metrics.collect", lambda: worker_metrics(3, 1))
+    store.flush()
+    # A second worker that has since exited
+    (tmp_path / f"{os.getpid()}.json").rename(tmp_path / "999999999.json")
+    monkeypatch.setattr("app.core.metrics.collect", lambda: worker_metrics(2, 4))
+    store.flush()
+
+    text = render(store.read())
+    assert 'http_requests_total{route="/health"} 5' in text
+    assert "http_requests_in_flight 4" in text
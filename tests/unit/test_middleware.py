@@ -0,0 +1,95 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import OperationalError
+
+from app.core.metrics import request_metrics
+from app.core.middleware import ErrorHandlerMiddleware
+
+
+def build_app(events: List[str]) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ErrorHandlerMiddleware)
+
+    @app.get("/db-error/{org_id}")
+    async def db_error(org_id: int) -> Dict:
+        raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+    @app.get("/boom")
+    async def boom() -> Dict:
+        raise RuntimeError("boom")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for i in range(2):
+                events.append(f"yield {i}")
+                yield f"chunk {i}".encode()
+
+        return StreamingResponse(chunks())
+
+    return app
+
+
+async def call(app: FastAPI, path: str, events: List[str]) -> Dict[str, Any]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    response: Dict[str, Any] = {"body": b""}
+    received = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal received
+        if received:
+            # The client never disconnects
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message.get("body"):
+            events.append("sent")
+            response["body"] += message["body"]
+
+    await app(scope, receive, send)
+    return response
+
+
+def test_errors_keep_json_contract_and_are_counted():
+    events: List[str] = []
+    app = build_app(events)
+
+    async def run():
+        db = await call(app, "/db-error/7", events)
+        assert db["status"] == 500
+        assert json.loads(db["body"]) == {"detail": "Database error occurred"}
+
+        unhandled = await call(app, "/boom", events)
+        assert unhandled["status"] == 500
+        assert json.loads(unhandled["body"]) == {"detail": "Internal server error"}
+
+    asyncio.run(run())
+    assert request_metrics.requests[("GET", "/db-error/{org_id}", "500")] >= 1
+    assert request_metrics.in_flight == 0
+
+
+def test_streaming_responses_are_not_buffered():
+    events: List[str] = []
+    asyncio.run(call(build_app(events), "/stream", events))
+    assert events[:3] == ["yield 0", "sent", "yield 1"]
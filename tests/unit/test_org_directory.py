@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from app.organization.cache import org_by_name, org_login_by_email
+from app.organization.directory import OrganizationDirectory
+
+
+class FakeConn:
+    """Answers the directory's two queries from an in-memory ``organizations`` table."""
+
+    def __init__(self, rows):
+        self.rows = {row["id"]: row for row in rows}
+        self.queries = []
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        if args:
+            return [self.rows[org_id] for org_id in sorted(args[0]) if org_id in self.rows]
+        return [self.rows[org_id] for org_id in sorted(self.rows)]
+
+
+def org(id, name, email):
+    return {
+        "id": id,
+        "name": name,
+        "db_url": f"postgresql+asyncpg://u:p@db/{name.lower()}",
+        "admin_email": email,
+        "admin_password": "hash",
+        "cluster_id": None,
+        "schema_name": None,
+    }
+
+
+@pytest.fixture
+def directory():
+    org_by_name.clear()
+    org_login_by_email.clear()
+    yield OrganizationDirectory("postgresql://unused", snapshot=True, keepalive=30)
+    org_by_name.clear()
+    org_login_by_email.clear()
+
+
+def loaded(directory, conn):
+    asyncio.run(directory._resync(conn))
+    return directory
+
+
+def test_rename_and_email_change_evict_the_old_keys(directory):
+    conn = FakeConn([org(1, "Acme", "admin@acme.com"), org(2, "Globex", "admin@globex.com")])
+    loaded(directory, conn)
+    org_by_name.set("acme", "stale")
+    org_login_by_email.set("admin@acme.com", "stale")
+
+    conn.rows[1] = org(1, "AcmeCorp", "root@acme.com")
+    event = {"op": "UPDATE", "id": 1, "old_name": "Acme", "old_admin_email": "admin@acme.com"}
+    asyncio.run(directory._apply(conn, [event]))
+
+    assert directory.get_by_name("acme") is None and directory.get_by_admin_email("admin@acme.com") is None
+    assert directory.get_by_name("ACMECORP").admin_email == "root@acme.com"
+    assert directory.get_by_admin_email("root@acme.com").id == 1
+    assert directory.get_by_name("globex").id == 2
+    assert org_by_name.peek("acme") != "stale" and org_login_by_email.peek("admin@acme.com") != "stale"
+
+
+def test_burst_of_inserts_is_loaded_with_one_query(directory):
+    conn = FakeConn([])
+    loaded(directory, conn)
+    conn.rows.update({i: org(i, f"org{i}", f"admin@org{i}.com") for i in range(1, 4)})
+
+    asyncio.run(directory._apply(conn, [{"op": "INSERT", "id": i} for i in range(1, 4)]))
+    assert len(directory) == 3 and directory.changes == 3
+    assert len(conn.queries) == 2
+
+
+def test_delete_removes_the_organization(directory):
+    conn = FakeConn([org(1, "Acme", "admin@acme.com")])
+    loaded(directory, conn)
+    org_by_name.set("acme", "stale")
+
+    del conn.rows[1]
+    event = {"op": "DELETE", "id": 1, "old_name": "Acme", "old_admin_email": "admin@acme.com"}
+    asyncio.run(directory._apply(conn, [event]))
+
+    assert len(directory) == 0 and directory.get_by_name("acme") is None
+    assert directory.get_by_admin_email("admin@acme.com") is None
+    assert org_by_name.peek("acme") != "stale"
+
+
+def test_truncate_resyncs_from_a_full_reload(directory):
+    conn = FakeConn([org(1, "Acme", "admin@acme.com"), org(2, "Globex", "admin@globex.com")])
+    loaded(directory, conn)
+    org_by_name.set("initech", None)
+
+    conn.rows = {3: org(3, "Initech", "admin@initech.com")}
+    asyncio.run(directory._apply(conn, [{"op": "INSERT", "id": 3}, {"op": "TRUNCATE"}]))
+
+    assert directory.resyncs == 2 and len(directory) == 1
+    assert directory.get_by_name("acme") is None and directory.get_by_name("initech").id == 3
+    # Negative entries cached before the truncate are gone too
+    assert len(org_by_name._cache) == 0
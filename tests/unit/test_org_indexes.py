@@ -0,0 +1,46 @@
+import importlib.util
+import io
+from pathlib import Path
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from app.organization.models import Organization
+
+MIGRATION = (
+    Path(__file__).resolve().parents[2]
+    / "alembic"
+    / "versions"
+    / "2026_10_18_1000-8d2e4b6a1c37_added_org_lookup_indexes.py"
+)
+
+
+def migration_sql() -> str:
+    spec = importlib.util.spec_from_file_location("org_lookup_indexes", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    buffer = io.StringIO()
+    context = MigrationContext.configure(dialect_name="postgresql", opts={"as_sql": True, "output_buffer": buffer})
+    with Operations.context(context):
+        module.upgrade()
+    return buffer.getvalue()
+
+
+def model_index_ddl(name: str) -> str:
+    [index] = [index for index in Organization.__table__.indexes if index.name == name]
+    return str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+
+
+def test_lookup_index_migration_matches_the_model():
+    sql = migration_sql()
+    for name in ("ix_organizations_name_lower", "ix_organizations_admin_email"):
+        expected = model_index_ddl(name)
+        # The migration builds the same index, just without locking the table
+        assert expected.replace("INDEX", "INDEX CONCURRENTLY", 1) in sql
+
+    assert model_index_ddl("ix_organizations_name_lower") == (
+        "CREATE UNIQUE INDEX ix_organizations_name_lower ON organizations (lower(name) text_pattern_ops)"
+    )
@@ -0,0 +1,77 @@
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.organization.dao import OrganizationDAO
+from app.organization.services import OrganizationService
+
+
+class RecordingSession:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+        self.connection_options = None
+
+    async def execute(self, stmt, bind_arguments=None):
+        self.statements.append(stmt)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.rows))
+
+    async def connection(self, bind_arguments=None, execution_options=None):
+        self.connection_options = execution_options
+
+    async def stream_scalars(self, stmt, bind_arguments=None):
+        self.statements.append(stmt)
+
+        async def rows():
+            for row in self.rows:
+                yield row
+
+        return rows()
+
+
+def compiled(stmt) -> str:
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return " ".join(str(sql).split())
+
+
+def test_page_starts_after_the_cursor_in_id_order():
+    session = RecordingSession()
+    asyncio.run(OrganizationDAO(session).list_organizations(after_id=41, limit=25, name_prefix="Ac_me"))
+
+    stmt = session.statements[0]
+    sql = compiled(stmt)
+    assert "WHERE lower(organizations.name) LIKE" in sql and "AND organizations.id > 41" in sql
+    assert sql.endswith("ORDER BY organizations.id LIMIT 25")
+    # The user's underscore is escaped, not a wildcard
+    assert "ac\\_me%" in stmt.compile(dialect=postgresql.dialect()).params.values()
+
+
+def test_first_page_has_no_cursor():
+    session = RecordingSession()
+    asyncio.run(OrganizationDAO(session).list_organizations(limit=10))
+
+    sql = compiled(session.statements[0])
+    assert "WHERE" not in sql and sql.endswith("ORDER BY organizations.id LIMIT 10")
+
+
+def test_next_cursor_is_the_last_id_of_a_full_page():
+    orgs = [SimpleNamespace(id=i, name=f"org{i}", db_url="url", admin_email=f"a{i}@x.com") for i in (3, 7)]
+    service = OrganizationService.__new__(OrganizationService)
+    service.dao = OrganizationDAO(RecordingSession(orgs))
+
+    assert asyncio.run(service.list_organizations(limit=2)).next_after_id == 7
+    assert asyncio.run(service.list_organizations(limit=3)).next_after_id is None
+
+
+def test_stream_reads_in_id_order_from_one_snapshot():
+    session = RecordingSession(["a", "b"])
+
+    async def run():
+        return [org async for org in OrganizationDAO(session).stream_organizations("acme")]
+
+    assert asyncio.run(run()) == ["a", "b"]
+    stmt = session.statements[0]
+    assert compiled(stmt).endswith("ORDER BY organizations.id")
+    assert stmt.get_execution_options()["yield_per"] == 1000
+    assert session.connection_options == {"isolation_level": "REPEATABLE READ"}
@@ -0,0 +1,155 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.cluster import placement
+from app.cluster.placement import (
+    ClusterLoad,
+    LeastBytesPolicy,
+    LeastTenantsPolicy,
+    PlacementPolicy,
+    PlacementScheduler,
+    WeightedPolicy,
+)
+from app.organization import dao as org_dao
+from app.organization.dao import OrganizationDAO
+from app.organization.schemas import OrgCreate
+
+
+def load(id, tenants, bytes=0, weight=1):
+    return ClusterLoad(SimpleNamespace(id=id, weight=weight), tenants, bytes)
+
+
+def cluster(id, is_active=True, max_tenants=None):
+    return SimpleNamespace(id=id, name=f"cluster{id}", is_active=is_active, max_tenants=max_tenants, weight=1)
+
+
+def test_placement_policies():
+    loads = [load(1, tenants=10, bytes=100, weight=4), load(2, tenants=4, bytes=500), load(3, tenants=4, bytes=300)]
+
+    assert LeastTenantsPolicy().choose(loads).cluster.id == 2
+    assert LeastBytesPolicy().choose(loads).cluster.id == 1
+    # 10 / 4 is the lightest load relative to capacity
+    assert WeightedPolicy().choose(loads).cluster.id == 1
+
+
+def test_policy_must_implement_choose():
+    with pytest.raises(TypeError):
+        PlacementPolicy()
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeEngines:
+    def __len__(self):
+        return 0
+
+    async def server(self, cluster):
+        return SimpleNamespace(engine=None, host=cluster.name, port=5432)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Registered clusters and tenant counts, counting the queries run against them."""
+    state = SimpleNamespace(clusters=[], tenants={}, queries=0)
+
+    class FakeClusterDAO:
+        def __init__(self, session):
+            pass
+
+        async def list_clusters(self):
+            state.queries += 1
+            return list(state.clusters)
+
+        async def tenant_counts(self):
+            state.queries += 1
+            return dict(state.tenants)
+
+    monkeypatch.setattr(placement, "async_session", FakeSession)
+    monkeypatch.setattr(placement, "ClusterDAO", FakeClusterDAO)
+    return state
+
+
+def scheduler() -> PlacementScheduler:
+    return PlacementScheduler(LeastTenantsPolicy(), FakeEngines(), load_ttl=60)
+
+
+def test_without_clusters_placements_stay_on_the_master_without_queries(registry):
+    placer = scheduler()
+
+    async def run():
+        return [await placer.place() for _ in range(5)]
+
+    placements = asyncio.run(run())
+    assert {p.cluster_id for p in placements} == {None}
+    # The cluster list is loaded once per TTL, not once per placement
+    assert registry.queries == 1
+    assert placer.placements == {None: 5}
+
+
+def test_burst_spreads_across_clusters_and_respects_capacity(registry):
+    registry.clusters = [cluster(1, max_tenants=3), cluster(2), cluster(3, is_active=False)]
+    registry.tenants = {1: 2, 2: 3}
+    placer = scheduler()
+
+    async def run():
+        return [(await placer.place()).cluster_id for _ in range(4)]
+
+    # Cluster 1 has room for one more; after that everything goes to cluster 2
+    assert asyncio.run(run()) == [1, 2, 2, 2]
+    assert registry.queries == 2
+
+
+def test_full_registry_refuses_placement(registry):
+    registry.clusters = [cluster(1, max_tenants=1)]
+    registry.tenants = {1: 1}
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scheduler().place())
+    assert error.value.status_code == 503
+
+
+def test_invalidate_reloads_the_registry(registry):
+    placer = scheduler()
+    assert asyncio.run(placer.place()).cluster_id is None
+
+    registry.clusters = [cluster(7)]
+    placer.invalidate()
+    assert asyncio.run(placer.place()).cluster_id == 7
+
+
+def test_provisioned_organization_records_its_cluster(registry, monkeypatch):
+    registry.clusters = [cluster(4)]
+    monkeypatch.setattr(org_dao, "placement_scheduler", scheduler())
+    created = []
+
+    async def create_database(db_name, user, password, server):
+        created.append((db_name, server.host))
+        return f"postgresql+asyncpg://{user}:{password}@{server.host}:5432/{db_name}", True
+
+    async def hash_password(password):
+        return "hash"
+
+    monkeypatch.setattr(org_dao, "create_database", create_database)
+    monkeypatch.setattr(org_dao, "get_password_hash_async", hash_password)
+    dao = OrganizationDAO(None)
+    inserted = []
+
+    async def insert(values):
+        inserted.append(values)
+        return SimpleNamespace(**values)
+
+    dao.insert = insert
+    org_data = OrgCreate(organization_name="Acme", email="admin@acme.com", password="secret-password")
+
+    asyncio.run(dao.create_organization(org_data))
+    assert created == [("acme", "cluster4")]
+    assert inserted[0]["cluster_id"] == 4 and inserted[0]["db_url"].endswith("@cluster4:5432/acme")
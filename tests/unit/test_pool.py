@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.util import greenlet_spawn
+
+from app.database.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedNullPool,
+    pool_stats,
+)
+
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_queue_pool_reports_saturation_and_timeouts():
+    pool = InstrumentedAsyncQueuePool(FakeConnection, pool_size=1, max_overflow=0, timeout=0.05)
+
+    async def run():
+        first = await greenlet_spawn(pool.connect)
+        with pytest.raises(exc.TimeoutError):
+            await greenlet_spawn(pool.connect)
+
+        stats = pool_stats(pool)
+        assert stats["in_use"] == 1
+        assert stats["saturation"] == 1.0
+        assert stats["checkouts"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["max_wait_seconds"] >= 0.05
+
+        await greenlet_spawn(first.close)
+        assert pool_stats(pool)["in_use"] == 0
+
+    asyncio.run(run())
+    assert pool.recreate().metrics is pool.metrics
+
+
+def test_engines_accept_instrumented_pools():
+    for poolclass in (InstrumentedAsyncQueuePool, InstrumentedNullPool):
+        engine = create_async_engine("postgresql+asyncpg://user:pw@localhost/db", poolclass=poolclass)
+        assert pool_stats(engine.pool)["pool"] == poolclass.__name__
+        asyncio.run(engine.dispose())
@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import dependencies
+from app.auth.principals import Principal, PrincipalStore
+from app.auth.schemas import TokenData
+from app.core.cache import _MISSING
+
+
+def test_get_super_admin_enforces_active_and_token_version(monkeypatch):
+    store = PrincipalStore(max_size=10, ttl=30, refresh_interval=10)
+    loads = []
+
+    async def load(email):
+        loads.append(email)
+        return Principal(email, True, 2)
+
+    monkeypatch.setattr(store, "_load", load)
+    monkeypatch.setattr(dependencies, "principal_store", store)
+    user = TokenData(email="root@example.com", is_super_admin=True, token_version=2)
+
+    async def run():
+        assert await dependencies.get_super_admin(user) is user
+        assert await dependencies.get_super_admin(user) is user
+        assert loads == ["root@example.com"]
+
+        with pytest.raises(HTTPException) as exc:
+            await dependencies.get_super_admin(TokenData(email=user.email, is_super_admin=True, token_version=1))
+        assert exc.value.status_code == 401
+
+        store._cache.set(user.email, Principal(user.email, False, 2))
+        with pytest.raises(HTTPException):
+            await dependencies.get_super_admin(user)
+
+        store.evict(user.email)
+        assert await dependencies.get_super_admin(user) is user
+        assert len(loads) == 2
+
+    asyncio.run(run())
+
+
+def test_refresh_skips_entries_evicted_while_loading(monkeypatch):
+    store = PrincipalStore(max_size=10, ttl=30, refresh_interval=10)
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    class FakeDAO:
+        def __init__(self, session):
+            pass
+
+        async def get_principals(self):
+            # Deactivation lands after the rows were read
+            store.evict("a@example.com")
+            return [
+                SimpleNamespace(email="a@example.com", is_active=True, token_version=0),
+                SimpleNamespace(email="b@example.com", is_active=True, token_version=0),
+            ]
+
+    monkeypatch.setattr("app.auth.principals.async_session", FakeSession)
+    monkeypatch.setattr("app.auth.principals.SuperAdminDAO", FakeDAO)
+
+    asyncio.run(store.refresh())
+    assert store._cache.peek("b@example.com") == Principal("b@example.com", True, 0)
+    assert store._cache.peek("a@example.com") is _MISSING
+    assert store.refreshes == 1
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import Dict
+
+import pytest
+from fastapi import FastAPI
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.profiling.profiler import (
+    ProfilingMiddleware,
+    Sampler,
+    sign_profile_token,
+    verify_profile_token,
+)
+from app.profiling.store import ProfileStore
+
+
+def test_profile_tokens_are_signed_and_expire():
+    token = sign_profile_token(int(time.time()) + 60)
+    assert verify_profile_token(token)
+    assert not verify_profile_token(token[:-1] + ("0" if token[-1] != "0" else "1"))
+    assert not verify_profile_token(sign_profile_token(int(time.time()) - 1))
+    assert not verify_profile_token("garbage")
+
+
+def test_store_keeps_newest_profiles_and_rejects_other_names(tmp_path):
+    store = ProfileStore(str(tmp_path), max_files=2)
+    for route in ("/a", "/b", "/c"):
+        store.save("GET", route, 0.01, "collapsed", b"main 1\n")
+        time.sleep(0.002)
+
+    names = [profile.name for profile in store.list()]
+    assert len(names) == 2 and "-GET-c-" in names[0] and "-GET-b-" in names[1]
+    assert store.path(names[0]) is not None
+    assert store.path("../app.log") is None
+
+
+def build_app(store: ProfileStore) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, sample_rate=0.0, sampler=Sampler(0.001), store=store, format="collapsed")
+
+    @app.get("/slow")
+    async def slow_endpoint() -> Dict:
+        await asyncio.sleep(0.05)
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return {}
+
+    return app
+
+
+async def call(app: FastAPI, headers) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/slow",
+        "raw_path": b"/slow",
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+def test_only_requests_with_a_valid_token_are_profiled(tmp_path):
+    store = ProfileStore(str(tmp_path), max_files=10)
+    app = build_app(store)
+
+    asyncio.run(call(app, []))
+    asyncio.run(call(app, [(b"x-profile-token", b"1.bad")]))
+    assert store.list() == []
+
+    token = sign_profile_token(int(time.time()) + 60).encode()
+    asyncio.run(call(app, [(b"x-profile-token", token)]))
+    [profile] = store.list()
+    assert profile.name.split("-")[1:3] == ["GET", "slow"]
+
+    collapsed = store.path(profile.name).read_text()
+    # Both the time spent awaiting the sleep and the time spent running the busy loop show up
+    assert any("slow_endpoint" in line and "(waiting)" in line for line in collapsed.splitlines())
+    assert any("slow_endpoint" in line and "(waiting)" not in line for line in collapsed.splitlines())
+
+
+@pytest.mark.parametrize("field, value", [("PROFILING_FORMAT", "svg"), ("TRACING_EXPORTER", "otlp")])
+def test_unknown_profile_format_or_trace_exporter_is_rejected_at_startup(field, value):
+    with pytest.raises(ValidationError):
+        Settings(**{field: value})
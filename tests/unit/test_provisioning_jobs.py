@@ -0,0 +1,232 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.organization import jobs
+from app.organization.dao import ProvisionedDatabase, ProvisioningJobDAO
+from app.organization.models import JobStatus
+from app.organization.schemas import OrgCreate
+
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeJobDAO:
+    transitions = []
+    stale_after = []
+    # IDs that are no longer pending, e.g. reaped while queued
+    unclaimable = set()
+
+    def __init__(self, session):
+        self.session = session
+
+    async def claim(self, job_id):
+        if job_id in self.unclaimable:
+            return False
+        self.transitions.append((job_id, JobStatus.RUNNING, {"step": "create_database"}))
+        return True
+
+    async def set_status(self, job_id, status, **fields):
+        self.transitions.append((job_id, status, fields))
+
+    async def fail_stale(self, running_for, pending_for):
+        self.stale_after.append((running_for, pending_for))
+        return 2
+
+
+class FakeOrgDAO:
+    fail_with = None
+    delay = 0.0
+    # Where the job fails: "provision" or "create"
+    fail_at = "provision"
+    reused = False
+    discarded = []
+
+    def __init__(self, session):
+        self.session = session
+
+    async def provision_database(self, org_data):
+        if self.fail_at == "provision":
+            await asyncio.sleep(self.delay)
+            if self.fail_with is not None:
+                raise self.fail_with
+        return ProvisionedDatabase(
+            f"postgresql+asyncpg://u:p@db/{org_data.organization_name}", None, created=not self.reused
+        )
+
+    async def create_organization(self, org_data, database):
+        if self.fail_at == "create":
+            await asyncio.sleep(self.delay)
+            if self.fail_with is not None:
+                raise self.fail_with
+        return SimpleNamespace(id=42, name=org_data.organization_name, db_url=database.db_url)
+
+    async def exists_by_name(self, name):
+        return False
+
+    async def discard_database(self, database):
+        self.discarded.append(database.db_url)
+
+
+def org_data(name="acme") -> OrgCreate:
+    return OrgCreate(organization_name=name, email=f"admin@{name}.com", password="secret-password")
+
+
+def setup(monkeypatch, fail_with=None, delay=0.0, fail_at="provision", reused=False):
+    FakeJobDAO.transitions = []
+    FakeJobDAO.stale_after = []
+    FakeJobDAO.unclaimable = set()
+    FakeOrgDAO.discarded = []
+    monkeypatch.setattr(FakeOrgDAO, "fail_with", fail_with)
+    monkeypatch.setattr(FakeOrgDAO, "delay", delay)
+    monkeypatch.setattr(FakeOrgDAO, "fail_at", fail_at)
+    monkeypatch.setattr(FakeOrgDAO, "reused", reused)
+    monkeypatch.setattr(jobs, "ProvisioningJobDAO", FakeJobDAO)
+    monkeypatch.setattr(jobs, "OrganizationDAO", FakeOrgDAO)
+    monkeypatch.setattr(jobs, "async_session", FakeSession)
+
+
+def statuses():
+    return [(status, fields.get("step")) for _, status, fields in FakeJobDAO.transitions]
+
+
+def test_worker_moves_job_through_running_to_succeeded(monkeypatch):
+    setup(monkeypatch)
+    queue = jobs.ProvisioningQueue(workers=1, max_size=10, job_timeout=5)
+
+    async def run():
+        queue.start()
+        assert queue.submit(7, org_data())
+        await queue._queue.join()
+        await queue.stop()
+
+    asyncio.run(run())
+    assert statuses() == [
+        (JobStatus.RUNNING, "create_database"),
+        (JobStatus.RUNNING, "create_organization"),
+        (JobStatus.SUCCEEDED, None),
+    ]
+    assert FakeJobDAO.transitions[-1] == (7, JobStatus.SUCCEEDED, {"step": None, "organization_id": 42})
+
+
+def test_failed_step_marks_job_failed_and_rolls_back(monkeypatch):
+    setup(monkeypatch, fail_with=RuntimeError("disk full"))
+    queue = jobs.ProvisioningQueue(workers=1, max_size=10, job_timeout=5)
+    session = FakeSession()
+
+    asyncio.run(queue._run(session, 7, org_data()))
+    assert statuses() == [(JobStatus.RUNNING, "create_database"), (JobStatus.FAILED, None)]
+    assert FakeJobDAO.transitions[-1][2] == {"error": "disk full"}
+    assert session.rollbacks == 1
+
+
+def test_job_running_past_timeout_is_failed(monkeypatch):
+    setup(monkeypatch, delay=1.0)
+    queue = jobs.ProvisioningQueue(workers=1, max_size=10, job_timeout=0.05)
+
+    asyncio.run(queue._run(FakeSession(), 7, org_data()))
+    assert FakeJobDAO.transitions[-1] == (7, JobStatus.FAILED, {"error": "Provisioning timed out"})
+
+
+def test_submit_refuses_when_not_running_or_full():
+    queue = jobs.ProvisioningQueue(workers=1, max_size=1, job_timeout=5)
+    assert not queue.submit(1, org_data())
+
+    async def run():
+        # Only the queue, no workers draining it
+        queue._queue = asyncio.Queue(maxsize=1)
+        return queue.submit(1, org_data()), queue.submit(2, org_data("other"))
+
+    assert asyncio.run(run()) == (True, False)
+    assert queue.depth == 1
+
+
+def test_failure_after_provisioning_drops_the_created_database(monkeypatch):
+    setup(monkeypatch, fail_with=RuntimeError("insert failed"), fail_at="create")
+    queue = jobs.ProvisioningQueue(workers=1, max_size=10, job_timeout=5)
+
+    asyncio.run(queue._run(FakeSession(), 7, org_data()))
+    assert FakeJobDAO.transitions[-1] == (7, JobStatus.FAILED, {"error": "insert failed"})
+    assert FakeOrgDAO.discarded == ["postgresql+asyncpg://u:p@db/acme"]
+
+
+def test_timeout_after_provisioning_drops_the_created_database(monkeypatch):
+    setup(monkeypatch, delay=1.0, fail_at="create")
+    queue = jobs.ProvisioningQueue(workers=1, max_size=10, job_timeout=0.05)
+
+    asyncio.run(queue._run(FakeSession(), 7, org_data()))
+    assert FakeJobDAO.transitions[-1] == (7, JobStatus.FAILED, {"error": "Provisioning timed out"})
+    assert FakeOrgDAO.discarded == ["postgresql+asyncpg://u:p@db/acme"]
+
+
+def test_reused_database_is_kept_when_the_job_fails(monkeypatch):
+    setup(monkeypatch, fail_with=RuntimeError("insert failed"), fail_at="create", reused=True)
+    queue = jobs.ProvisioningQueue(workers=1, max_size=10, job_timeout=5)
+
+    asyncio.run(queue._run(FakeSession(), 7, org_data()))
+    assert FakeOrgDAO.discarded == []
+
+
+def test_job_that_is_no_longer_pending_is_skipped(monkeypatch):
+    setup(monkeypatch)
+    FakeJobDAO.unclaimable = {7}
+    queue = jobs.ProvisioningQueue(workers=1, max_size=10, job_timeout=5)
+
+    asyncio.run(queue._run(FakeSession(), 7, org_data()))
+    assert FakeJobDAO.transitions == []
+
+
+def test_reaper_fails_silent_running_jobs_and_pending_jobs_past_a_full_queue(monkeypatch):
+    setup(monkeypatch)
+    queue = jobs.ProvisioningQueue(workers=4, max_size=10, job_timeout=30)
+
+    assert asyncio.run(queue.reap(FakeSession())) == 2
+    # Ten queued jobs over four workers take at most three rounds of the timeout to start
+    assert FakeJobDAO.stale_after == [(timedelta(seconds=60), timedelta(seconds=150))]
+
+
+class RecordingSession:
+    def __init__(self, claimed_id=None):
+        self.claimed_id = claimed_id
+        self.statements = []
+        self.params = []
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.statements.append(" ".join(str(compiled).split()))
+        self.params.append(compiled.params)
+        return SimpleNamespace(rowcount=1, scalar_one_or_none=lambda: self.claimed_id)
+
+    async def commit(self):
+        pass
+
+
+def test_claim_only_moves_pending_jobs():
+    session = RecordingSession(claimed_id=7)
+    assert asyncio.run(ProvisioningJobDAO(session).claim(7))
+    assert "WHERE provisioning_jobs.id = %(id_1)s AND provisioning_jobs.status = %(status_1)s" in session.statements[0]
+    assert session.params[0]["status_1"] == "pending"
+    assert not asyncio.run(ProvisioningJobDAO(RecordingSession()).claim(7))
+
+
+def test_stale_jobs_are_matched_per_status():
+    session = RecordingSession()
+    asyncio.run(ProvisioningJobDAO(session).fail_stale(timedelta(seconds=60), timedelta(hours=1)))
+    assert (
+        "WHERE provisioning_jobs.status = %(status_1)s AND provisioning_jobs.updated_at < %(updated_at_1)s"
+        " OR provisioning_jobs.status = %(status_2)s AND provisioning_jobs.updated_at < %(updated_at_2)s"
+    ) in session.statements[0]
+    assert (session.params[0]["status_1"], session.params[0]["status_2"]) == ("running", "pending")
@@ -0,0 +1,50 @@
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.auth.models import SuperAdmin
+from app.database.replicas import ReplicaSet, RoutingSession
+
+PRIMARY_URL = "postgresql+asyncpg://user:pw@primary/db"
+
+
+def make_replicas(policy="round_robin"):
+    replica_set = ReplicaSet(
+        ["postgresql+asyncpg://user:pw@replica-a/db", "postgresql+asyncpg://user:pw@replica-b/db"],
+        policy=policy,
+        max_lag=1.0,
+        check_interval=1.0,
+    )
+    for replica in replica_set.replicas:
+        replica.lag = 0.0
+    return replica_set
+
+
+def test_choose_skips_lagging_replicas_and_falls_back_to_primary():
+    replica_set = make_replicas()
+    a, b = replica_set.replicas
+    assert {replica_set.choose(), replica_set.choose()} == {a.engine, b.engine}
+
+    a.lag = 5.0
+    assert replica_set.choose() is b.engine
+    b.lag = None
+    assert replica_set.choose() is None
+    assert replica_set.primary_fallbacks == 1
+
+    least_loaded = make_replicas("least_loaded")
+    least_loaded.replicas[0].engine.pool.metrics.in_use = 3
+    assert least_loaded.choose() is least_loaded.replicas[1].engine
+
+
+def test_routing_session_pins_to_primary_after_a_write():
+    primary = create_async_engine(PRIMARY_URL)
+    session = RoutingSession(bind=primary.sync_engine, replica_set=make_replicas())
+    lookup = select(SuperAdmin)
+
+    replica = session.get_bind(clause=lookup, replica=True)
+    assert replica is not primary.sync_engine
+    assert session.get_bind(clause=lookup, replica=True) is replica
+    assert session.get_bind(clause=lookup) is primary.sync_engine
+
+    session.get_bind(clause=text("UPDATE super_admins SET is_active = false"))
+    assert session.get_bind(clause=lookup, replica=True) is primary.sync_engine
+    assert not session.last_read_from_replica
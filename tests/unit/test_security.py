@@ -1,10 +1,18 @@
+import asyncio
 from datetime import datetime, timedelta
 
 import pytest
 from jose import jwt
 
 from app.core.config import settings
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.security import (
+    PasswordHasher,
+    claims_cache,
+    create_access_token,
+    decode_access_token,
+    get_password_hash,
+    verify_password,
+)
 
 
 def test_password_hash() -> None:
@@ -56,3 +64,42 @@ def test_token_expiration() -> None:
     # Decoding should raise an exception
     with pytest.raises(jwt.ExpiredSignatureError):
         jwt.decode(expired_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+def test_password_hash_async() -> None:
+    """Test that async hashing and verification run on the worker pool."""
+    hasher = PasswordHasher(executor_type="thread", workers=2, max_queue=2, queue_timeout=1)
+
+    async def scenario() -> None:
+        hashed = await hasher.run(get_password_hash, "testpassword123")
+        results = await asyncio.gather(
+            hasher.run(verify_password, "testpassword123", hashed),
+            hasher.run(verify_password, "wrongpassword", hashed),
+        )
+        assert results == [True, False]
+
+    asyncio.run(scenario())
+    hasher.shutdown()
+
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+
+
+def test_decode_access_token_is_cached() -> None:
+    """Test that decoded claims are reused and expired tokens are rejected."""
+    token = create_access_token({"sub": "cached@example.com", "is_super_admin": True})
+    hits = claims_cache.hits
+
+    assert decode_access_token(token)["sub"] == "cached@example.com"
+    assert decode_access_token(token)["sub"] == "cached@example.com"
+    assert claims_cache.hits == hits + 1
+
+    expired_token = jwt.encode(
+        {"sub": "cached@example.com", "exp": datetime.utcnow() - timedelta(minutes=1)},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+    with pytest.raises(jwt.ExpiredSignatureError):
+        decode_access_token(expired_token)
@@ -0,0 +1,61 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.organization.health import TenantHealthChecker
+
+
+def test_probes_all_tenants_concurrently_and_pages_unhealthy(monkeypatch):
+    checker = TenantHealthChecker(concurrency=200, timeout=0.2, interval=0)
+    orgs = [SimpleNamespace(id=i, name=f"org{i}", db_url=f"postgresql+asyncpg://u:p@db/org{i}") for i in range(1, 1001)]
+
+    async def load():
+        return orgs
+
+    async def connect_and_select(dsn: str) -> None:
+        org_id = int(dsn.rsplit("org", 1)[1])
+        if org_id % 100 == 0:
+            raise ConnectionRefusedError("connection refused")
+        # Each probe takes 50ms; a serial loop would need 50s
+        await asyncio.sleep(1.0 if org_id % 250 == 1 else 0.05)
+
+    monkeypatch.setattr(checker, "_load_organizations", load)
+    monkeypatch.setattr(checker, "_connect_and_select", connect_and_select)
+
+    started = time.perf_counter()
+    asyncio.run(checker.check_all())
+    assert time.perf_counter() - started < 2.0
+
+    assert checker.stats()["tenants"] == 1000
+    assert checker.stats()["unhealthy"] == 14
+    assert checker.results[251].error == "timed out after 0.2s"
+    assert "ConnectionRefusedError" in checker.results[100].error
+    assert checker.results[2].healthy and checker.results[2].last_healthy_at == checker.results[2].checked_at
+
+    first = checker.page(after_id=None, limit=10, unhealthy_only=True)
+    assert [h.organization_id for h in first.items] == [1, 100, 200, 251, 300, 400, 500, 501, 600, 700]
+    second = checker.page(after_id=first.next_after_id, limit=10, unhealthy_only=True)
+    assert [h.organization_id for h in second.items] == [751, 800, 900, 1000]
+    assert second.next_after_id is None
+
+
+def test_last_healthy_time_survives_a_failed_probe(monkeypatch):
+    checker = TenantHealthChecker(concurrency=1, timeout=0.2, interval=0)
+    healthy = True
+
+    async def load():
+        return [SimpleNamespace(id=1, name="acme", db_url="postgresql+asyncpg://u:p@db/acme")]
+
+    async def connect_and_select(dsn: str) -> None:
+        if not healthy:
+            raise OSError("unreachable")
+
+    monkeypatch.setattr(checker, "_load_organizations", load)
+    monkeypatch.setattr(checker, "_connect_and_select", connect_and_select)
+
+    asyncio.run(checker.check_all())
+    seen_healthy = checker.results[1].last_healthy_at
+    healthy = False
+    asyncio.run(checker.check_all())
+    assert not checker.results[1].healthy
+    assert checker.results[1].last_healthy_at == seen_healthy
@@ -0,0 +1,70 @@
+import asyncio
+import sys
+
+from sqlalchemy import create_engine, text
+
+from alembic import command
+from app.database import tenant_migrations
+from app.database.tenant_migrations import (
+    ProgressLog,
+    Tenant,
+    TenantMigrationRunner,
+    tenant_config,
+)
+from app.database.warm_pool import tenant_head
+
+
+def test_runner_resumes_and_kills_slow_tenants(tmp_path, monkeypatch):
+    migrated = tmp_path / "migrated"
+
+    async def current_revision(db_url, schema=None):
+        return "new" if db_url == "up-to-date" or migrated.exists() else "old"
+
+    monkeypatch.setattr(tenant_migrations, "current_revision", current_revision)
+    progress = ProgressLog(tmp_path / "progress.jsonl")
+    tenants = [Tenant("slow", "slow"), Tenant("current", "up-to-date")]
+
+    runner = TenantMigrationRunner("new", concurrency=2, timeout=0.5, progress=progress)
+    monkeypatch.setattr(runner, "alembic_command", lambda: [sys.executable, "-c", "import time; time.sleep(30)"])
+    results = {result.organization: result for result in asyncio.run(runner.run(tenants))}
+    assert results["slow"].status == "timed_out"
+    assert results["current"].status == "up_to_date"
+
+    # A second run skips finished tenants and retries the rest
+    monkeypatch.setattr(runner, "alembic_command", lambda: [sys.executable, "-c", "raise SystemExit('boom')"])
+    results = {result.organization: result for result in asyncio.run(runner.run(tenants))}
+    assert results["current"].status == "skipped"
+    assert results["slow"].status == "failed"
+    assert results["slow"].error == "boom"
+
+    monkeypatch.setattr(runner, "alembic_command", lambda: [sys.executable, "-c", f"open({str(migrated)!r}, 'w')"])
+    asyncio.run(runner.run(tenants))
+    assert set(progress.succeeded("new")) == {"slow", "current"}
+    assert progress.succeeded("newer") == {}
+
+
+def test_clean_exit_without_reaching_the_revision_fails(tmp_path, monkeypatch):
+    async def current_revision(db_url, schema=None):
+        return "old"
+
+    monkeypatch.setattr(tenant_migrations, "current_revision", current_revision)
+    progress = ProgressLog(tmp_path / "progress.jsonl")
+    runner = TenantMigrationRunner("new", concurrency=1, timeout=5, progress=progress)
+    monkeypatch.setattr(runner, "alembic_command", lambda: [sys.executable, "-c", "pass"])
+
+    [result] = asyncio.run(runner.run([Tenant("acme", "acme")]))
+    assert result.status == "failed"
+    assert result.error == "alembic exited cleanly but the database is still at old"
+    assert progress.succeeded("new") == {}
+
+
+def test_tenant_env_commits_the_revision(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tenant.db'}")
+    with engine.connect() as conn:
+        # Like the session SETs env.py issues on Postgres, this autobegins a transaction
+        conn.exec_driver_sql("PRAGMA busy_timeout = 1000")
+        command.upgrade(tenant_config(attributes={"connection": conn, "configure_logger": False}), "head")
+
+    # Read back on a new connection: only committed work survives the one above closing
+    with engine.connect() as conn:
+        assert conn.scalar(text("SELECT version_num FROM alembic_version")) == tenant_head()
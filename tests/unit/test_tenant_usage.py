@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.organization import usage as usage_module
+from app.organization.dao import USAGE_ORDER, TenantUsageDAO
+from app.organization.usage import DatabaseUsage, TenantUsageCollector
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeUsageDAO:
+    """Keeps raw samples in a list shared by every collector, like the ``tenant_usage_samples`` table."""
+
+    samples = []
+
+    def __init__(self, session):
+        self.session = session
+
+    async def latest_commits(self, since):
+        latest = {}
+        for row in sorted(self.samples, key=lambda row: row["sampled_at"]):
+            if row["sampled_at"] >= since:
+                latest[row["organization_id"]] = (row["sampled_at"], row["xact_commit"])
+        return latest
+
+    async def add_samples(self, rows):
+        self.samples.extend(dict(row) for row in rows)
+
+    async def downsample(self, raw_cutoff, rollup_cutoff):
+        pass
+
+
+def collector(monkeypatch, orgs, readings):
+    usage = TenantUsageCollector(
+        None, interval=300, raw_retention=timedelta(hours=48), rollup_retention=timedelta(days=90)
+    )
+    fetched = []
+
+    async def load():
+        by_cluster = {}
+        for org in orgs:
+            by_cluster.setdefault(org.cluster_id, []).append(org)
+        return by_cluster
+
+    async def servers(cluster_ids):
+        return {cluster_id: f"server-{cluster_id}" for cluster_id in cluster_ids if cluster_id != 99}
+
+    async def fetch(server, names):
+        fetched.append((server, sorted(names)))
+        return {name: readings[name] for name in names if name in readings}
+
+    monkeypatch.setattr(usage, "_load_organizations", load)
+    monkeypatch.setattr(usage, "_servers", servers)
+    monkeypatch.setattr(usage, "_fetch", fetch)
+    monkeypatch.setattr(usage_module, "async_session", FakeSession)
+    monkeypatch.setattr(usage_module, "TenantUsageDAO", FakeUsageDAO)
+    monkeypatch.setattr(FakeUsageDAO, "samples", [])
+    return usage, fetched
+
+
+def test_queries_each_server_once_and_computes_tps_from_stored_samples(monkeypatch):
+    orgs = [
+        SimpleNamespace(id=1, cluster_id=None, db_url="postgresql+asyncpg://u:p@db/org_a"),
+        SimpleNamespace(id=2, cluster_id=None, db_url="postgresql+asyncpg://u:p@db/org_b"),
+        SimpleNamespace(id=3, cluster_id=7, db_url="postgresql+asyncpg://u:p@other/org_c"),
+        SimpleNamespace(id=4, cluster_id=99, db_url="postgresql+asyncpg://u:p@gone/org_d"),
+    ]
+    readings = {
+        "org_a": DatabaseUsage(size_bytes=100, xact_commit=1000, blks_read=5, connections=2),
+        "org_b": DatabaseUsage(size_bytes=200, xact_commit=50, blks_read=1, connections=0),
+        "org_c": DatabaseUsage(size_bytes=300, xact_commit=10, blks_read=0, connections=1),
+    }
+    usage, fetched = collector(monkeypatch, orgs, readings)
+
+    assert asyncio.run(usage.collect()) == 3
+    assert sorted(fetched, key=str) == [("server-7", ["org_c"]), ("server-None", ["org_a", "org_b"])]
+    assert all(row["tps"] is None for row in FakeUsageDAO.samples)
+
+    # Pretend the first round ran ten seconds ago
+    for row in FakeUsageDAO.samples:
+        row["sampled_at"] -= timedelta(seconds=10)
+    readings["org_a"] = readings["org_a"]._replace(xact_commit=1500)
+    # Statistics were reset: no rate this round
+    readings["org_b"] = readings["org_b"]._replace(xact_commit=0)
+    del readings["org_c"]
+    # Another worker takes this round; it has never sampled anything itself
+    other = TenantUsageCollector(
+        None, interval=300, raw_retention=usage.raw_retention, rollup_retention=usage.rollup_retention
+    )
+    for name in ("_load_organizations", "_servers", "_fetch"):
+        setattr(other, name, getattr(usage, name))
+    asyncio.run(other.collect())
+
+    rows = {row["organization_id"]: row for row in FakeUsageDAO.samples[3:]}
+    assert set(rows) == {1, 2}
+    assert 49 < rows[1]["tps"] <= 50
+    assert rows[2]["tps"] is None
+
+
+def test_top_orders_by_the_requested_measure():
+    dao = TenantUsageDAO(None)
+    captured = []
+
+    class Session:
+        async def execute(self, stmt, bind_arguments=None):
+            captured.append(stmt)
+            return []
+
+    dao.session = Session()
+    asyncio.run(dao.top(by="tps", limit=5, since=datetime(2026, 1, 1)))
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    assert "DISTINCT ON" in sql and "ORDER BY anon_2.tps DESC NULLS LAST" in sql
+    assert set(USAGE_ORDER) == {"size", "tps", "connections"}
+
+
+def test_latest_commits_reads_the_newest_raw_sample_per_organization():
+    dao = TenantUsageDAO(None)
+    captured = []
+
+    class Session:
+        async def execute(self, stmt, bind_arguments=None):
+            captured.append(stmt)
+            return [SimpleNamespace(organization_id=1, sampled_at=datetime(2026, 1, 1), xact_commit=10)]
+
+    dao.session = Session()
+    assert asyncio.run(dao.latest_commits(since=datetime(2026, 1, 1))) == {1: (datetime(2026, 1, 1), 10)}
+    sql = " ".join(str(captured[0].compile(dialect=postgresql.dialect())).split())
+    assert sql.startswith("SELECT DISTINCT ON (tenant_usage_samples.organization_id)")
+    assert sql.endswith("ORDER BY tenant_usage_samples.organization_id, tenant_usage_samples.sampled_at DESC")
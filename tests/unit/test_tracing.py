@@ -0,0 +1,74 @@
+import asyncio
+import logging
+
+from sqlalchemy import create_engine, text
+
+from app.core import tracing
+from app.core.config import settings
+from app.core.tracing import InMemoryExporter, end_trace, start_trace, trace_methods
+
+
+class ItemDAO:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def count(self, times: int) -> None:
+        with self.engine.connect() as conn:
+            for _ in range(times):
+                conn.execute(text("SELECT 1"))
+
+
+@trace_methods("service")
+class ItemService:
+    def __init__(self, engine):
+        self.dao = trace_methods("dao")(ItemDAO)(engine)
+
+    async def report(self, times: int) -> None:
+        await self.dao.count(times)
+
+
+def test_spans_nest_across_layers_and_count_queries(monkeypatch):
+    exporter = InMemoryExporter()
+    monkeypatch.setattr(tracing, "exporter", exporter)
+    service = ItemService(create_engine("sqlite://"))
+
+    async def run():
+        trace = start_trace("GET /items")
+        await service.report(2)
+        end_trace(trace, status_code=200)
+        return trace
+
+    trace = asyncio.run(run())
+    assert trace.queries == 2 and trace.db_time > 0
+    assert tracing.current_trace() is None
+
+    by_name = {span.name: span for span in exporter.spans}
+    root = by_name["GET /items"]
+    assert root.parent_id is None and root.attributes["queries"] == 2
+    assert by_name["ItemService.report"].parent_id == root.span_id
+    assert by_name["ItemDAO.count"].parent_id == by_name["ItemService.report"].span_id
+    sql = [span for span in exporter.spans if span.kind == "sql"]
+    assert len(sql) == 2 and all(span.parent_id == by_name["ItemDAO.count"].span_id for span in sql)
+
+
+def test_warns_when_a_request_runs_too_many_queries(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "TRACING_QUERY_WARN_THRESHOLD", 3)
+    service = ItemService(create_engine("sqlite://"))
+
+    async def run():
+        trace = start_trace("GET /items")
+        await service.report(5)
+        end_trace(trace)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.tracing"):
+        asyncio.run(run())
+
+    [record] = [r for r in caplog.records if r.message == "too_many_queries"]
+    assert record.queries == 5
+    assert record.repeated[0] == {"count": 5, "statement": "SELECT 1"}
+
+
+def test_sql_outside_a_request_is_not_traced():
+    with create_engine("sqlite://").connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert tracing.current_trace() is None
@@ -0,0 +1,137 @@
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from sqlalchemy.exc import DBAPIError
+
+from app.database.warm_pool import WarmDatabasePool
+
+
+class FakeServer:
+    """Just enough of a Postgres server for the warm pool: databases and advisory locks."""
+
+    def __init__(self, databases=()):
+        self.databases = set(databases)
+        self.locks = set()
+        self.statements = []
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, server: FakeServer):
+        self.server = server
+        self.options = {}
+        self.held = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execution_options(self, **options):
+        self.options.update(options)
+        return self
+
+    @asynccontextmanager
+    async def begin(self):
+        # Transaction-level advisory locks are released when the transaction ends
+        assert self.options.get("isolation_level") != "AUTOCOMMIT"
+        try:
+            yield
+        finally:
+            self.server.locks -= self.held
+            self.held.clear()
+
+    def _fail(self, sql, message):
+        raise DBAPIError(sql, {}, Exception(message))
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.server.statements.append(sql)
+        databases = self.server.databases
+        if match := re.match(r'ALTER DATABASE "(.+)" RENAME TO "(.+)"', sql):
+            old, new = match.groups()
+            if new in databases:
+                self._fail(sql, f'database "{new}" already exists')
+            if old not in databases:
+                self._fail(sql, f'database "{old}" does not exist')
+            databases.remove(old)
+            databases.add(new)
+        elif match := re.match(r'CREATE DATABASE "(.+)" TEMPLATE', sql):
+            databases.add(match.group(1))
+        elif match := re.match(r'DROP DATABASE IF EXISTS "(.+)"', sql):
+            databases.discard(match.group(1))
+        elif "LIKE :pattern" in sql:
+            prefix = params["pattern"].rstrip("%").replace("\\_", "_")
+            names = sorted(name for name in databases if name.startswith(prefix))
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: names))
+
+    async def scalar(self, stmt, params=None):
+        assert "pg_try_advisory_xact_lock" in str(stmt)
+        if params["key"] in self.server.locks:
+            return False
+        self.server.locks.add(params["key"])
+        self.held.add(params["key"])
+        return True
+
+
+def make_pool(server: FakeServer, template_revision="rev2", **overrides) -> WarmDatabasePool:
+    options = dict(target_size=3, refill_concurrency=2, template="tpl", prefix="spare_", refill_interval=60)
+    options.update(overrides)
+    pool = WarmDatabasePool(server, revision="rev2", **options)
+
+    async def read_template_revision():
+        return template_revision
+
+    pool.template_revision = read_template_revision
+    return pool
+
+
+def test_refill_drops_outdated_spares_and_clones_at_the_current_revision():
+    server = FakeServer({"spare_rev1_aaaa", "spare_rev2_bbbb", "acme"})
+    pool = make_pool(server)
+
+    assert asyncio.run(pool.refill()) == 2
+    spares = sorted(name for name in server.databases if name.startswith("spare_"))
+    assert len(spares) == 3 and all(name.startswith("spare_rev2_") for name in spares)
+    assert "acme" in server.databases
+    assert not server.locks
+
+
+def test_refill_is_skipped_while_another_process_holds_the_lock():
+    server = FakeServer()
+    pool = make_pool(server)
+    server.locks.add(pool._lock_key)
+
+    assert asyncio.run(pool.refill()) == 0
+    assert server.databases == set()
+
+
+def test_refill_refuses_an_outdated_template():
+    server = FakeServer()
+    pool = make_pool(server, template_revision="rev1")
+
+    assert asyncio.run(pool.refill()) == 0
+    assert server.databases == set()
+
+
+def test_claim_renames_a_current_spare_only_once():
+    server = FakeServer({"spare_rev1_aaaa", "spare_rev2_bbbb"})
+    pool = make_pool(server)
+
+    assert asyncio.run(pool.claim("acme"))
+    assert server.databases == {"spare_rev1_aaaa", "acme"}
+    # The only remaining spare is on an older schema
+    assert not asyncio.run(pool.claim("globex"))
+
+
+def test_claim_leaves_spares_alone_when_the_name_is_taken():
+    server = FakeServer({"spare_rev2_aaaa", "acme"})
+    pool = make_pool(server)
+
+    assert not asyncio.run(pool.claim("acme"))
+    assert "spare_rev2_aaaa" in server.databases